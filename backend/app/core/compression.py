@@ -0,0 +1,162 @@
+"""
+Response compression.
+
+Compressible bodies (JSON, text, JavaScript, XML, SVG) of at least
+COMPRESSION_MIN_SIZE bytes are sent brotli-encoded when the client accepts
+`br` and the brotli package is installed, otherwise gzip-encoded. Streamed
+bodies are compressed chunk by chunk and flushed after each one, so they
+aren't held back; server-sent events are never compressed. Documents,
+images and anything that already has a Content-Encoding pass through.
+
+A strong ETag on a compressed response is made weak: it was computed for
+the identity body, not the compressed bytes. ETag comparison in the API is
+weak (app/core/cache.py), so the validator keeps working.
+"""
+import zlib
+from typing import Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+})
+# Larger chunks are compressed in a worker thread to keep the event loop free
+THREAD_MIN_SIZE = 128 * 1024
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """"br", "gzip" or None for an Accept-Encoding header, honouring q-values"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    def weight_of(coding: str) -> float:
+        return weights.get(coding, weights.get("*", 0.0))
+
+    if brotli is not None and weight_of("br") > 0 and weight_of("br") >= weight_of("gzip"):
+        return "br"
+    if weight_of("gzip") > 0:
+        return "gzip"
+    return None
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+ENCODERS = {"gzip": _GzipEncoder, "br": _BrotliEncoder}
+
+
+async def _compress(encoder, data: bytes, final: bool) -> bytes:
+    if len(data) >= THREAD_MIN_SIZE:
+        return await anyio.to_thread.run_sync(encoder.compress, data, final)
+    return encoder.compress(data, final)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing response bodies for clients that accept it"""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if message["status"] == 304:
+                    # Revalidated responses carry the Vary of the 200 they stand for
+                    passthrough = True
+                    vary = MutableHeaders(raw=list(message.get("headers", [])))
+                    vary.add_vary_header("Accept-Encoding")
+                    return await send(dict(message, headers=vary.raw))
+                if (message["status"] in (204, 206) or "content-encoding" in headers
+                        or not _compressible(headers.get("content-type", ""))):
+                    passthrough = True
+                    return await send(message)
+                # Held back until the first body chunk shows how big it is
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                return await send(message)
+
+            body = message.get("body", b"")
+            final = not message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                if coding is None or (final and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(dict(start, headers=headers.raw))
+                    start = None
+                    return await send(message)
+
+                encoder = ENCODERS[coding]()
+                body = await _compress(encoder, body, final)
+                headers["Content-Encoding"] = coding
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                if final:
+                    headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                await send(dict(start, headers=headers.raw))
+                start = None
+                return await send(dict(message, body=body))
+
+            await send(dict(message, body=await _compress(encoder, body, final)))
+
+        await self.app(scope, receive, send_compressed)
@@ -19,7 +19,47 @@ class Settings(BaseSettings):
     
     # Security
     JWT_SECRET: str = "default-secret-key-change-me"
+    # How long a resolved token principal is reused without a database lookup
+    AUTH_CACHE_TTL_SECONDS: int = 60
     
+    # Password hashing - tune costs with scripts/benchmark_login.py
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # or "argon2" (needs argon2-cffi)
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_TIME_COST: int = 2
+    PASSWORD_ARGON2_MEMORY_COST: int = 65536  # KiB
+    PASSWORD_ARGON2_PARALLELISM: int = 2
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU core
+    
+    # Request instrumentation (Server-Timing header, app.requests log)
+    # Requests over either budget are logged as warnings; 0 disables a budget
+    REQUEST_QUERY_BUDGET: int = 25
+    REQUEST_LATENCY_BUDGET_MS: int = 500
+
+    # Prometheus text-format metrics at /metrics (per worker). Off by default:
+    # they list every route, pool state and outbound call targets. With
+    # METRICS_TOKEN set, scrapers must send "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+
+    # Admin-requested request profiles (X-Profile: 1 with an admin token).
+    # Stored in PROFILE_DIR (empty: <tmp>/onboarding-profiles), newest
+    # PROFILE_MAX_FILES kept
+    PROFILING_ENABLED: bool = True
+    PROFILE_DIR: str = ""
+    PROFILE_MAX_FILES: int = 50
+    PROFILE_SAMPLE_INTERVAL_MS: float = 2.0
+
+    # Response compression: brotli when the client accepts it and the brotli
+    # package is installed, else gzip; smaller bodies are sent as they are
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # How long GET /dashboard/stats/global reuses its counts; concurrent
+    # refreshes within the window share one computation
+    DASHBOARD_STATS_TTL_SECONDS: float = 5
+
     # CORS
     FRONTEND_ORIGINS: str = "http://localhost:5173,http://localhost:5174,http://localhost:9009"
     
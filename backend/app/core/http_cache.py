@@ -0,0 +1,155 @@
+"""
+Declarative HTTP caching for mostly-static GET routes.
+
+A route declares its policy on the decorator:
+
+    @router.get("/{task_id}", dependencies=[cache_policy(REVALIDATE)])
+
+and HTTPCacheMiddleware applies it to the route's 200 and 304 responses:
+Cache-Control from the policy, an ETag hashed from the body unless the
+route set one itself, and a bodiless 304 when the request's If-None-Match
+already names that ETag. Routes without a policy are untouched.
+
+A content-hash ETag still runs the route and only saves the transfer.
+Routes that can tell cheaply whether anything changed (a template version,
+a row's updated_at) check with not_modified() first and skip the work.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Depends, Request, Response
+from starlette.datastructures import MutableHeaders
+
+from app.core.cache import etag_matches
+
+SCOPE_KEY = "app.cache_policy"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    # Seconds a client may reuse a response without asking; 0 = revalidate every time
+    max_age: int = 0
+    # Only the user's own browser may store it, not shared proxies
+    private: bool = True
+    stale_while_revalidate: int = 0
+    # Hash the body into an ETag when the route doesn't set one
+    etag: bool = True
+
+    @property
+    def cache_control(self) -> str:
+        parts = ["private" if self.private else "public"]
+        parts.append(f"max-age={self.max_age}" if self.max_age else "no-cache")
+        if self.stale_while_revalidate:
+            parts.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(parts)
+
+
+# Stored by the browser but checked on every use; an unchanged resource
+# costs a 304. The admin screens edit the task library, templates and
+# eligibility criteria and read them straight back, so nothing is served
+# from cache without asking.
+REVALIDATE = CachePolicy()
+
+
+def cache_policy(policy: CachePolicy):
+    """Route dependency declaring how the route's responses may be cached"""
+
+    async def declare(request: Request) -> None:
+        request.scope[SCOPE_KEY] = policy
+
+    return Depends(declare)
+
+
+def updated_at_etag(kind: str, resource_id, updated_at: Optional[datetime]) -> Optional[str]:
+    """ETag for a row that bumps updated_at on every edit; None if it has none"""
+    if updated_at is None:
+        return None
+    return f'"{kind}-{resource_id}-{updated_at:%Y%m%d%H%M%S%f}"'
+
+
+def not_modified(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """A 304 if the client already has `etag`, else None after tagging `response` with it"""
+    if etag is None:
+        return None
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+def _not_modified_start(start: dict, headers: MutableHeaders) -> dict:
+    for name in ("content-length", "content-type"):
+        if name in headers:
+            del headers[name]
+    return dict(start, status=304, headers=headers.raw)
+
+
+class HTTPCacheMiddleware:
+    """ASGI middleware applying the cache_policy() of the matched route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        held_start = None
+        # "pass" forwards the body, "drop" swallows it after a 304, "hash" holds it for an ETag
+        mode = None
+
+        async def send_cached(message):
+            nonlocal held_start, mode
+            if message["type"] == "http.response.start":
+                policy = scope.get(SCOPE_KEY)
+                if policy is None or message["status"] not in (200, 304):
+                    mode = "pass"
+                    return await send(message)
+
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                if "cache-control" not in headers:
+                    headers["Cache-Control"] = policy.cache_control
+                etag = headers.get("etag")
+                if message["status"] == 304 or (etag is None and not policy.etag):
+                    mode = "pass"
+                    return await send(dict(message, headers=headers.raw))
+                if etag is not None:
+                    if etag_matches(Request(scope), etag):
+                        mode = "drop"
+                        return await send(_not_modified_start(message, headers))
+                    mode = "pass"
+                    return await send(dict(message, headers=headers.raw))
+                # Hash the body once it's here
+                held_start = dict(message, headers=headers.raw)
+                mode = "hash"
+                return
+
+            if message["type"] != "http.response.body" or mode == "pass":
+                if mode == "hash":
+                    mode = "pass"
+                    await send(held_start)
+                return await send(message)
+            if mode == "drop":
+                # Body of a response turned into a 304; only the end is sent
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+
+            start = held_start
+            mode = "pass"
+            if message.get("more_body", False):
+                # Streamed: no single body to hash
+                await send(start)
+                return await send(message)
+            headers = MutableHeaders(raw=start["headers"])
+            etag = '"' + hashlib.blake2b(message.get("body", b""), digest_size=16).hexdigest() + '"'
+            headers["ETag"] = etag
+            if etag_matches(Request(scope), etag):
+                await send(_not_modified_start(start, headers))
+                return await send({"type": "http.response.body", "body": b""})
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_cached)
@@ -0,0 +1,179 @@
+"""
+Per-request database instrumentation.
+
+SQLAlchemy cursor events time every statement and charge it to the request
+being served (tracked in a context variable, which sync routes inherit in
+the threadpool). Each response carries a Server-Timing header with the
+query count, total database time, slowest statement and total time. Each
+request is logged as one JSON line and counted in the /metrics request
+metrics (app/core/metrics.py). Requests over REQUEST_QUERY_BUDGET queries
+or REQUEST_LATENCY_BUDGET_MS are logged as warnings with the slowest
+statement, which is how N+1 loops show up.
+
+Statements run outside a request (background threads, scripts) are not
+recorded.
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.requests")
+
+SLOW_STATEMENT_LOG_CHARS = 500
+
+# Metrics label for requests that matched no route, so scanners probing
+# random URLs can't create unbounded label values
+UNMATCHED_ROUTE = "<unmatched>"
+
+_current: ContextVar[Optional["RequestStats"]] = ContextVar("request_stats", default=None)
+
+
+@dataclass
+class RequestStats:
+    query_count: int = 0
+    db_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    started: float = field(default_factory=time.perf_counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def over_budget(self, elapsed_ms: float) -> List[str]:
+        exceeded = []
+        if settings.REQUEST_QUERY_BUDGET and self.query_count > settings.REQUEST_QUERY_BUDGET:
+            exceeded.append("queries")
+        if settings.REQUEST_LATENCY_BUDGET_MS and elapsed_ms > settings.REQUEST_LATENCY_BUDGET_MS:
+            exceeded.append("latency")
+        return exceeded
+
+    def server_timing(self, elapsed_ms: float) -> str:
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.query_count} queries"',
+            f'db-slowest;dur={self.slowest_seconds * 1000:.1f}',
+            f'total;dur={elapsed_ms:.1f}',
+        ])
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+# =============================================
+# ENGINE HOOKS
+# =============================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._instrumentation_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_instrumentation_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# =============================================
+# MIDDLEWARE
+# =============================================
+
+def _route_path(scope) -> str:
+    """
+    Route template of the request ("/api/v1/projects/{project_id}"), so IDs
+    don't explode into one label per row. Built from the matched path
+    parameters, since routes inside included routers only know their path
+    relative to the router prefix. Unmatched requests keep the raw path.
+    """
+    path = scope.get("path", "")
+    for name, value in (scope.get("path_params") or {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+
+class RequestInstrumentationMiddleware:
+    """ASGI middleware (not BaseHTTPMiddleware, so streaming responses pass through untouched)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+        metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timing = stats.server_timing(stats.elapsed_ms()).encode("latin-1")
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"server-timing", timing)])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+            self._record(scope, stats, status_code)
+
+    @classmethod
+    def _record(cls, scope, stats: RequestStats, status_code: int) -> None:
+        elapsed_ms = stats.elapsed_ms()
+        method = scope.get("method")
+        route = _route_path(scope) if scope.get("route") is not None else UNMATCHED_ROUTE
+        metrics.HTTP_REQUESTS.inc(method=method, route=route, status=status_code)
+        metrics.HTTP_REQUEST_DURATION.observe(elapsed_ms / 1000, method=method, route=route)
+        if stats.query_count:
+            metrics.HTTP_REQUEST_DB_QUERIES.inc(stats.query_count, method=method, route=route)
+        cls._log(scope, stats, status_code, elapsed_ms)
+
+    @staticmethod
+    def _log(scope, stats: RequestStats, status_code: int, elapsed_ms: float) -> None:
+        exceeded = stats.over_budget(elapsed_ms)
+        if not exceeded and not logger.isEnabledFor(logging.INFO):
+            return
+
+        entry = {
+            "event": "request",
+            "method": scope.get("method"),
+            "route": _route_path(scope),
+            "status": status_code,
+            "durationMs": round(elapsed_ms, 1),
+            "queries": stats.query_count,
+            "dbMs": round(stats.db_seconds * 1000, 1),
+            "slowestQueryMs": round(stats.slowest_seconds * 1000, 1),
+        }
+        if exceeded:
+            entry["overBudget"] = exceeded
+            entry["slowestStatement"] = (stats.slowest_statement or "")[:SLOW_STATEMENT_LOG_CHARS]
+            logger.warning(json.dumps(entry))
+        else:
+            logger.info(json.dumps(entry))
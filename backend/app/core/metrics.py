@@ -0,0 +1,270 @@
+"""
+In-process metrics in the Prometheus text exposition format, served at
+/metrics without a client library or collector.
+
+Metrics are module-level and cheap to update (a dict lookup and a lock per
+observation). Gauges that reflect live state (DB pool, queue depths) are
+read from callbacks at scrape time instead of being kept current. Each
+uvicorn worker has its own registry, so scrape every worker (or run one
+worker) for complete numbers.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import httpx
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast cached reads through slow reports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes, up to the 5MB document limit
+SIZE_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_242_880)
+
+_registry: List["_Metric"] = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        if not self.label_names:
+            self._values[()] = 0
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        if not self.label_names:
+            self._values[()] = 0
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        """Read the value from `fn()` at scrape time"""
+        with self._lock:
+            self._functions[self._key(labels)] = fn
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = list(self._functions.items())
+        for key, fn in functions:
+            try:
+                values[key] = fn()
+            except Exception:
+                # A broken callback must not take the whole scrape down
+                continue
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum]
+        if not self.label_names:
+            self._values[()] = self._empty()
+
+    def _empty(self) -> list:
+        return [[0] * (len(self.buckets) + 1), 0.0]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = self._empty()
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _samples(self):
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =============================================
+# APPLICATION METRICS
+# =============================================
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requests served, by route template and status", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served"
+)
+HTTP_REQUEST_DB_QUERIES = Counter(
+    "http_request_db_queries_total", "Database statements executed while serving requests", ["method", "route"]
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "SQLAlchemy pool connections by state", ["state"]
+)
+
+OUTBOUND_REQUESTS = Counter(
+    "outbound_http_requests_total",
+    "Outbound HTTP calls made by REST_API and REDIRECT tasks, by outcome (status class or error)",
+    ["target", "method", "outcome"],
+)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_http_request_duration_seconds", "Outbound HTTP call latency", ["target", "method"]
+)
+
+DOCUMENT_UPLOAD_BYTES = Histogram(
+    "document_upload_bytes", "Size of accepted document uploads", buckets=SIZE_BUCKETS
+)
+DOCUMENT_UPLOADS_REJECTED = Counter(
+    "document_uploads_rejected_total", "Document uploads refused for exceeding the size limit"
+)
+
+JOB_QUEUE_DEPTH = Gauge(
+    "job_queue_depth", "Work waiting in the in-process background queues", ["queue"]
+)
+
+
+def instrument_pool(engine) -> None:
+    """Report the engine's pool state at scrape time (QueuePool)"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    DB_POOL_CONNECTIONS.set_function(pool.size, state="size")
+    DB_POOL_CONNECTIONS.set_function(pool.checkedout, state="checked_out")
+    DB_POOL_CONNECTIONS.set_function(pool.checkedin, state="checked_in")
+    # QueuePool reports overflow as negative while below pool_size
+    DB_POOL_CONNECTIONS.set_function(lambda: max(0, pool.overflow()), state="overflow")
+
+
+# =============================================
+# OUTBOUND HTTP
+# =============================================
+
+class InstrumentedAsyncClient(httpx.AsyncClient):
+    """
+    httpx client recording latency and outcome of every call it sends.
+    Wraps send() rather than the transport, so the client still builds its
+    own transports and honours HTTP(S)_PROXY / NO_PROXY from the environment.
+    """
+
+    def __init__(self, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.target = target
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await super().send(request, **kwargs)
+            outcome = f"{response.status_code // 100}xx"
+            return response
+        except httpx.TimeoutException:
+            outcome = "timeout"
+            raise
+        finally:
+            OUTBOUND_REQUEST_DURATION.observe(
+                time.perf_counter() - started, target=self.target, method=request.method
+            )
+            OUTBOUND_REQUESTS.inc(target=self.target, method=request.method, outcome=outcome)
@@ -0,0 +1,176 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Each page continues strictly after the last row of the previous one, by
+filtering on the sort keys instead of using OFFSET, so page 500 costs the
+same as page 1 and rows inserted meanwhile don't shift pages. The sort keys
+must end in a unique column (normally the primary key) and must not be NULL.
+
+Cursors are opaque to clients: the last row's sort key values, JSON encoded
+in URL-safe base64. Routes keep their response bodies and return the next
+page's cursor in the X-Next-Cursor header (absent on the last page). With
+`include_total` they also send X-Total-Estimate: the planner's row estimate
+for the filtered query (from pg_class / pg_statistic), which costs no scan.
+
+Lists that returned every row before they were paginated (tasks, eligibility
+rules, task instances, requisitions) still do when called without `limit`,
+so existing clients aren't cut off at the first page.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_ESTIMATE_HEADER = "X-Total-Estimate"
+
+# Stand-in for NULL timestamps in sort keys
+MIN_TIMESTAMP = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class SortKey:
+    expression: Any
+    descending: bool = False
+
+    def ordering(self):
+        return self.expression.desc() if self.descending else self.expression.asc()
+
+
+@dataclass
+class Page:
+    # Query results with the cursor columns stripped (entities for single
+    # entity queries, rows otherwise)
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+
+# =============================================
+# CURSOR ENCODING
+# =============================================
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and len(value) == 1:
+        (tag, raw), = value.items()
+        if tag == "dt":
+            return datetime.fromisoformat(raw)
+        if tag == "d":
+            return date.fromisoformat(raw)
+        if tag == "u":
+            return UUID(raw)
+        if tag == "n":
+            return Decimal(raw)
+        raise ValueError(f"Unknown cursor value tag: {tag}")
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque cursor for the sort key values of the last row on a page"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, key_count: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if not isinstance(values, list) or len(values) != key_count:
+            raise ValueError("Cursor does not match this listing")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, UnicodeDecodeError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# =============================================
+# PAGINATION
+# =============================================
+
+def _after(keys: Sequence[SortKey], values: list):
+    """Rows sorting strictly after `values` in the (possibly mixed) key order"""
+    conditions = []
+    for i, key in enumerate(keys):
+        parts = [keys[j].expression == values[j] for j in range(i)]
+        parts.append(key.expression < values[i] if key.descending else key.expression > values[i])
+        conditions.append(and_(*parts))
+    return or_(*conditions)
+
+
+def paginate(query, keys: Sequence[SortKey], limit: Optional[int], cursor: Optional[str] = None) -> Page:
+    """
+    One page of an ORM query ordered by `keys`. The query must not have an
+    ORDER BY or LIMIT of its own; key expressions (including computed ones
+    such as a search rank) are selected alongside so the cursor can be built
+    from the last row. A `limit` of None returns every remaining row (for
+    routes that were unpaginated before and stay so unless asked).
+    """
+    single_entity = len(query.column_descriptions) == 1
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(cursor, len(keys))))
+
+    key_count = len(keys)
+    query = query.add_columns(*(key.expression.label(f"cursor_key_{i}") for i, key in enumerate(keys)))\
+        .order_by(*(key.ordering() for key in keys))
+    rows = (query.limit(limit + 1) if limit is not None else query).all()
+
+    # One extra row tells whether another page exists
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(tuple(rows[-1])[-key_count:])
+
+    items = [row[0] for row in rows] if single_entity else rows
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def set_page_headers(response: Response, page: Page, total_estimate: Optional[int] = None) -> None:
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if total_estimate is not None:
+        response.headers[TOTAL_ESTIMATE_HEADER] = str(total_estimate)
+
+
+# =============================================
+# ESTIMATED TOTALS
+# =============================================
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(db, query) -> int:
+    """
+    Planner estimate of the rows `query` returns, from table statistics
+    (pg_class.reltuples and column selectivity) without executing it.
+    Accuracy depends on how recently the tables were analyzed.
+    """
+    plan = db.execute(_Explain(query.order_by(None).statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return max(0, int(plan[0]["Plan"]["Plan Rows"]))
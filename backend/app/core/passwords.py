@@ -0,0 +1,132 @@
+"""
+Password hashing.
+
+Hashes are produced with the scheme configured in settings (bcrypt by
+default, argon2 when argon2-cffi is installed). Existing hashes are
+recognised by format, so legacy unsalted SHA-256 hex digests still verify
+and are replaced with a modern hash the next time the user logs in (as are
+hashes made with a lower cost than currently configured).
+
+Hashing is deliberately slow, so it runs on a small dedicated thread pool.
+That caps how many CPU cores logins can occupy at shift start and keeps
+the event loop free; async routes await the `*_async` variants.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# passlib 1.7.4 logs a traceback when probing the version of newer bcrypt releases
+logging.getLogger("passlib.handlers.bcrypt").setLevel(logging.ERROR)
+
+SUPPORTED_SCHEMES = ("bcrypt", "argon2")
+
+# Unsalted hex SHA-256 written by earlier versions of the app
+LEGACY_SCHEME = "hex_sha256"
+
+
+def build_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism: int = settings.PASSWORD_ARGON2_PARALLELISM,
+) -> CryptContext:
+    """CryptContext hashing with `scheme` and accepting every other known format"""
+    if scheme not in SUPPORTED_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    if scheme == "argon2":
+        from passlib.hash import argon2
+        if not argon2.has_backend():
+            raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package")
+
+    schemes = [scheme] + [s for s in SUPPORTED_SCHEMES if s != scheme] + [LEGACY_SCHEME]
+    return CryptContext(
+        schemes=schemes,
+        default=scheme,
+        deprecated=[s for s in schemes if s != scheme],
+        # min_* flags stored hashes weaker than the current cost for rehash
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_context()
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 2,
+    thread_name_prefix="password-hash"
+)
+
+
+# Fingerprints of malformed stored hashes already logged, so each is reported once
+_reported_bad_hashes = set()
+
+
+def identify_hash(password_hash: Optional[str]) -> Optional[str]:
+    """Scheme name of a stored hash, or None if it is empty or unrecognised"""
+    if not password_hash:
+        return None
+    return pwd_context.identify(password_hash)
+
+
+def _verify_and_update(password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+    scheme = identify_hash(password_hash)
+    if not password or scheme is None:
+        return False, None
+    try:
+        return pwd_context.verify_and_update(password, password_hash)
+    except (ValueError, TypeError):
+        # Recognised prefix but malformed (e.g. truncated): a failed login, not a 500
+        fingerprint = hashlib.blake2b(password_hash.encode(), digest_size=8).hexdigest()
+        if fingerprint not in _reported_bad_hashes:
+            _reported_bad_hashes.add(fingerprint)
+            logger.warning("Malformed %s password hash (fingerprint %s); login rejected", scheme, fingerprint)
+        return False, None
+
+
+# =============================================
+# BLOCKING API (sync routes and scripts)
+# =============================================
+
+def hash_password(password: str) -> str:
+    return _executor.submit(pwd_context.hash, password).result()
+
+
+def verify_and_update(password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password. Returns (valid, new_hash) where new_hash is set when the
+    stored hash is legacy or below the configured cost and should be saved.
+    """
+    return _executor.submit(_verify_and_update, password, password_hash).result()
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    return verify_and_update(password, password_hash)[0]
+
+
+# =============================================
+# ASYNC API (async routes)
+# =============================================
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_executor.submit(pwd_context.hash, password))
+
+
+async def verify_and_update_async(password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+    return await asyncio.wrap_future(_executor.submit(_verify_and_update, password, password_hash))
+
+
+async def verify_password_async(password: str, password_hash: Optional[str]) -> bool:
+    return (await verify_and_update_async(password, password_hash))[0]
@@ -0,0 +1,260 @@
+"""
+On-demand sampling profiles of single requests.
+
+An admin adds `X-Profile: 1` (or `?profile=1`) to a request together with
+their bearer token. The request is then served normally while a sampler
+thread records the Python stacks of the threads working on it (the event
+loop and the threadpool workers running app code) every
+PROFILE_SAMPLE_INTERVAL_MS. The profile is saved as one JSON file in
+PROFILE_DIR, with a small summary file next to it for listing; the
+directory keeps only the newest PROFILE_MAX_FILES (a ring buffer shared by
+all workers). The id is returned in the X-Profile-Id header. Profiles are
+listed and downloaded through /admin/profiles.
+
+Requests without the flag cost one header scan; nothing is sampled. One
+request per worker is profiled at a time. Stacks are sampled per thread,
+so work other requests do in the threadpool at the same moment can show up
+in a profile; the concurrentRequests field says how busy the worker was.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.instrumentation import current_request_stats
+from app.core.security import admin_for_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = re.compile(rb"(?:^|&)profile=(?:1|true)(?:&|$)")
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{20}-[0-9a-f]{8}$")
+
+# Stacks are only kept if they run code from the app package
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_BACKEND_DIR = os.path.dirname(_APP_DIR)
+_WORKER_THREAD_PREFIX = "AnyIO worker thread"
+
+_active = threading.Lock()
+
+
+def profile_dir() -> str:
+    return settings.PROFILE_DIR or os.path.join(tempfile.gettempdir(), "onboarding-profiles")
+
+
+# =============================================
+# SAMPLER
+# =============================================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_BACKEND_DIR):
+        filename = os.path.relpath(filename, _BACKEND_DIR)
+    else:
+        parts = filename.replace("\\", "/").split("/site-packages/")
+        filename = parts[-1] if len(parts) > 1 else os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _collapse(frame) -> Optional[str]:
+    """Root-first `;`-joined stack, or None when no app code is on it"""
+    labels = []
+    in_app = False
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_APP_DIR):
+            in_app = True
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    if not in_app:
+        return None
+    return ";".join(reversed(labels))
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, loop_thread_id: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            watched = {self.loop_thread_id}
+            watched.update(
+                t.ident for t in threading.enumerate()
+                if t.name.startswith(_WORKER_THREAD_PREFIX)
+            )
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in watched:
+                    stack = _collapse(frame)
+                    if stack:
+                        self.stacks[stack] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+# =============================================
+# STORAGE
+# =============================================
+
+SUMMARY_SUFFIX = ".summary.json"
+
+
+def _write_json(path: str, data: dict) -> None:
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+def _write_profile(profile: dict) -> None:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    # Full profile first, so every listed summary has one to download; the
+    # summary leaves out the stacks so listing reads only small files
+    summary = {key: value for key, value in profile.items() if key != "stacks"}
+    _write_json(os.path.join(directory, f"{profile['id']}.json"), profile)
+    _write_json(os.path.join(directory, f"{profile['id']}{SUMMARY_SUFFIX}"), summary)
+
+    # Ring buffer: ids sort by time, drop the oldest beyond the limit
+    profile_ids = sorted({
+        name[:-len(SUMMARY_SUFFIX)] if name.endswith(SUMMARY_SUFFIX) else name[:-len(".json")]
+        for name in os.listdir(directory) if name.endswith(".json")
+    })
+    for profile_id in profile_ids[:max(0, len(profile_ids) - settings.PROFILE_MAX_FILES)]:
+        for name in (f"{profile_id}{SUMMARY_SUFFIX}", f"{profile_id}.json"):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[dict]:
+    """Summaries of the stored profiles (no stacks), newest first"""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    summaries = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(SUMMARY_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                summaries.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return summaries
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(profile_dir(), f"{profile_id}.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def folded_stacks(profile: dict) -> str:
+    """Brendan Gregg's folded format (flamegraph.pl, speedscope)"""
+    return "".join(f"{stack} {count}\n" for stack, count in profile.get("stacks", {}).items())
+
+
+# =============================================
+# MIDDLEWARE
+# =============================================
+
+def _profile_requested(scope) -> bool:
+    if PROFILE_QUERY_FLAG.search(scope.get("query_string", b"")):
+        return True
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value in (b"1", b"true")
+    return False
+
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token.strip() if scheme.lower() == "bearer" and token else None
+    return None
+
+
+class RequestProfilerMiddleware:
+    """ASGI middleware profiling flagged requests from admins"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            return await self.app(scope, receive, send)
+
+        token = _bearer_token(scope)
+        admin = await run_in_threadpool(admin_for_token, token) if token else None
+        if admin is None or not _active.acquire(blocking=False):
+            # Not allowed or another profile is running: serve unprofiled
+            return await self.app(scope, receive, send)
+
+        profile_id = f"{datetime.utcnow():%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        status_code = 500
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = dict(message, headers=list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ])
+            await send(message)
+
+        sampler = _Sampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            _active.release()
+            stats = current_request_stats()
+            profile = {
+                "id": profile_id,
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_code,
+                "startedAt": started_at.isoformat(),
+                "durationMs": round((time.perf_counter() - started) * 1000, 1),
+                "queries": stats.query_count if stats else None,
+                "dbMs": round(stats.db_seconds * 1000, 1) if stats else None,
+                "sampleIntervalMs": settings.PROFILE_SAMPLE_INTERVAL_MS,
+                "samples": sampler.samples,
+                "concurrentRequests": metrics.HTTP_REQUESTS_IN_FLIGHT.value(),
+                "requestedBy": admin.email,
+                "stacks": dict(sampler.stacks.most_common()),
+            }
+            try:
+                await run_in_threadpool(_write_profile, profile)
+            except OSError:
+                logger.exception("Could not store request profile %s", profile_id)
@@ -0,0 +1,60 @@
+"""
+Fast JSON responses for routes that build large payloads.
+
+FastAPI sends a plain dict/list return value through jsonable_encoder (a
+recursive pure-Python walk) and then json.dumps, which dominates the cost
+of payloads like a project's member list with every task instance.
+Returning FastJSONResponse(payload) skips both and renders with orjson,
+falling back to the standard library when orjson isn't installed.
+
+Routes with a response_model are serialized by pydantic-core already. For
+the hot ones that assemble trusted rows from the database, build the dicts
+directly and return FastJSONResponse, keeping response_model on the
+decorator so the OpenAPI schema is unchanged: a returned Response is sent
+as-is, without re-validating data we just read ourselves.
+
+scripts/benchmark_serialization.py measures the paths against each other.
+"""
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Types json/orjson can't encode on their own, matching jsonable_encoder"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,194 @@
+"""
+Authentication dependencies shared by all routers.
+
+Tokens are read from the `Authorization: Bearer` header (the legacy `token`
+query parameter is still accepted), verified once, and resolved to a
+`Principal` through a short-TTL in-process cache keyed by the token's
+(sub, iat). Routes that deactivate a user or change a password call
+`invalidate_principal` so the change takes effect immediately on this worker;
+other workers pick it up when their entry expires.
+"""
+import uuid as uuid_lib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.models.models import User, TeamMember, ProjectAssignment
+
+# JWT Configuration
+JWT_SECRET = settings.JWT_SECRET
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRATION_HOURS = 24
+
+# Token roles (compared upper-cased, like is_admin) that resolve against
+# or_users; everything else is a candidate
+ADMIN_ROLES = {"ADMIN", "PROJECT_MANAGER", "PROCESSOR", "VIEWER"}
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+_principals = LRUCache(maxsize=10_000, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, detached from any database session"""
+    id: str
+    kind: str  # "admin" or "candidate"
+    email: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    role: Optional[str] = None
+    assignment_id: Optional[str] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.kind == "admin" and (self.role or "").upper() == "ADMIN"
+
+
+# =============================================
+# JWT HELPERS
+# =============================================
+
+def create_jwt_token(user_id: str, role: str, email: str) -> str:
+    """Create a JWT token"""
+    payload = {
+        "sub": user_id,
+        "role": role,
+        "email": email,
+        "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
+        "iat": datetime.utcnow()
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+
+def decode_jwt_token(token: str) -> Optional[dict]:
+    """Decode and verify JWT token"""
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except jwt.InvalidTokenError:
+        return None
+
+
+# =============================================
+# PRINCIPAL RESOLUTION
+# =============================================
+
+def _unauthorized(detail: str = "Invalid or expired token") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def _load_principal(db: Session, subject: str, role: Optional[str]) -> Optional[Principal]:
+    if (role or "").upper() in ADMIN_ROLES:
+        user = db.query(User).filter(User.id == subject).first()
+        if not user or user.is_active == False:
+            return None
+        return Principal(
+            id=str(user.id),
+            kind="admin",
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            role=user.role
+        )
+
+    # Member and first assignment in one round trip
+    row = db.query(TeamMember, ProjectAssignment.id)\
+        .outerjoin(ProjectAssignment, ProjectAssignment.team_member_id == TeamMember.id)\
+        .filter(TeamMember.id == subject)\
+        .first()
+    if not row or row[0].is_active == False:
+        return None
+    member, assignment_id = row
+    return Principal(
+        id=str(member.id),
+        kind="candidate",
+        email=member.email,
+        first_name=member.first_name,
+        last_name=member.last_name,
+        role="candidate",
+        assignment_id=str(assignment_id) if assignment_id else None
+    )
+
+
+def invalidate_principal(subject_id) -> None:
+    """Drop every cached principal for a user or team member"""
+    subject = str(subject_id)
+    for key in _principals.keys():
+        if key[0] == subject:
+            _principals.pop(key)
+
+
+def get_current_principal(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Authenticate the request; cached principals need no database access"""
+    token = credentials.credentials if credentials else request.query_params.get("token")
+    if not token:
+        raise _unauthorized("Not authenticated")
+
+    principal = _principal_for_token(db, token)
+    if principal is None:
+        raise _unauthorized()
+    return principal
+
+
+def _principal_for_token(db: Session, token: str) -> Optional[Principal]:
+    payload = decode_jwt_token(token)
+    try:
+        subject = str(uuid_lib.UUID(str(payload["sub"])))
+    except (TypeError, KeyError, ValueError):
+        return None
+
+    key = (subject, payload.get("iat"))
+    principal = _principals.get(key)
+    if principal is None:
+        principal = _load_principal(db, subject, payload.get("role"))
+        if principal is None:
+            return None
+        _principals.set(key, principal)
+    return principal
+
+
+def admin_for_token(token: str) -> Optional[Principal]:
+    """
+    The admin a bearer token belongs to, or None. For code outside the
+    dependency system (middleware); blocking, so call it from a thread.
+    """
+    db = SessionLocal()
+    try:
+        principal = _principal_for_token(db, token)
+    finally:
+        db.close()
+    return principal if principal is not None and principal.is_admin else None
+
+
+def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if not principal.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return principal
+
+
+def require_candidate(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if principal.kind != "candidate":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return principal
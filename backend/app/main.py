@@ -1,13 +1,56 @@
-from fastapi import FastAPI
+import secrets
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.database import engine
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import HTTPCacheMiddleware
+from app.core.instrumentation import RequestInstrumentationMiddleware, instrument_engine
+from app.core.profiling import RequestProfilerMiddleware
+from app.services.notification_stream import hub as notification_hub
+from app.services.unread_counter import unread_counts
+from app.services.login_recorder import last_logins
 from app.routers import dashboard, projects, checklists, requisitions, eligibility, templates, tasks, team_members, documents, task_instances, candidate, auth, admin, notifications
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep cached unread counts in step with other workers and the database
+    unread_counts.start()
+    # Batched last_login writes for candidate sign-in
+    last_logins.start()
+    yield
+    last_logins.stop()
+    unread_counts.stop()
+    # Close the LISTEN connection used for notification streams
+    notification_hub.stop()
+
 app = FastAPI(
     title=settings.APP_NAME,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
+# Route cache policies (Cache-Control, ETag, 304) see the uncompressed body
+app.add_middleware(HTTPCacheMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Admin-requested sampling profiles (runs inside the instrumentation
+# middleware so it can read the request's query stats)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(RequestProfilerMiddleware)
+
+# Query count / DB time per request
+instrument_engine(engine)
+app.add_middleware(RequestInstrumentationMiddleware)
+
+# Scrape-time gauges for the pool and the background queues
+metrics.instrument_pool(engine)
+metrics.JOB_QUEUE_DEPTH.set_function(last_logins.pending_count, queue="last_login_writes")
+metrics.JOB_QUEUE_DEPTH.set_function(notification_hub.queued_event_count, queue="notification_stream")
+
 # CORS (Allow Frontend)
 origins = settings.FRONTEND_ORIGINS.split(",")
 
@@ -24,6 +67,16 @@ app.add_middleware(
 def read_root():
     return {"message": f"Welcome to {settings.APP_NAME} Backend"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics(request: Request):
+        if settings.METRICS_TOKEN and not secrets.compare_digest(
+            request.headers.get("authorization", "").encode(),
+            f"Bearer {settings.METRICS_TOKEN}".encode()
+        ):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
 app.include_router(projects.router, prefix="/api/v1/projects", tags=["projects"])
 app.include_router(checklists.router, prefix="/api/v1/projects", tags=["checklists"])
@@ -1,10 +1,10 @@
 import json
 from sqlalchemy import (
     Column, String, Integer, Date, DateTime, Boolean, 
-    Text, ForeignKey, TIMESTAMP, Numeric
+    Text, ForeignKey, TIMESTAMP, Numeric, Computed
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
 import uuid
 
@@ -19,6 +19,19 @@ def parse_json_field(field_value):
     except (json.JSONDecodeError, TypeError):
         return {}
 
+# Weighted full-text document generated by the database (migrations/add_search_indexes.sql).
+# Deferred so it is never loaded with the row; only search queries reference it.
+# Models with one also set SEARCHABLE_MAPPER_ARGS, so inserts don't fetch the
+# generated value back (RETURNING search_vector) when nothing reads it.
+SEARCHABLE_MAPPER_ARGS = {"eager_defaults": False}
+
+def search_vector_column(primary: str, secondary: str):
+    return deferred(Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('simple', {primary}), 'A') || "
+        f"setweight(to_tsvector('simple', {secondary}), 'B')",
+        persisted=True
+    )))
+
 class Client(Base):
     __tablename__ = "or_clients"
 
@@ -56,6 +69,8 @@ class EligibilityCriteria(Base):
     root_group_logic = Column(String(10), default='AND')
     created_at = Column(TIMESTAMP)
     updated_at = Column(TIMESTAMP)
+    search_vector = search_vector_column("coalesce(name, '')", "coalesce(description, '')")
+    __mapper_args__ = SEARCHABLE_MAPPER_ARGS
     
     rules = relationship("EligibilityRule", back_populates="criteria", cascade="all, delete-orphan", foreign_keys="EligibilityRule.criteria_id")
 
@@ -92,6 +107,8 @@ class ChecklistTemplate(Base):
     created_at = Column(TIMESTAMP)
     updated_at = Column(TIMESTAMP)
     created_by = Column(UUID(as_uuid=True), ForeignKey("or_users.id"))
+    search_vector = search_vector_column("coalesce(name, '')", "coalesce(description, '')")
+    __mapper_args__ = SEARCHABLE_MAPPER_ARGS
     
     task_groups = relationship("TaskGroup", back_populates="template")
 
@@ -125,6 +142,8 @@ class Task(Base):
     configuration = Column(JSONB)
     created_at = Column(TIMESTAMP)
     updated_at = Column(TIMESTAMP)
+    search_vector = search_vector_column("coalesce(name, '')", "coalesce(description, '')")
+    __mapper_args__ = SEARCHABLE_MAPPER_ARGS
     
     task_group = relationship("TaskGroup", back_populates="tasks")
     task_instances = relationship("TaskInstance", back_populates="task")
@@ -158,6 +177,11 @@ class TeamMember(Base):
     
     created_at = Column(TIMESTAMP)
     updated_at = Column(TIMESTAMP)
+    search_vector = search_vector_column(
+        "coalesce(first_name, '') || ' ' || coalesce(last_name, '')",
+        "coalesce(email, '') || ' ' || coalesce(employee_id, '')"
+    )
+    __mapper_args__ = SEARCHABLE_MAPPER_ARGS
     
     assignments = relationship("ProjectAssignment", back_populates="team_member", cascade="all, delete-orphan")
 
@@ -181,6 +205,8 @@ class Project(Base):
     created_at = Column(TIMESTAMP)
     updated_at = Column(TIMESTAMP)
     created_by = Column(UUID(as_uuid=True), ForeignKey("or_users.id"))
+    search_vector = search_vector_column("coalesce(name, '')", "coalesce(client_name, '')")
+    __mapper_args__ = SEARCHABLE_MAPPER_ARGS
     
     assignments = relationship("ProjectAssignment", back_populates="project", cascade="all, delete-orphan")
     contacts = relationship("ProjectContact", back_populates="project", cascade="all, delete-orphan")
@@ -1,15 +1,19 @@
 """
 Admin Management Routes
-Handles admin profile updates, password changes, and admin user creation
+Handles admin profile updates, password changes, admin user creation and
+request profile downloads
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 from typing import Optional, List
-import hashlib
 
 from app.core.database import get_db
+from app.core.passwords import hash_password_async, verify_password_async
+from app.core.profiling import folded_stacks, list_profiles, load_profile
+from app.core.security import Principal, require_admin, invalidate_principal
 from app.models.models import User
 
 router = APIRouter()
@@ -47,81 +51,20 @@ class AdminUserResponse(BaseModel):
     createdAt: Optional[str]
 
 
-# =============================================
-# HELPER FUNCTIONS
-# =============================================
-
-def hash_password(password: str) -> str:
-    """Simple password hashing using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
-def verify_password(password: str, password_hash: str) -> bool:
-    """Verify password against hash"""
-    return hash_password(password) == password_hash
-
-
-def get_user_from_token(token: str, db: Session) -> Optional[User]:
-    """Get user from JWT token"""
-    import jwt
-    from app.core.config import settings
-    JWT_SECRET = settings.JWT_SECRET
-    JWT_ALGORITHM = "HS256"
-    
-    if not token:
-        return None
-    
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            return None
-        return db.query(User).filter(User.id == user_id).first()
-    except jwt.ExpiredSignatureError:
-        print("Token expired")
-        return None
-    except jwt.InvalidTokenError as e:
-        print(f"Invalid token: {e}")
-        return None
-    except Exception as e:
-        print(f"Token error: {e}")
-        return None
-
-
-def is_admin(user: User) -> bool:
-    """Check if user is an admin (case-insensitive)"""
-    if not user or not user.role:
-        return False
-    return user.role.lower() == "admin"
-
-
 # =============================================
 # GET CURRENT ADMIN PROFILE
 # =============================================
 
 @router.get("/profile")
-async def get_admin_profile(token: str, db: Session = Depends(get_db)):
+async def get_admin_profile(principal: Principal = Depends(require_admin)):
     """Get current admin's profile"""
-    user = get_user_from_token(token, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    if not is_admin(user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     return {
-        "id": str(user.id),
-        "email": user.email,
-        "firstName": user.first_name,
-        "lastName": user.last_name,
-        "role": user.role,
-        "isActive": user.is_active
+        "id": principal.id,
+        "email": principal.email,
+        "firstName": principal.first_name,
+        "lastName": principal.last_name,
+        "role": principal.role,
+        "isActive": True
     }
 
 
@@ -131,24 +74,18 @@ async def get_admin_profile(token: str, db: Session = Depends(get_db)):
 
 @router.put("/profile")
 async def update_admin_profile(
-    token: str,
     data: UpdateProfileRequest,
+    principal: Principal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Update current admin's profile (name only)"""
-    user = get_user_from_token(token, db)
+    user = db.query(User).filter(User.id == principal.id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
     
-    if not is_admin(user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     # Update fields
     user.first_name = data.firstName
     user.last_name = data.lastName
@@ -156,6 +93,7 @@ async def update_admin_profile(
     
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id)
     
     return {
         "success": True,
@@ -176,26 +114,20 @@ async def update_admin_profile(
 
 @router.put("/password")
 async def change_admin_password(
-    token: str,
     data: ChangePasswordRequest,
+    principal: Principal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Change current admin's password"""
-    user = get_user_from_token(token, db)
+    user = db.query(User).filter(User.id == principal.id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
     
-    if not is_admin(user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     # Verify current password
-    if not verify_password(data.currentPassword, user.password_hash):
+    if not await verify_password_async(data.currentPassword, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -215,10 +147,11 @@ async def change_admin_password(
         )
     
     # Update password
-    user.password_hash = hash_password(data.newPassword)
+    user.password_hash = await hash_password_async(data.newPassword)
     user.updated_at = datetime.utcnow()
     
     db.commit()
+    invalidate_principal(user.id)
     
     return {
         "success": True,
@@ -231,21 +164,11 @@ async def change_admin_password(
 # =============================================
 
 @router.get("/users")
-async def list_admin_users(token: str, db: Session = Depends(get_db)):
+async def list_admin_users(
+    principal: Principal = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
     """List all admin users"""
-    user = get_user_from_token(token, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    if not is_admin(user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     admins = db.query(User).filter(User.role == "admin").all()
     
     return [
@@ -268,24 +191,11 @@ async def list_admin_users(token: str, db: Session = Depends(get_db)):
 
 @router.post("/users")
 async def create_admin_user(
-    token: str,
     data: CreateAdminRequest,
+    principal: Principal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Create a new admin user"""
-    user = get_user_from_token(token, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    if not is_admin(user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     # Check if email already exists
     existing = db.query(User).filter(User.email == data.email).first()
     if existing:
@@ -306,7 +216,7 @@ async def create_admin_user(
         email=data.email,
         first_name=data.firstName,
         last_name=data.lastName,
-        password_hash=hash_password(data.password),
+        password_hash=await hash_password_async(data.password),
         role="admin",
         is_active=True,
         created_at=datetime.utcnow(),
@@ -338,25 +248,12 @@ async def create_admin_user(
 @router.delete("/users/{user_id}")
 async def delete_admin_user(
     user_id: str,
-    token: str,
+    principal: Principal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """Delete an admin user"""
-    current_user = get_user_from_token(token, db)
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    if not is_admin(current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
     # Prevent self-deletion
-    if str(current_user.id) == user_id:
+    if principal.id == user_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete your own account"
@@ -372,8 +269,42 @@ async def delete_admin_user(
     
     db.delete(user_to_delete)
     db.commit()
+    invalidate_principal(user_id)
     
     return {
         "success": True,
         "message": "Admin user deleted successfully"
     }
+
+
+# =============================================
+# REQUEST PROFILES
+# =============================================
+
+# Plain def: reading profile files would block the event loop
+@router.get("/profiles")
+def list_request_profiles(principal: Principal = Depends(require_admin)):
+    """Stored request profiles (see app/core/profiling.py), newest first"""
+    return {"profiles": list_profiles()}
+
+
+@router.get("/profiles/{profile_id}")
+def get_request_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|folded)$"),
+    principal: Principal = Depends(require_admin)
+):
+    """Download a profile as JSON or as folded stacks for flame graph tools"""
+    profile = load_profile(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    if format == "folded":
+        return PlainTextResponse(
+            folded_stacks(profile),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+        )
+    return profile
@@ -5,23 +5,21 @@ Handles login for admins and candidates, password setup, and token verification
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
-from datetime import datetime, timedelta
-from typing import Optional
-import hashlib
+from sqlalchemy import and_, func
+from datetime import datetime
+from typing import Optional, Tuple
 import secrets
-import jwt
 
 from app.core.database import get_db
+from app.core.passwords import hash_password, verify_password, verify_and_update
+from app.core.security import (
+    Principal, create_jwt_token, get_current_principal, require_candidate, invalidate_principal
+)
 from app.models.models import User, TeamMember, ProjectAssignment
-from app.core.config import settings
+from app.services.login_recorder import last_logins
 
 router = APIRouter()
 
-# JWT Configuration
-JWT_SECRET = settings.JWT_SECRET
-JWT_ALGORITHM = "HS256"
-JWT_EXPIRATION_HOURS = 24
-
 
 # =============================================
 # PYDANTIC SCHEMAS
@@ -61,37 +59,22 @@ class TokenVerifyResponse(BaseModel):
 # HELPER FUNCTIONS
 # =============================================
 
-def hash_password(password: str) -> str:
-    """Simple password hashing using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-
-def verify_password(password: str, password_hash: str) -> bool:
-    """Verify password against hash"""
-    return hash_password(password) == password_hash
-
-
-def create_jwt_token(user_id: str, role: str, email: str) -> str:
-    """Create a JWT token"""
-    payload = {
-        "sub": user_id,
-        "role": role,
-        "email": email,
-        "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-        "iat": datetime.utcnow()
-    }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-
-
-def decode_jwt_token(token: str) -> Optional[dict]:
-    """Decode and verify JWT token"""
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+def find_candidate(db: Session, email: str) -> Tuple[Optional[TeamMember], Optional[str]]:
+    """
+    Team member by case-insensitive email plus the id of a non-archived
+    assignment, in one query (uses idx_team_members_email_lower).
+    """
+    row = db.query(TeamMember, ProjectAssignment.id)\
+        .outerjoin(ProjectAssignment, and_(
+            ProjectAssignment.team_member_id == TeamMember.id,
+            ProjectAssignment.status != 'ARCHIVED'
+        ))\
+        .filter(func.lower(TeamMember.email) == email.lower())\
+        .first()
+    if not row:
+        return None, None
+    member, assignment_id = row
+    return member, str(assignment_id) if assignment_id else None
 
 
 # =============================================
@@ -115,12 +98,17 @@ def admin_login(data: AdminLoginRequest, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(data.password, user.password_hash):
+    valid, new_hash = verify_and_update(data.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Upgrade legacy or low-cost hashes while we have the plain password
+    if new_hash:
+        user.password_hash = new_hash
+    
     # Update last login
     user.last_login = datetime.utcnow()
     db.commit()
@@ -151,10 +139,8 @@ def admin_login(data: AdminLoginRequest, db: Session = Depends(get_db)):
 def candidate_login(data: CandidateLoginRequest, db: Session = Depends(get_db)):
     """Login for candidates (team members)"""
     
-    # Find team member by email
-    member = db.query(TeamMember).filter(
-        TeamMember.email == data.email.lower()
-    ).first()
+    # Find team member and active assignment by email
+    member, assignment_id = find_candidate(db, data.email)
     
     if not member:
         raise HTTPException(
@@ -190,23 +176,21 @@ def candidate_login(data: CandidateLoginRequest, db: Session = Depends(get_db)):
         )
     
     # Verify password for returning users
-    if not verify_password(data.password, member.password_hash):
+    valid, new_hash = verify_and_update(data.password, member.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    # Update last login
-    member.last_login = datetime.utcnow()
-    db.commit()
+    # Upgrade legacy or low-cost hashes while we have the plain password
+    # (a one-off write per member)
+    if new_hash:
+        member.password_hash = new_hash
+        db.commit()
     
-    # Get assignment info - only for active members, exclude archived
-    assignment = None
-    if member.is_active:
-        assignment = db.query(ProjectAssignment).filter(
-            ProjectAssignment.team_member_id == member.id,
-            ProjectAssignment.status != 'ARCHIVED'
-        ).first()
+    # Written in the background with other recent logins
+    last_logins.record(member.id)
     
     # Create token
     token = create_jwt_token(str(member.id), "candidate", member.email)
@@ -219,7 +203,7 @@ def candidate_login(data: CandidateLoginRequest, db: Session = Depends(get_db)):
             "email": member.email,
             "firstName": member.first_name,
             "lastName": member.last_name,
-            "assignmentId": str(assignment.id) if assignment else None,
+            "assignmentId": assignment_id,
             "isActive": member.is_active if member.is_active is not None else True
         },
         role="candidate",
@@ -247,10 +231,8 @@ def set_candidate_password(data: SetPasswordRequest, db: Session = Depends(get_d
             detail="Password must be at least 6 characters"
         )
     
-    # Find member
-    member = db.query(TeamMember).filter(
-        TeamMember.email == data.email.lower()
-    ).first()
+    # Find member and active assignment
+    member, assignment_id = find_candidate(db, data.email)
     
     if not member:
         raise HTTPException(
@@ -261,13 +243,9 @@ def set_candidate_password(data: SetPasswordRequest, db: Session = Depends(get_d
     # Set password
     member.password_hash = hash_password(data.newPassword)
     member.is_first_login = False
-    member.last_login = datetime.utcnow()
     db.commit()
-    
-    # Get assignment
-    assignment = db.query(ProjectAssignment).filter(
-        ProjectAssignment.team_member_id == member.id
-    ).first()
+    invalidate_principal(member.id)
+    last_logins.record(member.id)
     
     # Create new token
     token = create_jwt_token(str(member.id), "candidate", member.email)
@@ -281,7 +259,7 @@ def set_candidate_password(data: SetPasswordRequest, db: Session = Depends(get_d
             "email": member.email,
             "firstName": member.first_name,
             "lastName": member.last_name,
-            "assignmentId": str(assignment.id) if assignment else None
+            "assignmentId": assignment_id
         }
     }
 
@@ -291,56 +269,33 @@ def set_candidate_password(data: SetPasswordRequest, db: Session = Depends(get_d
 # =============================================
 
 @router.get("/me")
-def get_current_user(token: str, db: Session = Depends(get_db)):
+def get_current_user(principal: Principal = Depends(get_current_principal)):
     """Verify token and return current user info"""
     
-    payload = decode_jwt_token(token)
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    role = payload.get("role")
-    user_id = payload.get("sub")
-    
-    if role == "admin" or role in ["ADMIN", "PROJECT_MANAGER", "PROCESSOR", "VIEWER"]:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
+    if principal.kind == "admin":
         return {
             "valid": True,
             "user": {
-                "id": str(user.id),
-                "email": user.email,
-                "firstName": user.first_name,
-                "lastName": user.last_name,
-                "role": user.role
+                "id": principal.id,
+                "email": principal.email,
+                "firstName": principal.first_name,
+                "lastName": principal.last_name,
+                "role": principal.role
             },
             "role": "admin"
         }
-    else:
-        member = db.query(TeamMember).filter(TeamMember.id == user_id).first()
-        if not member:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        assignment = db.query(ProjectAssignment).filter(
-            ProjectAssignment.team_member_id == member.id
-        ).first()
-        
-        return {
-            "valid": True,
-            "user": {
-                "id": str(member.id),
-                "email": member.email,
-                "firstName": member.first_name,
-                "lastName": member.last_name,
-                "assignmentId": str(assignment.id) if assignment else None
-            },
-            "role": "candidate"
-        }
+    
+    return {
+        "valid": True,
+        "user": {
+            "id": principal.id,
+            "email": principal.email,
+            "firstName": principal.first_name,
+            "lastName": principal.last_name,
+            "assignmentId": principal.assignment_id
+        },
+        "role": "candidate"
+    }
 
 
 # =============================================
@@ -364,21 +319,15 @@ class ChangePasswordRequest(BaseModel):
 
 
 @router.post("/candidate/change-password")
-def change_candidate_password(data: ChangePasswordRequest, token: str, db: Session = Depends(get_db)):
+def change_candidate_password(
+    data: ChangePasswordRequest,
+    principal: Principal = Depends(require_candidate),
+    db: Session = Depends(get_db)
+):
     """Change password for logged-in candidates"""
     
-    # Verify token
-    payload = decode_jwt_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    
     # Find member
-    member = db.query(TeamMember).filter(TeamMember.id == user_id).first()
+    member = db.query(TeamMember).filter(TeamMember.id == principal.id).first()
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -408,5 +357,6 @@ def change_candidate_password(data: ChangePasswordRequest, token: str, db: Sessi
     # Update password
     member.password_hash = hash_password(data.newPassword)
     db.commit()
+    invalidate_principal(member.id)
     
     return {"success": True, "message": "Password changed successfully"}
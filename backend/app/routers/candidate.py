@@ -11,10 +11,12 @@ from pydantic import BaseModel
 import uuid as uuid_lib
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.models.models import (
     TaskInstance, Task, ProjectAssignment, TeamMember, 
     Project, Document
 )
+from app.services.template_snapshots import get_compiled_template, resolve_tasks
 
 router = APIRouter()
 
@@ -119,16 +121,25 @@ class ProjectSubmissionGroup(BaseModel):
 # HELPER FUNCTIONS
 # =============================================
 
-def get_category_stats(task_instances, db: Session):
+def get_effective_tasks(db: Session, template_id, task_instances) -> Dict[str, dict]:
+    """
+    Task definitions (library source fields merged in) for the given
+    instances, keyed by task id, from the compiled template snapshot
+    """
+    compiled = get_compiled_template(db, template_id)
+    return resolve_tasks(db, compiled, (ti.task_id for ti in task_instances))
+
+
+def get_category_stats(task_instances, tasks: Dict[str, dict]):
     """Calculate completion stats by category"""
     categories = {}
     
     for ti in task_instances:
-        task = db.query(Task).filter(Task.id == ti.task_id).first()
+        task = tasks.get(str(ti.task_id))
         if not task:
             continue
             
-        cat = task.category or 'OTHER'
+        cat = task["category"] or 'OTHER'
         if cat not in categories:
             categories[cat] = {'id': cat.lower(), 'name': cat.replace('_', ' ').title(), 'completed': 0, 'total': 0}
         
@@ -139,7 +150,7 @@ def get_category_stats(task_instances, db: Session):
     return list(categories.values())
 
 
-def get_priority_tasks(task_instances, db: Session, limit: int = 3):
+def get_priority_tasks(task_instances, tasks: Dict[str, dict], limit: int = 3):
     """Get top priority incomplete tasks"""
     priority_tasks = []
     
@@ -147,7 +158,7 @@ def get_priority_tasks(task_instances, db: Session, limit: int = 3):
         if ti.status in ['COMPLETED', 'WAIVED']:
             continue
             
-        task = db.query(Task).filter(Task.id == ti.task_id).first()
+        task = tasks.get(str(ti.task_id))
         if not task:
             continue
         
@@ -163,9 +174,9 @@ def get_priority_tasks(task_instances, db: Session, limit: int = 3):
         
         priority_tasks.append({
             'id': str(ti.id),
-            'taskId': str(task.id),
-            'name': task.name,
-            'type': task.type.lower() if task.type else 'form',
+            'taskId': str(task["id"]),
+            'name': task["name"],
+            'type': task["type"].lower() if task["type"] else 'form',
             'dueIn': days_until,
             'priority': priority,
             'status': ti.status
@@ -228,11 +239,14 @@ def get_candidate_dashboard(
         start_date_str = project.start_date.isoformat()
         days_until_start = (project.start_date - datetime.utcnow().date()).days
     
+    # Task definitions for all instances at once
+    tasks = get_effective_tasks(db, project.template_id if project else None, task_instances)
+    
     # Get category breakdown
-    categories = get_category_stats(task_instances, db)
+    categories = get_category_stats(task_instances, tasks)
     
     # Get priority tasks
-    priority_tasks = get_priority_tasks(task_instances, db)
+    priority_tasks = get_priority_tasks(task_instances, tasks)
     
     return CandidateDashboardResponse(
         candidateId=str(team_member.id),
@@ -279,59 +293,54 @@ def get_candidate_tasks(
     
     task_instances = query.all()
     
+    # Task definitions come from the compiled template snapshot, which already
+    # carries the source task's editable fields for tasks linked to the library
+    template_id = db.query(Project.template_id).filter(Project.id == assignment.project_id).scalar()
+    task_defs = get_effective_tasks(db, template_id, task_instances)
+    
     # Build task list with full details
     tasks = []
     for ti in task_instances:
-        task = db.query(Task).filter(Task.id == ti.task_id).first()
+        task = task_defs.get(str(ti.task_id))
         if not task:
             continue
         
         # Apply filters
-        if category and task.category and task.category.lower() != category.lower():
+        if category and task["category"] and task["category"].lower() != category.lower():
             continue
         if status and ti.status != status:
             continue
         
-        # If task has a source_task_id, use source task's editable fields
-        # This allows library task edits to propagate to candidates
-        effective_name = task.name
-        effective_description = task.description
-        effective_configuration = task.configuration
-        
-        if task.source_task_id:
-            source_task = db.query(Task).filter(Task.id == task.source_task_id).first()
-            if source_task:
-                effective_name = source_task.name
-                effective_description = source_task.description
-                effective_configuration = source_task.configuration
-        
-        tasks.append(CandidateTaskItem(
-            id=str(ti.id),
-            taskId=str(task.id),
-            name=effective_name,
-            description=effective_description,
-            type=task.type,
-            category=task.category,
-            status=ti.status,
-            dueDate=ti.due_date.isoformat() if ti.due_date else None,
-            isRequired=task.is_required if task.is_required is not None else True,
-            configuration=effective_configuration,
-            result=ti.result,
-            startedAt=ti.started_at,
-            completedAt=ti.completed_at
-        ))
+        tasks.append({
+            "id": str(ti.id),
+            "taskId": str(task["id"]),
+            "name": task["name"],
+            "description": task["description"],
+            "type": task["type"],
+            "category": task["category"],
+            "status": ti.status,
+            "dueDate": ti.due_date.isoformat() if ti.due_date else None,
+            "isRequired": task["is_required"] if task["is_required"] is not None else True,
+            "configuration": task["configuration"],
+            "result": ti.result,
+            "startedAt": ti.started_at,
+            "completedAt": ti.completed_at
+        })
     
     # Calculate counts
-    completed_count = sum(1 for t in tasks if t.status == 'COMPLETED')
+    completed_count = sum(1 for t in tasks if t["status"] == 'COMPLETED')
     pending_count = len(tasks) - completed_count
     
-    return CandidateTaskListResponse(
-        assignmentId=assignment_id,
-        tasks=tasks,
-        totalCount=len(tasks),
-        completedCount=completed_count,
-        pendingCount=pending_count
-    )
+    # Rows come straight from the database and the compiled template, so
+    # they are sent as-is in the CandidateTaskListResponse shape instead of
+    # being validated into models (configuration blobs can be large)
+    return FastJSONResponse({
+        "assignmentId": assignment_id,
+        "tasks": tasks,
+        "totalCount": len(tasks),
+        "completedCount": completed_count,
+        "pendingCount": pending_count
+    })
 
 
 # =============================================
@@ -354,7 +363,11 @@ def get_candidate_task_detail(
     if not ti:
         raise HTTPException(status_code=404, detail="Task instance not found")
     
-    task = db.query(Task).filter(Task.id == ti.task_id).first()
+    template_id = db.query(Project.template_id)\
+        .join(ProjectAssignment, ProjectAssignment.project_id == Project.id)\
+        .filter(ProjectAssignment.id == assignment_id)\
+        .scalar()
+    task = get_effective_tasks(db, template_id, [ti]).get(str(ti.task_id))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -375,7 +388,7 @@ def get_candidate_task_detail(
         for doc in documents
     ]
     
-    return {
+    return FastJSONResponse({
         "taskInstance": {
             "id": str(ti.id),
             "status": ti.status,
@@ -385,16 +398,16 @@ def get_candidate_task_detail(
             "dueDate": ti.due_date.isoformat() if ti.due_date else None
         },
         "task": {
-            "id": str(task.id),
-            "name": task.name,
-            "description": task.description,
-            "type": task.type,
-            "category": task.category,
-            "isRequired": task.is_required,
-            "configuration": task.configuration
+            "id": str(task["id"]),
+            "name": task["name"],
+            "description": task["description"],
+            "type": task["type"],
+            "category": task["category"],
+            "isRequired": task["is_required"],
+            "configuration": task["configuration"]
         },
         "documents": document_list
-    }
+    })
 
 
 # =============================================
@@ -453,6 +466,7 @@ def submit_candidate_form(
     }
     ti.status = 'COMPLETED'
     ti.completed_at = datetime.utcnow()
+    ti.updated_at = datetime.utcnow()
     
     if not ti.started_at:
         ti.started_at = datetime.utcnow()
@@ -491,6 +505,7 @@ def start_candidate_task(
     if ti.status == 'NOT_STARTED':
         ti.status = 'IN_PROGRESS'
         ti.started_at = datetime.utcnow()
+        ti.updated_at = datetime.utcnow()
         db.commit()
     
     return {
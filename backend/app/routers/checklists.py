@@ -1,20 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 import uuid as uuid_lib
 import json
 
 from app.core.database import get_db
+from app.core.http_cache import REVALIDATE, cache_policy, not_modified
 from app.models.models import TaskGroup, Task, Project, ChecklistTemplate
 from app.schemas.checklists import (
     TaskGroupResponse, TaskResponse, 
     CreateTaskGroupRequest, CreateTaskRequest
 )
+from app.services.task_propagation import run_template_propagation
+from app.services.template_snapshots import get_compiled_template, bump_template_version
 
 router = APIRouter()
 
-@router.get("/{project_id}/checklist", response_model=List[TaskGroupResponse])
-def get_project_checklist(project_id: str, db: Session = Depends(get_db)):
+@router.get("/{project_id}/checklist", response_model=List[TaskGroupResponse], dependencies=[cache_policy(REVALIDATE)])
+def get_project_checklist(project_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     # Verify project exists
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
@@ -23,36 +26,36 @@ def get_project_checklist(project_id: str, db: Session = Depends(get_db)):
     # Get template for this project
     if not project.template_id:
         return []
-        
-    # Fetch groups for this template
-    groups = db.query(TaskGroup)\
-        .filter(TaskGroup.template_id == project.template_id)\
-        .order_by(TaskGroup.display_order)\
-        .all()
     
-    response = []
-    for g in groups:
-        tasks_list = []
-        for t in g.tasks:
-            tasks_list.append(TaskResponse(
-                id=str(t.id),
-                name=t.name,
-                description=t.description,
-                type=t.type or "FORM",
-                category=t.category,
-                isRequired=bool(t.is_required),
-                configuration=t.configuration or {}
-            ))
-            
-        response.append(TaskGroupResponse(
-            id=str(g.id),
-            name=g.name,
-            category=g.category or "GENERAL",
-            taskCount=len(tasks_list),
-            tasks=tasks_list
-        ))
-        
-    return response
+    # The checklist is the template's compiled snapshot, so it shares its ETag
+    compiled = get_compiled_template(db, project.template_id)
+    if not compiled:
+        return []
+    unchanged = not_modified(request, response, compiled.etag)
+    if unchanged:
+        return unchanged
+    
+    return [
+        TaskGroupResponse(
+            id=str(g["id"]),
+            name=g["name"],
+            category=g["category"] or "GENERAL",
+            taskCount=len(g["tasks"]),
+            tasks=[
+                TaskResponse(
+                    id=str(t["id"]),
+                    name=t["name"],
+                    description=t["description"],
+                    type=t["type"] or "FORM",
+                    category=t["category"],
+                    isRequired=bool(t["is_required"]),
+                    configuration=t["configuration"] or {}
+                )
+                for t in g["tasks"]
+            ]
+        )
+        for g in compiled.groups
+    ]
 
 @router.post("/{project_id}/groups", response_model=TaskGroupResponse)
 def create_task_group(
@@ -81,6 +84,7 @@ def create_task_group(
     )
     
     db.add(new_group)
+    bump_template_version(db, project.template_id)
     db.commit()
     db.refresh(new_group)
     
@@ -97,6 +101,7 @@ def add_task_to_group(
     project_id: str,
     group_id: str,
     request: CreateTaskRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     # Verify group exists
@@ -120,9 +125,13 @@ def add_task_to_group(
     )
     
     db.add(new_task)
+    bump_template_version(db, group.template_id)
     db.commit()
     db.refresh(new_task)
     
+    # Existing assignments on this template get an instance of the new task
+    background_tasks.add_task(run_template_propagation, group.template_id)
+    
     return TaskResponse(
         id=str(new_task.id),
         name=new_task.name,
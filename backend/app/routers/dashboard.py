@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, true
 from typing import List
+from datetime import datetime, timedelta
 
+from app.core.cache import LRUCache
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.models import Project, ProjectAssignment, TaskInstance, Task, TeamMember, ProjectContact
 from app.schemas.dashboard import (
@@ -12,30 +15,48 @@ from app.schemas.dashboard import (
 
 router = APIRouter()
 
-@router.get("/stats/global", response_model=GlobalStatsResponse)
-def get_global_stats(db: Session = Depends(get_db)):
-    # 1. Active Projects
-    active_projects_count = db.query(Project).filter(Project.status == 'ACTIVE').count()
-    
-    # 2. Team Members (Active only)
-    total_members = db.query(TeamMember).filter(TeamMember.is_active == True).count()
-    
-    # 3. Completion Stats
-    completed = db.query(ProjectAssignment).filter(ProjectAssignment.status == 'COMPLETED').count()
-    in_progress = db.query(ProjectAssignment).filter(ProjectAssignment.status == 'IN_PROGRESS').count()
-    
-    # 4. Blocked Members
-    blocked_members = db.query(ProjectAssignment).filter(ProjectAssignment.status == 'BLOCKED').count()
-    
+# Shared by every admin's dashboard; see DASHBOARD_STATS_TTL_SECONDS
+_global_stats = LRUCache(maxsize=1, ttl=settings.DASHBOARD_STATS_TTL_SECONDS)
+
+
+def compute_global_stats(db: Session) -> GlobalStatsResponse:
+    """All the global counts in one statement: one FILTER aggregate per table"""
+    week_start = datetime.utcnow() - timedelta(days=7)
+    projects = select(
+        func.count().filter(Project.status == 'ACTIVE').label("active_projects"),
+    ).subquery()
+    members = select(
+        func.count().filter(TeamMember.is_active == True).label("total_members"),
+        func.count().filter(
+            TeamMember.is_active == True,
+            TeamMember.created_at >= week_start
+        ).label("new_members"),
+    ).subquery()
+    assignments = select(
+        func.count().filter(ProjectAssignment.status == 'COMPLETED').label("completed"),
+        func.count().filter(ProjectAssignment.status == 'IN_PROGRESS').label("in_progress"),
+        func.count().filter(ProjectAssignment.status == 'BLOCKED').label("blocked"),
+    ).subquery()
+    # Each subquery is a single row, so joining them on true is one row too
+    row = db.execute(
+        select(projects, members, assignments)
+        .select_from(projects.join(members, true()).join(assignments, true()))
+    ).one()
+
     return GlobalStatsResponse(
-        activeProjects=active_projects_count,
-        totalTeamMembers=total_members,
-        completedOnboarding=completed,
-        inProgress=in_progress,
-        blockedMembers=blocked_members,
-        memberGrowthThisWeek=0  # Placeholder
+        activeProjects=row.active_projects,
+        totalTeamMembers=row.total_members,
+        completedOnboarding=row.completed,
+        inProgress=row.in_progress,
+        blockedMembers=row.blocked,
+        memberGrowthThisWeek=row.new_members
     )
 
+
+@router.get("/stats/global", response_model=GlobalStatsResponse)
+def get_global_stats(db: Session = Depends(get_db)):
+    return _global_stats.get_or_load("global", lambda: compute_global_stats(db))
+
 @router.get("/projects/summary", response_model=List[ProjectSummary])
 def get_projects_summary(db: Session = Depends(get_db)):
     active_projects = db.query(Project).filter(Project.status == 'ACTIVE').all()
@@ -66,53 +87,93 @@ def get_projects_summary(db: Session = Depends(get_db)):
         
     return summary_list
 
+# Task category -> dashboard stats column; anything else counts as a form
+CATEGORY_STATS_KEYS = {
+    'FORMS': 'forms',
+    'DOCUMENTS': 'docs',
+    'CERTIFICATIONS': 'compliance',
+    'COMPLIANCE': 'compliance',
+    'TRAININGS': 'training'
+}
+
+# Status of the most recently updated task instance -> activity text
+ACTIVITY_DESCRIPTIONS = {
+    'COMPLETED': "Completed a task",
+    'IN_PROGRESS': "Started a task",
+}
+
+def empty_task_stats() -> dict:
+    return {key: {'completed': 0, 'total': 0} for key in ('forms', 'docs', 'compliance', 'training')}
+
+def time_ago(moment: datetime, now: datetime) -> str:
+    seconds = max(0, int((now - moment).total_seconds()))
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{seconds // 60}m ago"
+    if seconds < 86400:
+        return f"{seconds // 3600}h ago"
+    if seconds < 30 * 86400:
+        return f"{seconds // 86400}d ago"
+    return f"{seconds // (30 * 86400)}mo ago"
+
 @router.get("/projects/{project_id}/members", response_model=List[TeamMemberDetail])
 def get_project_members(project_id: str, db: Session = Depends(get_db)):
-    # Get assignments for this project
-    assignments = db.query(ProjectAssignment).filter(
-        ProjectAssignment.project_id == project_id
-    ).all()
+    # Assignments with their team member info
+    assignments = db.query(ProjectAssignment, TeamMember)\
+        .join(TeamMember, TeamMember.id == ProjectAssignment.team_member_id)\
+        .filter(ProjectAssignment.project_id == project_id)\
+        .order_by(ProjectAssignment.assigned_at, ProjectAssignment.id)\
+        .all()
     
-    result = []
-    for a in assignments:
-        # Get team member info
-        tm = a.team_member
-        if not tm:
-            continue
-        
-        # Get task stats
-        task_query = db.query(
-            Task.category,
-            TaskInstance.status,
-            func.count(TaskInstance.id)
-        ).join(TaskInstance, Task.id == TaskInstance.task_id)\
-         .filter(TaskInstance.assignment_id == a.id)\
-         .group_by(Task.category, TaskInstance.status)\
-         .all()
-         
-        # Initialize stats container
-        stats = {
-            'forms': {'completed': 0, 'total': 0},
-            'docs': {'completed': 0, 'total': 0},
-            'compliance': {'completed': 0, 'total': 0},
-            'training': {'completed': 0, 'total': 0}
-        }
+    # Task stats and latest activity for every assignment in one aggregate
+    task_rows = db.query(
+        TaskInstance.assignment_id,
+        Task.category,
+        TaskInstance.status,
+        func.count(TaskInstance.id),
+        # Instances nobody has touched keep updated_at == created_at
+        func.max(TaskInstance.updated_at).filter(TaskInstance.updated_at > TaskInstance.created_at)
+    ).join(Task, Task.id == TaskInstance.task_id)\
+     .join(ProjectAssignment, ProjectAssignment.id == TaskInstance.assignment_id)\
+     .filter(ProjectAssignment.project_id == project_id)\
+     .group_by(TaskInstance.assignment_id, Task.category, TaskInstance.status)\
+     .all()
+    
+    stats_by_assignment = {}
+    latest_by_assignment = {}
+    for assignment_id, cat, status, count, updated_at in task_rows:
+        if assignment_id not in stats_by_assignment:
+            stats_by_assignment[assignment_id] = empty_task_stats()
+        stats = stats_by_assignment[assignment_id]
+        key = CATEGORY_STATS_KEYS.get(cat, 'forms')
+        stats[key]['total'] += count
+        if status == 'COMPLETED':
+            stats[key]['completed'] += count
         
-        # Mapping DB category to Frontend category keys
-        cat_map = {
-            'FORMS': 'forms',
-            'DOCUMENTS': 'docs',
-            'CERTIFICATIONS': 'compliance', 
-            'COMPLIANCE': 'compliance',
-            'TRAININGS': 'training'
-        }
+        if updated_at and (assignment_id not in latest_by_assignment or updated_at > latest_by_assignment[assignment_id][0]):
+            latest_by_assignment[assignment_id] = (updated_at, status)
+    
+    now = datetime.utcnow()
+    result = []
+    for a, tm in assignments:
+        stats = stats_by_assignment.get(a.id) or empty_task_stats()
         
-        for cat, status, count in task_query:
-            key = cat_map.get(cat, 'forms')
-            if key in stats:
-                stats[key]['total'] += count
-                if status == 'COMPLETED':
-                    stats[key]['completed'] += count
+        # Latest task update, or the assignment itself before any task moved
+        last_activity = None
+        if a.id in latest_by_assignment:
+            updated_at, status = latest_by_assignment[a.id]
+            last_activity = LastActivity(
+                description=ACTIVITY_DESCRIPTIONS.get(status, "Updated a task"),
+                timeAgo=time_ago(updated_at, now),
+                at=updated_at
+            )
+        elif a.assigned_at:
+            last_activity = LastActivity(
+                description="Assigned to project",
+                timeAgo=time_ago(a.assigned_at, now),
+                at=a.assigned_at
+            )
         
         result.append(TeamMemberDetail(
             id=str(tm.id),
@@ -124,7 +185,7 @@ def get_project_members(project_id: str, db: Session = Depends(get_db)):
             status=a.status,
             progressPercentage=int(a.progress_percentage) if a.progress_percentage else 0,
             assignedProcessorName=None,  # Could fetch via processor_id
-            lastActivity=LastActivity(description="Updated profile", timeAgo="2h ago"),
+            lastActivity=last_activity,
             taskStats=TaskCategoryStats(
                 forms=TaskStats(**stats['forms']),
                 docs=TaskStats(**stats['docs']),
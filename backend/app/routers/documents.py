@@ -7,6 +7,7 @@ from pydantic import BaseModel
 import uuid as uuid_lib
 import base64
 
+from app.core import metrics
 from app.core.database import get_db
 from app.models.models import Document, TaskInstance, TeamMember
 
@@ -65,6 +66,7 @@ async def upload_document(
     
     # Validate file size
     if file_size > MAX_FILE_SIZE:
+        metrics.DOCUMENT_UPLOADS_REJECTED.inc()
         raise HTTPException(
             status_code=400, 
             detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024*1024)}MB"
@@ -113,6 +115,7 @@ async def upload_document(
     db.add(new_doc)
     db.commit()
     db.refresh(new_doc)
+    metrics.DOCUMENT_UPLOAD_BYTES.observe(file_size)
     
     return UploadResponse(
         success=True,
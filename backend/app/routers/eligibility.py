@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime
 import uuid as uuid_lib
 import json
 
 from app.core.database import get_db
+from app.core.http_cache import REVALIDATE, cache_policy, not_modified, updated_at_etag
+from app.core.pagination import SortKey, estimate_count, paginate, set_page_headers
 from app.models.models import EligibilityCriteria, EligibilityRule
 from app.schemas.eligibility import (
     EligibilityCriteriaListItem, EligibilityCriteriaDetail,
     CreateEligibilityCriteriaRequest, UpdateEligibilityCriteriaRequest
 )
+from app.services.search import text_search
 
 router = APIRouter()
 
@@ -132,26 +134,30 @@ def save_rule_tree(criteria_id: str, parent_group_id: Optional[str], rules: List
             )
             db.add(new_rule)
 
-@router.get("/", response_model=List[EligibilityCriteriaListItem])
+@router.get("/", response_model=List[EligibilityCriteriaListItem], dependencies=[cache_policy(REVALIDATE)])
 def list_eligibility_criteria(
+    response: Response,
     search: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; without it every match is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(EligibilityCriteria)
-    
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                EligibilityCriteria.name.ilike(search_term),
-                EligibilityCriteria.description.ilike(search_term)
-            )
-        )
+    # Rules for the whole page come in one extra query
+    query = db.query(EligibilityCriteria).options(selectinload(EligibilityCriteria.rules))
+    
+    keys = [SortKey(EligibilityCriteria.name), SortKey(EligibilityCriteria.id)]
+    match = text_search(db, search, EligibilityCriteria.search_vector, [EligibilityCriteria.name])
+    if match:
+        query = query.filter(match.criterion)
+        keys.insert(0, SortKey(match.rank, descending=True))
     
-    criteria_list = query.all()
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, keys, limit, cursor)
+    set_page_headers(response, page, total)
     
     result = []
-    for c in criteria_list:
+    for c in page.items:
         rule_count = count_rules_recursive(c.rules)
         result.append(EligibilityCriteriaListItem(
             id=str(c.id),
@@ -165,12 +171,7 @@ def list_eligibility_criteria(
     
     return result
 
-@router.get("/{criteria_id}", response_model=EligibilityCriteriaDetail)
-def get_eligibility_criteria(criteria_id: str, db: Session = Depends(get_db)):
-    criteria = db.query(EligibilityCriteria).filter(EligibilityCriteria.id == criteria_id).first()
-    if not criteria:
-        raise HTTPException(status_code=404, detail="Eligibility criteria not found")
-    
+def criteria_detail(criteria: EligibilityCriteria) -> EligibilityCriteriaDetail:
     rule_tree = build_rule_tree(criteria.rules)
     root_group = {
         "id": "root",
@@ -189,6 +190,19 @@ def get_eligibility_criteria(criteria_id: str, db: Session = Depends(get_db)):
         updatedAt=criteria.updated_at
     )
 
+@router.get("/{criteria_id}", response_model=EligibilityCriteriaDetail, dependencies=[cache_policy(REVALIDATE)])
+def get_eligibility_criteria(criteria_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    criteria = db.query(EligibilityCriteria).filter(EligibilityCriteria.id == criteria_id).first()
+    if not criteria:
+        raise HTTPException(status_code=404, detail="Eligibility criteria not found")
+    
+    # Edits (rules included) bump updated_at; an unchanged criteria skips loading its rules
+    unchanged = not_modified(request, response, updated_at_etag("criteria", criteria.id, criteria.updated_at))
+    if unchanged:
+        return unchanged
+    
+    return criteria_detail(criteria)
+
 @router.post("/", response_model=EligibilityCriteriaDetail)
 def create_eligibility_criteria(data: CreateEligibilityCriteriaRequest, db: Session = Depends(get_db)):
     new_criteria = EligibilityCriteria(
@@ -210,7 +224,7 @@ def create_eligibility_criteria(data: CreateEligibilityCriteriaRequest, db: Sess
     db.commit()
     db.refresh(new_criteria)
     
-    return get_eligibility_criteria(str(new_criteria.id), db)
+    return criteria_detail(new_criteria)
 
 @router.put("/{criteria_id}", response_model=EligibilityCriteriaDetail)
 def update_eligibility_criteria(
@@ -239,7 +253,7 @@ def update_eligibility_criteria(
     db.commit()
     db.refresh(criteria)
     
-    return get_eligibility_criteria(criteria_id, db)
+    return criteria_detail(criteria)
 
 @router.delete("/{criteria_id}")
 def delete_eligibility_criteria(criteria_id: str, db: Session = Depends(get_db)):
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 import uuid as uuid_lib
+import asyncio
+import json
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
+from app.core.pagination import SortKey, estimate_count, paginate, set_page_headers
 from app.models.models import Notification, Task, TaskInstance
+from app.services.notification_stream import hub, publish_notification_event
+from app.services.unread_counter import unread_counts
 
 router = APIRouter()
 
@@ -35,44 +42,57 @@ class NotificationResponse(BaseModel):
 
 @router.get("/", response_model=List[NotificationResponse])
 def list_notifications(
+    response: Response,
     team_member_id: str,
     unread_only: bool = False,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
     db: Session = Depends(get_db)
 ):
-    """List notifications for a team member"""
-    query = db.query(Notification).filter(
-        Notification.team_member_id == team_member_id
-    )
+    """
+    List notifications for a team member, newest first.
+    Task names come from the same query; when more rows exist the cursor for
+    the next page is returned in the X-Next-Cursor header.
+    """
+    query = db.query(
+        Notification.id,
+        Notification.type,
+        Notification.title,
+        Notification.message,
+        Notification.task_instance_id,
+        Notification.is_read,
+        Notification.created_at,
+        Task.name.label("task_name")
+    ).outerjoin(TaskInstance, TaskInstance.id == Notification.task_instance_id)\
+     .outerjoin(Task, Task.id == TaskInstance.task_id)\
+     .filter(Notification.team_member_id == team_member_id)
     
     if unread_only:
         query = query.filter(Notification.is_read == False)
     
-    notifications = query.order_by(Notification.created_at.desc()).limit(limit).all()
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(
+        query,
+        [SortKey(Notification.created_at, descending=True), SortKey(Notification.id, descending=True)],
+        limit,
+        cursor
+    )
+    set_page_headers(response, page, total)
     
-    result = []
-    for n in notifications:
-        # Get task name if task_instance_id exists
-        task_name = None
-        if n.task_instance_id:
-            ti = db.query(TaskInstance).filter(TaskInstance.id == n.task_instance_id).first()
-            if ti and ti.task_id:
-                task = db.query(Task).filter(Task.id == ti.task_id).first()
-                if task:
-                    task_name = task.name
-        
-        result.append(NotificationResponse(
+    return [
+        NotificationResponse(
             id=str(n.id),
             type=n.type,
             title=n.title,
             message=n.message,
             taskInstanceId=str(n.task_instance_id) if n.task_instance_id else None,
-            taskName=task_name,
+            taskName=n.task_name,
             isRead=n.is_read or False,
             createdAt=n.created_at
-        ))
-    
-    return result
+        )
+        for n in page.items
+    ]
 
 
 @router.get("/count")
@@ -80,13 +100,65 @@ def get_unread_count(
     team_member_id: str,
     db: Session = Depends(get_db)
 ):
-    """Get count of unread notifications"""
-    count = db.query(Notification).filter(
-        Notification.team_member_id == team_member_id,
-        Notification.is_read == False
-    ).count()
+    """Get count of unread notifications (served from the in-memory counter)"""
+    return {"unreadCount": unread_counts.get(db, team_member_id)}
+
+
+# =============================================
+# LIVE STREAM (Server-Sent Events)
+# =============================================
+
+# Comment line sent when idle so proxies keep the connection open
+KEEPALIVE_SECONDS = 20
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def load_unread_count(team_member_id: str) -> int:
+    # Own session: a request-scoped one would stay checked out for the whole stream
+    db = SessionLocal()
+    try:
+        return unread_counts.get(db, team_member_id)
+    finally:
+        db.close()
+
+
+@router.get("/stream")
+async def stream_notifications(request: Request, team_member_id: str):
+    """
+    Server-Sent Events stream for a team member. Sends the unread count once
+    on connect, then `notification` events as they are created and `read`
+    events when notifications are marked as read - no polling needed.
+    """
+    try:
+        uuid_lib.UUID(team_member_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid team member ID")
+    
+    queue = hub.subscribe(team_member_id)
+    
+    async def events():
+        try:
+            unread = await run_in_threadpool(load_unread_count, team_member_id)
+            yield sse_event("unread", {"unreadCount": unread})
+            
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(message["event"], message["data"])
+        finally:
+            hub.unsubscribe(team_member_id, queue)
     
-    return {"unreadCount": count}
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # =============================================
@@ -106,9 +178,17 @@ def mark_as_read(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    notification.is_read = True
+    was_unread = not notification.is_read
+    if was_unread:
+        notification.is_read = True
+        publish_notification_event(
+            db, notification.team_member_id, "read", {"notificationId": str(notification.id)}
+        )
     db.commit()
     
+    if was_unread:
+        unread_counts.decrement(notification.team_member_id)
+    
     return {"success": True, "message": "Notification marked as read"}
 
 
@@ -118,11 +198,14 @@ def mark_all_as_read(
     db: Session = Depends(get_db)
 ):
     """Mark all notifications as read for a team member"""
-    db.query(Notification).filter(
+    updated = db.query(Notification).filter(
         Notification.team_member_id == team_member_id,
         Notification.is_read == False
     ).update({"is_read": True})
     
+    if updated:
+        publish_notification_event(db, team_member_id, "read", {"all": True})
     db.commit()
+    unread_counts.reset(team_member_id)
     
     return {"success": True, "message": "All notifications marked as read"}
@@ -1,37 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date, datetime
 import json
 import uuid as uuid_lib
 
 from app.core.database import get_db
-from app.models.models import Project, ProjectContact, ProjectAssignment, TeamMember, parse_json_field
+from app.core.pagination import MIN_TIMESTAMP, SortKey, estimate_count, paginate, set_page_headers
+from app.core.responses import FastJSONResponse
+from app.models.models import Project, ProjectContact, ProjectAssignment, TaskInstance, TeamMember, parse_json_field
 from app.schemas.dashboard import ProjectFlags
 from app.schemas.projects import (
     ProjectListResponse, ProjectListItem, ProjectStats, ContactInfo,
     CreateProjectRequest, ProjectDetail, ProjectTimeline, KeyMembers,
     ProjectTask, ProjectTaskGroup
 )
+from app.services.search import text_search
+from app.services.template_snapshots import get_compiled_template, resolve_tasks
 
 router = APIRouter()
 
-def get_contact(db, project_id, contact_type):
-    c = db.query(ProjectContact).filter(
-        ProjectContact.project_id == project_id,
-        ProjectContact.contact_type == contact_type
-    ).first()
-    if c:
-        return ContactInfo(name=c.name, email=c.email, phone=c.phone, role=c.contact_type)
-    return None
+# Contact type -> KeyMembers field
+KEY_CONTACT_TYPES = {'PM': 'projectManager', 'SITE_CONTACT': 'siteLead', 'SAFETY_LEAD': 'safetyLead'}
+
+def get_key_members(db, project_ids) -> Dict[str, KeyMembers]:
+    """Key contacts of several projects in one query; the earliest of each type wins"""
+    contacts = db.query(ProjectContact).filter(
+        ProjectContact.project_id.in_(project_ids),
+        ProjectContact.contact_type.in_(KEY_CONTACT_TYPES)
+    ).order_by(ProjectContact.created_at, ProjectContact.id).all()
+    key_members = {str(project_id): {} for project_id in project_ids}
+    for c in contacts:
+        key_members[str(c.project_id)].setdefault(
+            KEY_CONTACT_TYPES[c.contact_type],
+            ContactInfo(name=c.name, email=c.email, phone=c.phone, role=c.contact_type)
+        )
+    return {project_id: KeyMembers(**members) for project_id, members in key_members.items()}
+
+def get_assignment_stats(db, project_ids) -> Dict[str, ProjectStats]:
+    """Member counts by onboarding status per project, from one grouped aggregate"""
+    rows = db.query(
+        ProjectAssignment.project_id,
+        func.count(ProjectAssignment.id),
+        func.count(ProjectAssignment.id).filter(ProjectAssignment.status == 'COMPLETED'),
+        func.count(ProjectAssignment.id).filter(ProjectAssignment.status == 'IN_PROGRESS')
+    ).filter(
+        ProjectAssignment.project_id.in_(project_ids)
+    ).group_by(ProjectAssignment.project_id).all()
+    stats = {str(project_id): ProjectStats() for project_id in project_ids}
+    for project_id, total_members, completed, in_progress in rows:
+        stats[str(project_id)] = ProjectStats(
+            totalMembers=total_members,
+            completed=completed,
+            inProgress=in_progress,
+            pending=total_members - completed - in_progress
+        )
+    return stats
 
 @router.get("/", response_model=ProjectListResponse)
 def list_projects(
+    response: Response,
     status: Optional[str] = None,
     search: Optional[str] = None,
-    page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
+    exact_total: bool = Query(False, description="Return the exact number of matching projects in total (runs a COUNT)"),
     db: Session = Depends(get_db)
 ):
     query = db.query(Project)
@@ -40,35 +75,27 @@ def list_projects(
     if status and status != 'ALL':
         query = query.filter(Project.status == status)
         
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Project.name.ilike(search_term),
-                Project.client_name.ilike(search_term)
-            )
-        )
+    keys = [SortKey(Project.name), SortKey(Project.id)]
+    match = text_search(db, search, Project.search_vector, [Project.name])
+    if match:
+        query = query.filter(match.criterion)
+        keys.insert(0, SortKey(match.rank, descending=True))
         
-    # Pagination
-    total = query.count()
-    offset = (page - 1) * limit
-    projects = query.offset(offset).limit(limit).all()
+    # Keyset pagination; the total is a planner estimate, only when asked for
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, keys, limit, cursor)
+    set_page_headers(response, page, total)
+    # Counters (the sidebar badge) need the real number; estimates are off on small tables
+    if exact_total:
+        total = query.order_by(None).count()
+    
+    # Stats and project managers for the whole page in two queries
+    project_ids = [p.id for p in page.items]
+    stats = get_assignment_stats(db, project_ids)
+    key_members = get_key_members(db, project_ids)
     
     items = []
-    for p in projects:
-        # Get stats from assignments
-        total_members = db.query(ProjectAssignment).filter(ProjectAssignment.project_id == p.id).count()
-        completed = db.query(ProjectAssignment).filter(
-            ProjectAssignment.project_id == p.id,
-            ProjectAssignment.status == 'COMPLETED'
-        ).count()
-        in_progress = db.query(ProjectAssignment).filter(
-            ProjectAssignment.project_id == p.id,
-            ProjectAssignment.status == 'IN_PROGRESS'
-        ).count()
-        
-        pm = get_contact(db, p.id, 'PM')
-        
+    for p in page.items:
         items.append(ProjectListItem(
             id=str(p.id),
             name=p.name,
@@ -78,20 +105,15 @@ def list_projects(
             endDate=p.end_date,
             status=p.status,
             flags=ProjectFlags(isODRISA=bool(p.is_odrisa), isDOD=bool(p.is_dod)),
-            stats=ProjectStats(
-                totalMembers=total_members,
-                completed=completed,
-                inProgress=in_progress,
-                pending=total_members - completed - in_progress
-            ),
-            projectManager=pm
+            stats=stats[str(p.id)],
+            projectManager=key_members[str(p.id)].projectManager
         ))
         
     return ProjectListResponse(
         items=items,
         total=total,
-        page=page,
-        limit=limit
+        limit=limit,
+        nextCursor=page.next_cursor
     )
 
 @router.post("/", response_model=ProjectDetail)
@@ -146,52 +168,28 @@ def get_project_details(project_id: str, db: Session = Depends(get_db)):
         delta = p.end_date - date.today()
         days_remaining = max(0, delta.days)
     
-    # Get stats
-    total_members = db.query(ProjectAssignment).filter(ProjectAssignment.project_id == p.id).count()
-    completed = db.query(ProjectAssignment).filter(
-        ProjectAssignment.project_id == p.id,
-        ProjectAssignment.status == 'COMPLETED'
-    ).count()
-    in_progress = db.query(ProjectAssignment).filter(
-        ProjectAssignment.project_id == p.id,
-        ProjectAssignment.status == 'IN_PROGRESS'
-    ).count()
-        
-    # Get template name and task groups if template_id exists
+    # Template name and task groups come from the compiled template snapshot
     template_name = None
     template_id_str = None
     task_groups = []
-    if p.template_id:
-        from app.models.models import ChecklistTemplate, TaskGroup, Task
-        template = db.query(ChecklistTemplate).filter(ChecklistTemplate.id == p.template_id).first()
-        if template:
-            template_name = template.name
-            template_id_str = str(p.template_id)
-            
-            # Fetch task groups for this template
-            groups = db.query(TaskGroup).filter(
-                TaskGroup.template_id == p.template_id
-            ).order_by(TaskGroup.display_order).all()
-            
-            for g in groups:
-                # Fetch tasks for this group
-                tasks = db.query(Task).filter(
-                    Task.task_group_id == g.id
-                ).order_by(Task.display_order).all()
-                
-                group_tasks = [
+    compiled = get_compiled_template(db, p.template_id)
+    if compiled:
+        template_name = compiled.name
+        template_id_str = compiled.id
+        task_groups = [
+            ProjectTaskGroup(
+                id=str(g["id"]),
+                name=g["name"],
+                tasks=[
                     ProjectTask(
-                        id=str(t.id),
-                        name=t.name,
-                        isRequired=bool(t.is_required)
-                    ) for t in tasks
+                        id=str(t["id"]),
+                        name=t["name"],
+                        isRequired=bool(t["is_required"])
+                    ) for t in g["tasks"]
                 ]
-                
-                task_groups.append(ProjectTaskGroup(
-                    id=str(g.id),
-                    name=g.name,
-                    tasks=group_tasks
-                ))
+            )
+            for g in compiled.groups
+        ]
     
     return ProjectDetail(
         id=str(p.id),
@@ -209,58 +207,70 @@ def get_project_details(project_id: str, db: Session = Depends(get_db)):
             daysRemaining=days_remaining,
             targetEndDate=p.end_date
         ),
-        keyMembers=KeyMembers(
-            projectManager=get_contact(db, p.id, 'PM'),
-            siteLead=get_contact(db, p.id, 'SITE_CONTACT'),
-            safetyLead=get_contact(db, p.id, 'SAFETY_LEAD')
-        ),
-        stats=ProjectStats(
-            totalMembers=total_members,
-            completed=completed,
-            inProgress=in_progress,
-            pending=total_members - completed - in_progress
-        ),
+        keyMembers=get_key_members(db, [p.id])[str(p.id)],
+        stats=get_assignment_stats(db, [p.id])[str(p.id)],
         taskGroups=task_groups
     )
 
+def _instance_item(ti, task: Optional[dict]) -> dict:
+    return {
+        "taskId": str(ti.task_id),
+        "taskName": task["name"] if task else None,
+        "taskCategory": task["category"] if task else None,
+        "status": ti.status,
+        "startedAt": ti.started_at.isoformat() if ti.started_at else None,
+        "completedAt": ti.completed_at.isoformat() if ti.completed_at else None
+    }
+
+def _category_summary(instances, tasks: dict) -> List[dict]:
+    """Total and completed instances per task category"""
+    summary = {}
+    for ti in instances:
+        task = tasks.get(str(ti.task_id))
+        category = task["category"] if task else None
+        counts = summary.setdefault(category, {"category": category, "total": 0, "completed": 0})
+        counts["total"] += 1
+        if ti.status == 'COMPLETED':
+            counts["completed"] += 1
+    return sorted(summary.values(), key=lambda c: c["category"] or "")
+
 @router.get("/{project_id}/members")
-def get_project_members(project_id: str, db: Session = Depends(get_db)):
+def get_project_members(
+    project_id: str,
+    view: str = Query("full", pattern="^(full|summary)$",
+                      description="full: every task instance per member; summary: counts per task category"),
+    db: Session = Depends(get_db)
+):
     """Get all team members assigned to a project with their progress"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project.id, Project.template_id).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get assignments with team member info
-    assignments = db.query(ProjectAssignment).filter(
-        ProjectAssignment.project_id == project_id
-    ).all()
+    # Three queries whatever the project size: members, their task instances,
+    # and tasks that are no longer on the template (the rest come from the
+    # compiled snapshot)
+    rows = db.query(ProjectAssignment, TeamMember)\
+        .join(TeamMember, TeamMember.id == ProjectAssignment.team_member_id)\
+        .filter(ProjectAssignment.project_id == project_id)\
+        .order_by(ProjectAssignment.assigned_at, ProjectAssignment.id)\
+        .all()
+    
+    instances = db.query(
+        TaskInstance.assignment_id, TaskInstance.task_id, TaskInstance.status,
+        TaskInstance.started_at, TaskInstance.completed_at
+    ).join(ProjectAssignment, ProjectAssignment.id == TaskInstance.assignment_id)\
+        .filter(ProjectAssignment.project_id == project_id)\
+        .order_by(TaskInstance.created_at, TaskInstance.id)\
+        .all()
+    
+    instances_by_assignment = {}
+    for ti in instances:
+        instances_by_assignment.setdefault(ti.assignment_id, []).append(ti)
+    tasks = resolve_tasks(db, get_compiled_template(db, project.template_id), {ti.task_id for ti in instances})
     
     members = []
-    for assignment in assignments:
-        tm = assignment.team_member
-        if not tm:
-            continue
-            
-        # Get task instances for this assignment
-        task_instances = []
-        for ti in assignment.task_instances:
-            # Get task category from the task table
-            task_category = None
-            task_name = None
-            if ti.task:
-                task_category = ti.task.category
-                task_name = ti.task.name
-            
-            task_instances.append({
-                "taskId": str(ti.task_id),
-                "taskName": task_name,
-                "taskCategory": task_category,
-                "status": ti.status,
-                "startedAt": ti.started_at.isoformat() if ti.started_at else None,
-                "completedAt": ti.completed_at.isoformat() if ti.completed_at else None
-            })
-        
-        members.append({
+    for assignment, tm in rows:
+        member = {
             "id": str(tm.id),
             "firstName": tm.first_name,
             "lastName": tm.last_name,
@@ -272,11 +282,59 @@ def get_project_members(project_id: str, db: Session = Depends(get_db)):
             "progressPercentage": float(assignment.progress_percentage or 0),
             "totalTasks": assignment.total_tasks or 0,
             "completedTasks": assignment.completed_tasks or 0,
-            "assignedAt": assignment.assigned_at.isoformat() if assignment.assigned_at else None,
-            "taskInstances": task_instances
-        })
+            "assignedAt": assignment.assigned_at.isoformat() if assignment.assigned_at else None
+        }
+        member_instances = instances_by_assignment.get(assignment.id, [])
+        if view == "summary":
+            member["categorySummary"] = _category_summary(member_instances, tasks)
+        else:
+            member["taskInstances"] = [
+                _instance_item(ti, tasks.get(str(ti.task_id))) for ti in member_instances
+            ]
+        members.append(member)
+    
+    # Can embed every task instance of every member; skip jsonable_encoder
+    return FastJSONResponse(members)
+
+@router.get("/{project_id}/members/{member_id}/task-instances")
+def get_member_task_instances(
+    project_id: str,
+    member_id: str,
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: Session = Depends(get_db)
+):
+    """One member's task instances on a project, a page at a time"""
+    assignment = db.query(ProjectAssignment.id, Project.template_id)\
+        .join(Project, Project.id == ProjectAssignment.project_id)\
+        .filter(ProjectAssignment.project_id == project_id, ProjectAssignment.team_member_id == member_id)\
+        .first()
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    
+    query = db.query(TaskInstance).filter(TaskInstance.assignment_id == assignment.id)
+    if status:
+        query = query.filter(TaskInstance.status == status)
+    
+    keys = [
+        SortKey(func.coalesce(TaskInstance.created_at, MIN_TIMESTAMP)),
+        SortKey(TaskInstance.id)
+    ]
+    page = paginate(query, keys, limit, cursor)
+    tasks = resolve_tasks(db, get_compiled_template(db, assignment.template_id), {ti.task_id for ti in page.items})
     
-    return members
+    response = FastJSONResponse([
+        {
+            "id": str(ti.id),
+            **_instance_item(ti, tasks.get(str(ti.task_id))),
+            "dueDate": ti.due_date.isoformat() if ti.due_date else None,
+            "reviewStatus": ti.review_status
+        }
+        for ti in page.items
+    ])
+    set_page_headers(response, page)
+    return response
 
 from pydantic import BaseModel
 
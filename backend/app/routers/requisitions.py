@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 from datetime import datetime
 import uuid as uuid_lib
 
 from app.core.database import get_db
+from app.core.pagination import SortKey, estimate_count, paginate, set_page_headers
 from app.models.models import Project, Requisition, RequisitionLineItem, ProjectAssignment, TeamMember, Communication
 from app.schemas.requisitions import (
     RequisitionResponse, RequisitionLineItemResponse,
@@ -15,7 +16,14 @@ from app.schemas.requisitions import (
 router = APIRouter()
 
 @router.get("/{project_id}/requisitions", response_model=List[RequisitionResponse])
-def get_project_requisitions(project_id: str, db: Session = Depends(get_db)):
+def get_project_requisitions(
+    project_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; without it every match is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
+    db: Session = Depends(get_db)
+):
     # Verify project exists
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
@@ -25,16 +33,21 @@ def get_project_requisitions(project_id: str, db: Session = Depends(get_db)):
     if not project.ppm_project_id:
         return []
     
-    reqs = db.query(Requisition).filter(
-        Requisition.ppm_project_id == project.ppm_project_id
-    ).all()
+    # Line items for the whole page come in one extra query
+    query = db.query(Requisition)\
+        .options(selectinload(Requisition.line_items))\
+        .filter(Requisition.ppm_project_id == project.ppm_project_id)
     
-    response = []
-    for r in reqs:
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, [SortKey(Requisition.id)], limit, cursor)
+    set_page_headers(response, page, total)
+    
+    result = []
+    for r in page.items:
         # Count candidates (we'd need a candidates table, using line items for now)
         candidates = sum(li.filled_quantity or 0 for li in r.line_items)
         
-        response.append(RequisitionResponse(
+        result.append(RequisitionResponse(
             id=str(r.id),
             externalId=r.external_id,
             title=r.title,
@@ -51,7 +64,7 @@ def get_project_requisitions(project_id: str, db: Session = Depends(get_db)):
             ]
         ))
     
-    return response
+    return result
 
 @router.post("/{project_id}/requisitions", response_model=RequisitionResponse)
 def create_requisition(project_id: str, data: CreateRequisitionRequest, db: Session = Depends(get_db)):
@@ -154,13 +167,16 @@ def assign_member_to_project(project_id: str, data: AssignMemberRequest, db: Ses
         ).all()
         
         for task in tasks:
-            # Create a task instance for each task
+            # Create a task instance for each task; updated_at == created_at
+            # until something happens to it
+            now = datetime.utcnow()
             task_instance = TaskInstance(
                 id=uuid_lib.uuid4(),
                 task_id=task.id,
                 assignment_id=assignment.id,
                 status="PENDING",
-                created_at=datetime.utcnow()
+                created_at=now,
+                updated_at=now
             )
             db.add(task_instance)
             task_instances_created += 1
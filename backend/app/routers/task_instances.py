@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -8,7 +8,11 @@ import httpx
 import json
 
 from app.core.database import get_db
+from app.core.metrics import InstrumentedAsyncClient
+from app.core.pagination import SortKey, estimate_count, paginate, set_page_headers
 from app.models.models import TaskInstance, Task, ProjectAssignment, Document, Notification
+from app.services.notification_stream import publish_notification_event, notification_payload
+from app.services.unread_counter import unread_counts
 
 router = APIRouter()
 
@@ -76,8 +80,12 @@ class RejectTaskRequest(BaseModel):
 
 @router.get("/", response_model=List[TaskInstanceResponse])
 def list_task_instances(
+    response: Response,
     assignment_id: Optional[str] = None,
     status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; without it every match is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
     db: Session = Depends(get_db)
 ):
     """List task instances with optional filters"""
@@ -89,7 +97,9 @@ def list_task_instances(
     if status:
         query = query.filter(TaskInstance.status == status)
     
-    instances = query.all()
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, [SortKey(TaskInstance.id)], limit, cursor)
+    set_page_headers(response, page, total)
     
     return [
         TaskInstanceResponse(
@@ -104,7 +114,7 @@ def list_task_instances(
             isWaived=ti.is_waived or False,
             waivedReason=ti.waived_reason
         )
-        for ti in instances
+        for ti in page.items
     ]
 
 
@@ -178,7 +188,7 @@ def submit_form(
     }
     ti.status = 'COMPLETED'
     ti.completed_at = datetime.utcnow()
-    
+    ti.updated_at = datetime.utcnow()
     
     if not ti.started_at:
         ti.started_at = datetime.utcnow()
@@ -236,7 +246,7 @@ def complete_document_upload(
     }
     ti.status = 'COMPLETED'
     ti.completed_at = datetime.utcnow()
-    
+    ti.updated_at = datetime.utcnow()
     
     if not ti.started_at:
         ti.started_at = datetime.utcnow()
@@ -325,11 +335,12 @@ async def execute_rest_api(
     if not ti.started_at:
         ti.started_at = datetime.utcnow()
         ti.status = 'IN_PROGRESS'
+        ti.updated_at = datetime.utcnow()
         db.commit()
     
     # Execute the API call
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with InstrumentedAsyncClient("rest_api", timeout=30.0) as client:
             if method == 'GET':
                 response = await client.get(url, headers=headers)
             elif method == 'POST':
@@ -366,6 +377,7 @@ async def execute_rest_api(
             ti.completed_at = datetime.utcnow()
         else:
             ti.status = 'BLOCKED'
+        ti.updated_at = datetime.utcnow()
         
         db.commit()
         
@@ -379,6 +391,7 @@ async def execute_rest_api(
     except httpx.TimeoutException:
         ti.result = {"error": "Request timed out"}
         ti.status = 'BLOCKED'
+        ti.updated_at = datetime.utcnow()
         db.commit()
         
         return RestApiExecutionResult(
@@ -390,6 +403,7 @@ async def execute_rest_api(
     except Exception as e:
         ti.result = {"error": str(e)}
         ti.status = 'BLOCKED'
+        ti.updated_at = datetime.utcnow()
         db.commit()
         
         return RestApiExecutionResult(
@@ -458,6 +472,7 @@ def start_redirect(
         "redirectUrl": full_url,
         "startedAt": datetime.utcnow().isoformat()
     }
+    ti.updated_at = datetime.utcnow()
     db.commit()
     
     return {
@@ -516,7 +531,7 @@ async def poll_redirect_status(
         polling_headers[header_name] = polling_auth.get('apiKey', '')
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with InstrumentedAsyncClient("redirect_status", timeout=10.0) as client:
             if polling_method == 'GET':
                 response = await client.get(polling_url, headers=polling_headers)
             else:
@@ -552,6 +567,7 @@ async def poll_redirect_status(
             existing_result['polledStatus'] = external_status
             existing_result['lastPolledAt'] = datetime.utcnow().isoformat()
             ti.result = existing_result
+            ti.updated_at = datetime.utcnow()
             db.commit()
         
         return {
@@ -680,10 +696,12 @@ def approve_task_instance(
         ProjectAssignment.id == ti.assignment_id
     ).first()
     
+    notified_member_id = assignment.team_member_id if assignment else None
     if assignment:
         # Create approval notification
         task = db.query(Task).filter(Task.id == ti.task_id).first()
         notification = Notification(
+            id=uuid_lib.uuid4(),
             team_member_id=assignment.team_member_id,
             type='TASK_APPROVED',
             title='Task Approved',
@@ -693,9 +711,18 @@ def approve_task_instance(
             created_at=datetime.utcnow()
         )
         db.add(notification)
+        
+        # Pushed to the candidate's open streams once this transaction commits
+        publish_notification_event(
+            db, assignment.team_member_id, "notification",
+            notification_payload(notification, task.name if task else None)
+        )
     
     db.commit()
     
+    if notified_member_id:
+        unread_counts.increment(notified_member_id)
+    
     return {
         "success": True,
         "message": "Task approved successfully",
@@ -743,10 +770,12 @@ def reject_task_instance(
         ProjectAssignment.id == ti.assignment_id
     ).first()
     
+    notified_member_id = assignment.team_member_id if assignment else None
     if assignment:
         # Create rejection notification with remarks
         task = db.query(Task).filter(Task.id == ti.task_id).first()
         notification = Notification(
+            id=uuid_lib.uuid4(),
             team_member_id=assignment.team_member_id,
             type='TASK_REJECTED',
             title='Task Needs Revision',
@@ -757,6 +786,12 @@ def reject_task_instance(
         )
         db.add(notification)
         
+        # Pushed to the candidate's open streams once this transaction commits
+        publish_notification_event(
+            db, assignment.team_member_id, "notification",
+            notification_payload(notification, task.name if task else None)
+        )
+        
         # Update assignment progress (decrement completed tasks)
         if assignment.completed_tasks and assignment.completed_tasks > 0:
             assignment.completed_tasks -= 1
@@ -768,6 +803,9 @@ def reject_task_instance(
     
     db.commit()
     
+    if notified_member_id:
+        unread_counts.increment(notified_member_id)
+    
     return {
         "success": True,
         "message": "Task rejected and candidate notified",
@@ -1,24 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import Optional, List
 from datetime import datetime
 import uuid as uuid_lib
 
 from app.core.database import get_db
-from app.models.models import Task
+from app.core.http_cache import REVALIDATE, cache_policy, not_modified, updated_at_etag
+from app.core.pagination import MIN_TIMESTAMP, SortKey, estimate_count, paginate, set_page_headers
+from app.models.models import Task, TaskGroup
 from app.schemas.tasks import TaskLibraryItem, CreateTaskRequest, UpdateTaskRequest
+from app.services.search import text_search
+from app.services.task_propagation import run_template_propagation
+from app.services.template_snapshots import bump_templates_using_task
 
 router = APIRouter()
 
-@router.get("/", response_model=List[TaskLibraryItem])
+def task_item(task: Task) -> TaskLibraryItem:
+    return TaskLibraryItem(
+        id=str(task.id),
+        name=task.name,
+        description=task.description,
+        type=task.type,
+        category=task.category,
+        isRequired=task.is_required if task.is_required is not None else True,
+        configuration=task.configuration,
+        createdAt=task.created_at,
+        updatedAt=task.updated_at
+    )
+
+@router.get("/", response_model=List[TaskLibraryItem], dependencies=[cache_policy(REVALIDATE)])
 def list_tasks(
+    response: Response,
     search: Optional[str] = None,
     type: Optional[str] = None,
     category: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; without it every match is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
     db: Session = Depends(get_db)
 ):
-    """List all tasks in the library (original library tasks only)"""
+    """List tasks in the library (original library tasks only), newest first"""
     query = db.query(Task)
     
     # Filter to only library tasks:
@@ -27,14 +49,9 @@ def list_tasks(
     query = query.filter(Task.task_group_id == None)
     query = query.filter(Task.source_task_id == None)
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Task.name.ilike(search_term),
-                Task.description.ilike(search_term)
-            )
-        )
+    match = text_search(db, search, Task.search_vector, [Task.name])
+    if match:
+        query = query.filter(match.criterion)
     
     if type and type != 'ALL':
         query = query.filter(Task.type == type)
@@ -42,41 +59,33 @@ def list_tasks(
     if category and category != 'ALL':
         query = query.filter(Task.category == category)
     
-    tasks = query.order_by(Task.created_at.desc()).all()
-    
-    return [
-        TaskLibraryItem(
-            id=str(t.id),
-            name=t.name,
-            description=t.description,
-            type=t.type,
-            category=t.category,
-            isRequired=t.is_required if t.is_required is not None else True,
-            configuration=t.configuration,
-            createdAt=t.created_at,
-            updatedAt=t.updated_at
-        )
-        for t in tasks
+    keys = [
+        SortKey(func.coalesce(Task.created_at, MIN_TIMESTAMP), descending=True),
+        SortKey(Task.id, descending=True)
     ]
+    if match:
+        # Best matches first when searching
+        keys.insert(0, SortKey(match.rank, descending=True))
+    
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, keys, limit, cursor)
+    set_page_headers(response, page, total)
+    
+    return [task_item(t) for t in page.items]
 
-@router.get("/{task_id}", response_model=TaskLibraryItem)
-def get_task(task_id: str, db: Session = Depends(get_db)):
+@router.get("/{task_id}", response_model=TaskLibraryItem, dependencies=[cache_policy(REVALIDATE)])
+def get_task(task_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a specific task by ID"""
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskLibraryItem(
-        id=str(task.id),
-        name=task.name,
-        description=task.description,
-        type=task.type,
-        category=task.category,
-        isRequired=task.is_required if task.is_required is not None else True,
-        configuration=task.configuration,
-        createdAt=task.created_at,
-        updatedAt=task.updated_at
-    )
+    # Every edit bumps updated_at, so it identifies the version the client has
+    unchanged = not_modified(request, response, updated_at_etag("task", task.id, task.updated_at))
+    if unchanged:
+        return unchanged
+    
+    return task_item(task)
 
 @router.post("/", response_model=TaskLibraryItem)
 def create_task(data: CreateTaskRequest, db: Session = Depends(get_db)):
@@ -107,17 +116,7 @@ def create_task(data: CreateTaskRequest, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(new_task)
     
-    return TaskLibraryItem(
-        id=str(new_task.id),
-        name=new_task.name,
-        description=new_task.description,
-        type=new_task.type,
-        category=new_task.category,
-        isRequired=new_task.is_required if new_task.is_required is not None else True,
-        configuration=new_task.configuration,
-        createdAt=new_task.created_at,
-        updatedAt=new_task.updated_at
-    )
+    return task_item(new_task)
 
 @router.put("/{task_id}", response_model=TaskLibraryItem)
 def update_task(task_id: str, data: UpdateTaskRequest, db: Session = Depends(get_db)):
@@ -141,13 +140,15 @@ def update_task(task_id: str, data: UpdateTaskRequest, db: Session = Depends(get
         task.configuration = data.configuration
     
     task.updated_at = datetime.utcnow()
+    # Templates using this task (directly or via a linked copy) recompile
+    bump_templates_using_task(db, task.id)
     db.commit()
     db.refresh(task)
     
-    return get_task(task_id, db)
+    return task_item(task)
 
 @router.delete("/{task_id}")
-def delete_task(task_id: str, db: Session = Depends(get_db)):
+def delete_task(task_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Delete a task from the library"""
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
@@ -156,6 +157,16 @@ def delete_task(task_id: str, db: Session = Depends(get_db)):
     # Check for dependent tasks (tasks in templates that reference this library task)
     dependent_tasks = db.query(Task).filter(Task.source_task_id == task_id).all()
     
+    # Templates that lose a task and need their assignments re-synced
+    affected_template_ids = [
+        row.template_id for row in db.query(TaskGroup.template_id)
+        .join(Task, Task.task_group_id == TaskGroup.id)
+        .filter(Task.source_task_id == task_id)
+        .distinct()
+    ]
+    
+    bump_templates_using_task(db, task.id)
+    
     # Cascade delete dependent tasks
     # Note: This assumes dependent tasks don't have further blockers (like TaskInstances)
     # If they do, we'd need to cascade further or block. For now, we assume deleting from library
@@ -166,4 +177,7 @@ def delete_task(task_id: str, db: Session = Depends(get_db)):
     db.delete(task)
     db.commit()
     
+    if affected_template_ids:
+        background_tasks.add_task(run_template_propagation, *affected_template_ids)
+    
     return {"success": True, "message": "Task and its usages deleted"}
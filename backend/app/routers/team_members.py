@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import List, Optional
@@ -7,7 +7,10 @@ from pydantic import BaseModel
 import uuid as uuid_lib
 
 from app.core.database import get_db
+from app.core.pagination import SortKey, estimate_count, paginate, set_page_headers
+from app.core.security import invalidate_principal
 from app.models.models import TeamMember
+from app.services.search import text_search
 from app.schemas.team_members import (
     TeamMemberCreate, TeamMemberUpdate, TeamMember as TeamMemberSchema, TeamMemberList
 )
@@ -16,10 +19,12 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TeamMemberSchema])
 def list_team_members(
+    response: Response,
     search: Optional[str] = None,
     status: Optional[str] = Query(None, description="Filter by status: active, inactive, or all"),
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
     db: Session = Depends(get_db)
 ):
     query = db.query(TeamMember)
@@ -31,18 +36,19 @@ def list_team_members(
         query = query.filter(TeamMember.is_active == False)
     # "all" or None returns all members
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                TeamMember.first_name.ilike(search_term),
-                TeamMember.last_name.ilike(search_term),
-                TeamMember.email.ilike(search_term),
-                TeamMember.employee_id.ilike(search_term)
-            )
-        )
-        
-    return query.offset(skip).limit(limit).all()
+    # Full name as indexed by idx_team_members_full_name_trgm
+    full_name = TeamMember.first_name + " " + TeamMember.last_name
+    # Same order as idx_team_members_name
+    keys = [SortKey(TeamMember.last_name), SortKey(TeamMember.first_name), SortKey(TeamMember.id)]
+    match = text_search(db, search, TeamMember.search_vector, [full_name, TeamMember.email])
+    if match:
+        query = query.filter(match.criterion)
+        keys.insert(0, SortKey(match.rank, descending=True))
+    
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, keys, limit, cursor)
+    set_page_headers(response, page, total)
+    return page.items
 
 @router.get("/{member_id}", response_model=TeamMemberSchema)
 def get_team_member(member_id: str, db: Session = Depends(get_db)):
@@ -173,6 +179,7 @@ def update_member_status(
     member.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(member)
+    invalidate_principal(member.id)
     
     status_text = "active" if data.isActive else "inactive"
     result = {
@@ -218,6 +225,7 @@ def delete_team_member(member_id: str, db: Session = Depends(get_db)):
         # 3. Delete the team member
         db.delete(member)
         db.commit()
+        invalidate_principal(member_uuid)
         
         return {
             "message": "Team member deleted",
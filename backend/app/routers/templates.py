@@ -1,88 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, BackgroundTasks, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from typing import List, Optional
 from datetime import datetime
 import uuid as uuid_lib
 
 from app.core.database import get_db
+from app.core.http_cache import REVALIDATE, cache_policy, not_modified
+from app.core.pagination import SortKey, estimate_count, paginate, set_page_headers
 from app.models.models import ChecklistTemplate, TaskGroup, Task, User
 from app.schemas.templates import (
     ChecklistTemplateCreate, ChecklistTemplateUpdate, ChecklistTemplate as ChecklistTemplateSchema,
-    CloneTemplateRequest, AddGroupRequest, ReorderGroupsRequest,
+    ChecklistTemplateSummary, CloneTemplateRequest, AddGroupRequest, ReorderGroupsRequest,
     AddTaskToGroupRequest, ReorderTasksRequest
 )
+from app.services.search import text_search
+from app.services.task_propagation import run_template_propagation
+from app.services.template_snapshots import (
+    get_compiled_template, bump_template_version, bump_template_version_if_current
+)
 
 
 router = APIRouter()
 
-def get_user_name(db: Session, user_id) -> Optional[str]:
-    """Helper to get user's full name from ID"""
-    if not user_id:
-        return None
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        return f"{user.first_name} {user.last_name}".strip()
-    return None
-
-@router.get("/", response_model=List[ChecklistTemplateSchema])
+@router.get("/", response_model=List[ChecklistTemplateSummary], dependencies=[cache_policy(REVALIDATE)])
 def list_templates(
+    response: Response,
     status: Optional[str] = None,
     client_name: Optional[str] = None,
     search: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_total: bool = Query(False, description="Send an estimated total in X-Total-Estimate"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(ChecklistTemplate)
+    """
+    Template picker list, ordered by name (by relevance when searching). One query: creator names come from a
+    join and group/task counts from a grouped subquery; groups themselves are
+    not loaded (GET /templates/{id} has them). When more templates exist the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    task_counts = db.query(
+        Task.task_group_id,
+        func.count(Task.id).label("task_count")
+    ).filter(Task.task_group_id.isnot(None))\
+     .group_by(Task.task_group_id)\
+     .subquery()
+
+    group_stats = db.query(
+        TaskGroup.template_id,
+        func.count(TaskGroup.id).label("group_count"),
+        func.sum(task_counts.c.task_count).label("task_count"),
+        func.array_agg(aggregate_order_by(TaskGroup.category, TaskGroup.display_order)).label("group_categories")
+    ).outerjoin(task_counts, task_counts.c.task_group_id == TaskGroup.id)\
+     .group_by(TaskGroup.template_id)\
+     .subquery()
+
+    query = db.query(
+        ChecklistTemplate.id,
+        ChecklistTemplate.name,
+        ChecklistTemplate.description,
+        ChecklistTemplate.client_id,
+        ChecklistTemplate.version,
+        ChecklistTemplate.is_active,
+        ChecklistTemplate.eligibility_criteria_id,
+        ChecklistTemplate.created_at,
+        ChecklistTemplate.updated_at,
+        ChecklistTemplate.created_by,
+        func.trim(func.concat(User.first_name, " ", User.last_name)).label("created_by_name"),
+        func.coalesce(group_stats.c.group_count, 0).label("group_count"),
+        func.coalesce(group_stats.c.task_count, 0).label("task_count"),
+        group_stats.c.group_categories
+    ).outerjoin(User, User.id == ChecklistTemplate.created_by)\
+     .outerjoin(group_stats, group_stats.c.template_id == ChecklistTemplate.id)
     
     if status == 'active':
         query = query.filter(ChecklistTemplate.is_active == True)
     elif status == 'inactive':
         query = query.filter(ChecklistTemplate.is_active == False)
         
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                ChecklistTemplate.name.ilike(search_term),
-                ChecklistTemplate.description.ilike(search_term)
-            )
-        )
+    keys = [SortKey(ChecklistTemplate.name), SortKey(ChecklistTemplate.id)]
+    match = text_search(db, search, ChecklistTemplate.search_vector, [ChecklistTemplate.name])
+    if match:
+        query = query.filter(match.criterion)
+        keys.insert(0, SortKey(match.rank, descending=True))
     
-    templates = query.all()
+    total = estimate_count(db, query) if include_total else None
+    page = paginate(query, keys, limit, cursor)
+    set_page_headers(response, page, total)
     
-    # Build response with createdByName
     result = []
-    for t in templates:
-        schema = ChecklistTemplateSchema.model_validate(t)
-        schema.createdByName = get_user_name(db, t.created_by)
-        result.append(schema)
-    
+    for row in page.items:
+        data = dict(row._mapping)
+        if not row.created_by:
+            data["created_by_name"] = None
+        data["group_categories"] = data["group_categories"] or []
+        result.append(ChecklistTemplateSummary.model_validate(data))
     return result
 
-@router.get("/{template_id}", response_model=ChecklistTemplateSchema)
-def get_template(template_id: str, db: Session = Depends(get_db)):
-    t = db.query(ChecklistTemplate).filter(ChecklistTemplate.id == template_id).first()
-    if not t:
+@router.get("/{template_id}", response_model=ChecklistTemplateSchema, dependencies=[cache_policy(REVALIDATE)])
+def get_template(template_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    # Served from the compiled snapshot (groups and tasks with library source
+    # fields merged in); unchanged templates answer If-None-Match with 304
+    compiled = get_compiled_template(db, template_id)
+    if not compiled:
         raise HTTPException(status_code=404, detail="Template not found")
-        
-    # Sort groups
-    t.task_groups.sort(key=lambda x: x.display_order)
     
-    # For tasks with source_task_id, merge in the source task's configuration
-    # This allows form fields to be displayed correctly
-    for group in t.task_groups:
-        for task in group.tasks:
-            if task.source_task_id:
-                source_task = db.query(Task).filter(Task.id == task.source_task_id).first()
-                if source_task:
-                    # Merge source task's editable fields
-                    task.name = source_task.name
-                    task.description = source_task.description
-                    task.configuration = source_task.configuration
+    unchanged = not_modified(request, response, compiled.etag)
+    if unchanged:
+        return unchanged
     
-    # Build response with createdByName
-    schema = ChecklistTemplateSchema.model_validate(t)
-    schema.createdByName = get_user_name(db, t.created_by)
+    schema = ChecklistTemplateSchema.model_validate(compiled.tree)
+    schema.createdByName = compiled.tree["created_by_name"]
     
     return schema
 
@@ -123,6 +153,7 @@ def update_template(template_id: str, data: ChecklistTemplateUpdate, db: Session
     if data.clientId is not None: t.client_id = data.clientId
     
     t.updated_at = datetime.utcnow()
+    bump_template_version(db, t.id)
     db.commit()
     db.refresh(t)
     return t
@@ -143,12 +174,35 @@ def delete_template(template_id: str, db: Session = Depends(get_db)):
     db.commit()
     return {"message": "Template deleted"}
 
+# Copies groups onto freshly assigned ids given as parallel old/new arrays
+CLONE_GROUPS_SQL = text("""
+    INSERT INTO or_task_groups (id, template_id, name, description, category, display_order,
+                                eligibility_criteria_id, created_at)
+    SELECT m.new_id, CAST(:template_id AS uuid), g.name, g.description, g.category, g.display_order,
+           g.eligibility_criteria_id, :now
+    FROM or_task_groups g
+    JOIN unnest(CAST(:old_ids AS uuid[]), CAST(:new_ids AS uuid[])) AS m(old_id, new_id)
+      ON m.old_id = g.id
+""")
+
+# Copies every task of the mapped groups, keeping library references
+CLONE_TASKS_SQL = text("""
+    INSERT INTO or_tasks (id, task_group_id, source_task_id, name, description, type, category,
+                          is_required, display_order, configuration, created_at, updated_at)
+    SELECT gen_random_uuid(), m.new_id, t.source_task_id, t.name, t.description, t.type, t.category,
+           t.is_required, t.display_order, t.configuration, :now, :now
+    FROM or_tasks t
+    JOIN unnest(CAST(:old_ids AS uuid[]), CAST(:new_ids AS uuid[])) AS m(old_id, new_id)
+      ON m.old_id = t.task_group_id
+""")
+
 @router.post("/{template_id}/clone", response_model=ChecklistTemplateSchema)
 def clone_template(template_id: str, data: CloneTemplateRequest, db: Session = Depends(get_db)):
     original = db.query(ChecklistTemplate).filter(ChecklistTemplate.id == template_id).first()
     if not original:
         raise HTTPException(status_code=404, detail="Template not found")
         
+    now = datetime.utcnow()
     new_template = ChecklistTemplate(
         id=uuid_lib.uuid4(),
         name=data.name,
@@ -156,45 +210,31 @@ def clone_template(template_id: str, data: CloneTemplateRequest, db: Session = D
         client_id=original.client_id,
         is_active=True,
         version=1,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now
     )
     db.add(new_template)
-    db.flush() # Get ID
+    db.flush()
+    
+    # Same number of round trips whatever the template size: group ids are
+    # assigned here, then groups and tasks are each copied in one statement
+    old_group_ids = [
+        str(row.id) for row in db.query(TaskGroup.id).filter(TaskGroup.template_id == original.id)
+    ]
+    if old_group_ids:
+        mapping = {
+            "old_ids": old_group_ids,
+            "new_ids": [str(uuid_lib.uuid4()) for _ in old_group_ids],
+            "template_id": str(new_template.id),
+            "now": now
+        }
+        db.execute(CLONE_GROUPS_SQL, mapping)
+        db.execute(CLONE_TASKS_SQL, mapping)
     
-    # Clone groups and tasks
-    for group in original.task_groups:
-        new_group = TaskGroup(
-            id=uuid_lib.uuid4(),
-            template_id=new_template.id,
-            name=group.name,
-            description=group.description,
-            category=group.category,
-            display_order=group.display_order,
-            eligibility_criteria_id=group.eligibility_criteria_id,
-            created_at=datetime.utcnow()
-        )
-        db.add(new_group)
-        db.flush()
-        
-        for task in group.tasks:
-            new_task = Task(
-                id=uuid_lib.uuid4(),
-                task_group_id=new_group.id,
-                name=task.name,
-                description=task.description,
-                type=task.type,
-                category=task.category,
-                is_required=task.is_required,
-                display_order=task.display_order,
-                configuration=task.configuration,
-                created_at=datetime.utcnow()
-            )
-            db.add(new_task)
-            
     db.commit()
-    db.refresh(new_template)
-    return new_template
+    
+    compiled = get_compiled_template(db, new_template.id)
+    return ChecklistTemplateSchema.model_validate(compiled.tree)
 
 @router.post("/{template_id}/groups")
 def add_task_group(template_id: str, data: AddGroupRequest, db: Session = Depends(get_db)):
@@ -218,18 +258,67 @@ def add_task_group(template_id: str, data: AddGroupRequest, db: Session = Depend
         created_at=datetime.utcnow()
     )
     db.add(new_group)
+    bump_template_version(db, template_id)
     db.commit()
     return new_group
 
 
+# Positions come from each id's place in the array; ids outside the scope are ignored
+REORDER_GROUPS_SQL = text("""
+    UPDATE or_task_groups g
+    SET display_order = v.position
+    FROM unnest(CAST(:ids AS uuid[])) WITH ORDINALITY AS v(id, position)
+    WHERE g.id = v.id AND g.template_id = CAST(:template_id AS uuid)
+""")
+
+REORDER_TASKS_SQL = text("""
+    UPDATE or_tasks t
+    SET display_order = v.position, updated_at = now()
+    FROM unnest(CAST(:ids AS uuid[])) WITH ORDINALITY AS v(id, position)
+    WHERE t.id = v.id AND t.task_group_id = CAST(:group_id AS uuid)
+""")
+
+def claim_template_version(db: Session, template_id: str, expected_version: Optional[int]) -> int:
+    """Bump the template version for an edit, or fail if it was edited concurrently"""
+    version = bump_template_version_if_current(db, template_id, expected_version)
+    if version is None:
+        current = db.query(ChecklistTemplate.version).filter(ChecklistTemplate.id == template_id).first()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Template not found")
+        raise HTTPException(
+            status_code=409,
+            detail=f"Template was modified (now version {current.version}); reload and try again"
+        )
+    return version
+
 @router.post("/{template_id}/groups/reorder")
 def reorder_groups(template_id: str, data: ReorderGroupsRequest, db: Session = Depends(get_db)):
-    for idx, group_id in enumerate(data.groupOrder):
-        group = db.query(TaskGroup).filter(TaskGroup.id == group_id, TaskGroup.template_id == template_id).first()
-        if group:
-            group.display_order = idx + 1
+    version = claim_template_version(db, template_id, data.expectedVersion)
+    db.execute(REORDER_GROUPS_SQL, {"ids": data.groupOrder, "template_id": template_id})
     db.commit()
-    return {"message": "Groups reordered"}
+    return {"message": "Groups reordered", "version": version}
+
+@router.post("/{template_id}/propagate", status_code=202)
+def propagate_template_changes(
+    template_id: str,
+    background_tasks: BackgroundTasks,
+    after: Optional[str] = Query(None, description="Resume after this assignment ID"),
+    batch_size: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Sync task instances of every assignment on projects using this template,
+    in the background. Safe to re-run; the finished run's lastAssignmentId is
+    logged, and passing it as `after` resumes from there.
+    """
+    t = db.query(ChecklistTemplate).filter(ChecklistTemplate.id == template_id).first()
+    if not t:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    background_tasks.add_task(
+        run_template_propagation, str(t.id), after_assignment_id=after, batch_size=batch_size
+    )
+    return {"message": "Propagation scheduled", "templateId": str(t.id)}
 
 # Reuse existing task management endpoints logic?
 # The tasks are managed via /projects/{id}/groups... but here we work on TEMPLATES
@@ -239,7 +328,12 @@ def reorder_groups(template_id: str, data: ReorderGroupsRequest, db: Session = D
 # Let's implement delete group here as well
 
 @router.delete("/{template_id}/groups/{group_id}")
-def delete_group(template_id: str, group_id: str, db: Session = Depends(get_db)):
+def delete_group(
+    template_id: str,
+    group_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     g = db.query(TaskGroup).filter(TaskGroup.id == group_id, TaskGroup.template_id == template_id).first()
     if not g:
         raise HTTPException(status_code=404, detail="Group not found")
@@ -249,7 +343,11 @@ def delete_group(template_id: str, group_id: str, db: Session = Depends(get_db))
     # For now assume cascade or manual deletion isn't strictly enforced by DB constraint blocking it.
     
     db.delete(g)
+    bump_template_version(db, template_id)
     db.commit()
+    
+    # Retire the group's untouched task instances on existing assignments
+    background_tasks.add_task(run_template_propagation, template_id)
     return {"message": "Group deleted"}
 
 @router.post("/{template_id}/groups/{group_id}/tasks")
@@ -257,6 +355,7 @@ def add_task_to_group(
     template_id: str, 
     group_id: str, 
     data: AddTaskToGroupRequest, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     # Verify group belongs to template
@@ -291,9 +390,13 @@ def add_task_to_group(
     )
     
     db.add(new_task)
+    bump_template_version(db, template_id)
     db.commit()
     db.refresh(new_task)
     
+    # Give everyone already assigned to a project on this template the new task
+    background_tasks.add_task(run_template_propagation, template_id)
+    
     return new_task
 
 @router.delete("/{template_id}/groups/{group_id}/tasks/{task_id}")
@@ -301,6 +404,7 @@ def delete_task_from_group(
     template_id: str, 
     group_id: str, 
     task_id: str, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     # Verify group belongs to template - strict check
@@ -313,8 +417,12 @@ def delete_task_from_group(
         raise HTTPException(status_code=404, detail="Task not found")
         
     db.delete(task)
+    bump_template_version(db, template_id)
     db.commit()
     
+    # Retire the task's untouched instances on existing assignments
+    background_tasks.add_task(run_template_propagation, template_id)
+    
     return {"message": "Task deleted"}
 
 @router.post("/{template_id}/groups/{group_id}/tasks/reorder")
@@ -329,10 +437,7 @@ def reorder_tasks(
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    for idx, task_id in enumerate(data.taskOrder):
-        task = db.query(Task).filter(Task.id == task_id, Task.task_group_id == group_id).first()
-        if task:
-            task.display_order = idx + 1
-            
+    version = claim_template_version(db, template_id, data.expectedVersion)
+    db.execute(REORDER_TASKS_SQL, {"ids": data.taskOrder, "group_id": group_id})
     db.commit()
-    return {"message": "Tasks reordered"}
+    return {"message": "Tasks reordered", "version": version}
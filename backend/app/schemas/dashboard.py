@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
-from datetime import date
+from datetime import date, datetime
 
 class GlobalStatsResponse(BaseModel):
     activeProjects: int
@@ -37,6 +37,7 @@ class TaskCategoryStats(BaseModel):
 class LastActivity(BaseModel):
     description: str
     timeAgo: str # e.g. "2h ago" (computed field)
+    at: Optional[datetime] = None
 
 class TeamMemberDetail(BaseModel):
     id: str
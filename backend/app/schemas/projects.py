@@ -33,9 +33,9 @@ class ProjectListItem(BaseModel):
 
 class ProjectListResponse(BaseModel):
     items: List[ProjectListItem]
-    total: int
-    page: int
+    total: Optional[int] = None  # Exact with exact_total, else estimated with include_total
     limit: int
+    nextCursor: Optional[str] = None  # Also sent as X-Next-Cursor
 
 class CreateProjectRequest(BaseModel):
     name: str
@@ -49,11 +49,27 @@ class ChecklistTemplate(ChecklistTemplateBase):
 class ChecklistTemplateDetail(ChecklistTemplate):
     pass
 
+class ChecklistTemplateSummary(ChecklistTemplateBase):
+    """List view of a template: counts instead of nested groups and tasks"""
+    id: Union[str, UUID]
+    clientId: Optional[Union[str, UUID]] = Field(None, validation_alias="client_id")
+    createdAt: Optional[datetime] = Field(None, validation_alias="created_at")
+    updatedAt: Optional[datetime] = Field(None, validation_alias="updated_at")
+    createdBy: Optional[Union[str, UUID]] = Field(None, validation_alias="created_by")
+    createdByName: Optional[str] = Field(None, validation_alias="created_by_name")
+    eligibilityCriteriaId: Optional[Union[str, UUID]] = Field(None, validation_alias="eligibility_criteria_id")
+    groupCount: int = Field(0, validation_alias="group_count")
+    taskCount: int = Field(0, validation_alias="task_count")
+    # Group categories in display order
+    groupCategories: List[Optional[str]] = Field([], validation_alias="group_categories")
+
 class CloneTemplateRequest(BaseModel):
     name: str
 
 class ReorderGroupsRequest(BaseModel):
     groupOrder: List[str]
+    # Template version the order was computed from; a newer one rejects the request with 409
+    expectedVersion: Optional[int] = None
 
 class AddGroupRequest(BaseModel):
     name: str
@@ -73,3 +89,5 @@ class AddTaskToGroupRequest(BaseModel):
 
 class ReorderTasksRequest(BaseModel):
     taskOrder: List[str]
+    # Template version the order was computed from; a newer one rejects the request with 409
+    expectedVersion: Optional[int] = None
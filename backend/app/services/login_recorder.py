@@ -0,0 +1,105 @@
+"""
+Deferred Last-Login Tracking
+Keeps `last_login` writes off the candidate login path.
+
+Logins are recorded in memory (one pending timestamp per member, so a burst
+of repeat logins collapses to one row) and written by a background thread
+every few seconds with a single UPDATE ... FROM unnest(...) per batch. A
+failed flush keeps its entries for the next attempt; pending entries are
+flushed on shutdown.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 5
+FLUSH_BATCH_SIZE = 1000
+
+UPDATE_LAST_LOGIN_SQL = text("""
+    UPDATE or_team_members tm
+    SET last_login = v.logged_in_at
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:times AS timestamp[])) AS v(id, logged_in_at)
+    WHERE tm.id = v.id
+      AND (tm.last_login IS NULL OR tm.last_login < v.logged_in_at)
+""")
+
+
+class LastLoginRecorder:
+    def __init__(self, interval: float = FLUSH_INTERVAL_SECONDS):
+        self.interval = interval
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, team_member_id, logged_in_at: Optional[datetime] = None) -> None:
+        when = logged_in_at or datetime.utcnow()
+        key = str(team_member_id)
+        with self._lock:
+            if key not in self._pending or self._pending[key] < when:
+                self._pending[key] = when
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write all pending logins; returns the number of members recorded"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        items = list(batch.items())
+        db = SessionLocal()
+        try:
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                chunk = items[start:start + FLUSH_BATCH_SIZE]
+                db.execute(UPDATE_LAST_LOGIN_SQL, {
+                    "ids": [member_id for member_id, _ in chunk],
+                    "times": [when for _, when in chunk],
+                })
+            db.commit()
+            return len(items)
+        except Exception:
+            db.rollback()
+            # Put the batch back, keeping anything newer recorded meanwhile
+            for member_id, when in items:
+                self.record(member_id, when)
+            raise
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="last-login-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not flush pending last-login updates on shutdown")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Last-login flush failed, will retry")
+
+
+last_logins = LastLoginRecorder()
@@ -0,0 +1,179 @@
+"""
+Real-time Notification Push
+Fans notification events out to Server-Sent Event streams across workers.
+
+Writers call `publish_notification_event` inside their transaction; it issues
+a PostgreSQL NOTIFY, which is delivered to every LISTENing connection only
+once the transaction commits. Each uvicorn worker runs one listener thread
+(started on the first subscriber) that hands events to the asyncio queues of
+the streams connected to that worker. In-process consumers such as the unread
+counter cache register with `add_listener` to see every event; events carry
+the publishing worker's `origin` so they can skip the ones they applied
+locally already.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import uuid as uuid_lib
+from typing import Callable, Dict, List, Optional, Set
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "or_notifications"
+
+# NOTIFY payloads are capped at 8000 bytes by PostgreSQL
+MAX_PAYLOAD_BYTES = 7900
+
+# Per-stream buffer; a client that falls this far behind resyncs on reconnect
+QUEUE_SIZE = 100
+
+LISTEN_POLL_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 5
+
+# Identifies events published by this worker process
+PROCESS_ORIGIN = uuid_lib.uuid4().hex
+
+
+def publish_notification_event(db: Session, team_member_id, event: str, data: dict) -> None:
+    """
+    Queue an event for a team member's streams. Sent on commit, dropped on
+    rollback, so subscribers never see notifications that were not saved.
+    """
+    message = {"teamMemberId": str(team_member_id), "event": event, "data": data, "origin": PROCESS_ORIGIN}
+    payload = json.dumps(message, default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES and "message" in data:
+        # Long rejection remarks - the client fetches the full text when listing
+        message["data"] = {**data, "message": None}
+        payload = json.dumps(message, default=str)
+
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+def notification_payload(notification, task_name: Optional[str] = None) -> dict:
+    """Same shape as NotificationResponse so clients can prepend it to their list"""
+    return {
+        "id": str(notification.id),
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.message,
+        "taskInstanceId": str(notification.task_instance_id) if notification.task_instance_id else None,
+        "taskName": task_name,
+        "isRead": bool(notification.is_read),
+        "createdAt": notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+class NotificationHub:
+    """Per-worker registry of open streams plus the LISTEN thread feeding them"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listeners: List[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def subscribe(self, team_member_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(str(team_member_id), set()).add(queue)
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+        self.start()
+        return queue
+
+    def unsubscribe(self, team_member_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            queues = self._subscribers.get(str(team_member_id))
+            if queues:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[str(team_member_id)]
+
+    def add_listener(self, callback: Callable[[dict], None]) -> None:
+        """Call `callback(message)` on the listener thread for every event"""
+        with self._lock:
+            self._listeners.append(callback)
+        self.start()
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._subscribers.values())
+
+    def queued_event_count(self) -> int:
+        """Events waiting in open streams' queues, not yet sent to clients"""
+        with self._lock:
+            return sum(queue.qsize() for queues in self._subscribers.values() for queue in queues)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=LISTEN_POLL_SECONDS + 1)
+        self._thread = None
+
+    # -- listener thread ------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="notification-listener", daemon=True)
+        self._thread.start()
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(settings.DATABASE_URL)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL};")
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Notification listener lost its connection, retrying")
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+
+        with self._lock:
+            queues = list(self._subscribers.get(message.get("teamMemberId"), ()))
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(message)
+            except Exception:
+                logger.exception("Notification listener callback failed")
+        for queue in queues:
+            self._loop.call_soon_threadsafe(self._offer, queue, message)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: dict) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+
+hub = NotificationHub()
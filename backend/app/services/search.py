@@ -0,0 +1,93 @@
+"""
+Ranked Text Search
+Shared matching and ranking for the admin list endpoints' search boxes.
+
+Each searchable table has a generated, weighted `search_vector` (name = A,
+other text = B) with a GIN index, and pg_trgm GIN indexes on its names. A
+search term matches a row when any of these holds:
+
+- every word is a prefix of a word in the document (full-text, so "jo sm"
+  finds "John Smith")
+- a name column contains the term as typed (ILIKE, served by the trigram
+  index)
+- a name column is similar to the term (pg_trgm `%`, so typos still match)
+
+Rows are ranked by full-text rank plus trigram similarity. When pg_trgm is
+not installed the similarity parts are left out and matching falls back to
+full-text plus ILIKE.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from sqlalchemy import Float, cast, func, literal, or_, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration of the generated columns: no stemming or stop
+# words, which suits names, emails and IDs
+SEARCH_CONFIG = "simple"
+
+_trigram_available: Optional[bool] = None
+
+
+@dataclass(frozen=True)
+class TextSearch:
+    # Filter criterion for the query
+    criterion: object
+    # Relevance expression (double precision, so it round-trips exactly
+    # through pagination cursors); order by rank.desc()
+    rank: object
+
+
+def has_trigram(db: Session) -> bool:
+    """Whether pg_trgm is installed (checked once per process)"""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = bool(db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ).scalar())
+        if not _trigram_available:
+            logger.info("pg_trgm is not installed; search runs without fuzzy matching")
+    return _trigram_available
+
+
+def prefix_tsquery(term: str) -> Optional[str]:
+    """to_tsquery() source matching every word of `term` as a prefix"""
+    words = [
+        word.replace("\\", "\\\\").replace("'", "''")
+        for word in term.split()
+    ]
+    if not words:
+        return None
+    return " & ".join(f"'{word}':*" for word in words)
+
+
+def text_search(
+    db: Session,
+    term: Optional[str],
+    vector,
+    names: Sequence = ()
+) -> Optional[TextSearch]:
+    """
+    Match and rank rows for a search box term, or None for a blank term.
+    `vector` is the model's search_vector column and `names` the
+    trigram-indexed expressions (names, emails) to match as typed or fuzzily.
+    """
+    term = (term or "").strip()
+    if not term:
+        return None
+
+    query = func.to_tsquery(SEARCH_CONFIG, prefix_tsquery(term))
+    conditions = [vector.op("@@")(query)]
+    rank = func.ts_rank(vector, query)
+
+    fuzzy = has_trigram(db)
+    for name in names:
+        conditions.append(name.icontains(term, autoescape=True))
+        if fuzzy:
+            conditions.append(name.op("%")(literal(term)))
+            rank = rank + func.similarity(name, term)
+
+    return TextSearch(criterion=or_(*conditions), rank=cast(rank, Float))
@@ -0,0 +1,173 @@
+"""
+Template -> Task Instance Propagation
+Keeps the task instances of every assignment in line with its project's template.
+
+Each batch is a single statement that picks the next slice of assignments
+(keyset-ordered by id), inserts the missing instances and retires the stale
+ones, then commits. Re-running is always safe: inserts are anti-joined against
+existing instances and retirements only touch rows that no longer match the
+template, so an interrupted run can simply be started again (optionally from
+the last reported cursor).
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# Lowest possible UUID, used as the keyset cursor for the first batch
+START_CURSOR = "00000000-0000-0000-0000-000000000000"
+
+
+@dataclass
+class PropagationResult:
+    template_id: str
+    assignments_scanned: int = 0
+    instances_created: int = 0
+    instances_retired: int = 0
+    batches: int = 0
+    last_assignment_id: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "templateId": self.template_id,
+            "assignmentsScanned": self.assignments_scanned,
+            "instancesCreated": self.instances_created,
+            "instancesRetired": self.instances_retired,
+            "batches": self.batches,
+            "lastAssignmentId": self.last_assignment_id,
+        }
+
+
+PROPAGATE_BATCH_SQL = text("""
+    WITH batch AS (
+        SELECT pa.id
+        FROM or_project_assignments pa
+        JOIN or_projects p ON p.id = pa.project_id
+        WHERE p.template_id = CAST(:template_id AS uuid)
+          AND pa.status != 'ARCHIVED'
+          AND pa.id > CAST(:after AS uuid)
+        ORDER BY pa.id
+        LIMIT :batch_size
+    ),
+    template_tasks AS (
+        SELECT t.id
+        FROM or_tasks t
+        JOIN or_task_groups tg ON tg.id = t.task_group_id
+        WHERE tg.template_id = CAST(:template_id AS uuid)
+    ),
+    inserted AS (
+        INSERT INTO or_task_instances (id, task_id, assignment_id, status, is_waived, created_at, updated_at)
+        SELECT gen_random_uuid(), tt.id, b.id, 'PENDING', false, :now, :now
+        FROM batch b
+        CROSS JOIN template_tasks tt
+        WHERE NOT EXISTS (
+            SELECT 1 FROM or_task_instances ti
+            WHERE ti.assignment_id = b.id AND ti.task_id = tt.id
+        )
+        ON CONFLICT DO NOTHING
+        RETURNING 1
+    ),
+    -- Only untouched instances are retired: never started, no result, and no
+    -- uploaded documents or comments (both cascade on delete). Anything a
+    -- candidate or reviewer has touched stays for history even after its
+    -- task leaves the template.
+    retired AS (
+        DELETE FROM or_task_instances ti
+        USING batch b
+        WHERE ti.assignment_id = b.id
+          AND ti.status IN ('PENDING', 'NOT_STARTED')
+          AND ti.result IS NULL
+          AND ti.started_at IS NULL
+          AND NOT EXISTS (SELECT 1 FROM or_documents d WHERE d.task_instance_id = ti.id)
+          AND NOT EXISTS (SELECT 1 FROM or_task_comments c WHERE c.task_instance_id = ti.id)
+          AND (ti.task_id IS NULL OR ti.task_id NOT IN (SELECT id FROM template_tasks))
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM batch) AS scanned,
+        (SELECT id::text FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT COUNT(*) FROM inserted) AS created,
+        (SELECT COUNT(*) FROM retired) AS retired
+""")
+
+
+def propagate_template(
+    db: Session,
+    template_id,
+    after_assignment_id: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> PropagationResult:
+    """
+    Bring all assignments of projects using `template_id` in line with the
+    template's current task list. Every batch commits on its own; pass the
+    returned `last_assignment_id` back in as `after_assignment_id` to resume.
+    """
+    result = PropagationResult(template_id=str(template_id))
+    cursor = str(after_assignment_id) if after_assignment_id else START_CURSOR
+
+    while max_batches is None or result.batches < max_batches:
+        row = db.execute(PROPAGATE_BATCH_SQL, {
+            "template_id": str(template_id),
+            "after": cursor,
+            "batch_size": batch_size,
+            "now": datetime.utcnow(),
+        }).one()
+        db.commit()
+
+        if not row.scanned:
+            break
+
+        result.batches += 1
+        result.assignments_scanned += row.scanned
+        result.instances_created += row.created
+        result.instances_retired += row.retired
+        result.last_assignment_id = row.last_id
+        cursor = row.last_id
+
+        if row.scanned < batch_size:
+            break
+
+    return result
+
+
+def propagate_templates(db: Session, template_ids: Iterable, batch_size: int = DEFAULT_BATCH_SIZE) -> list:
+    """Propagate several templates, skipping duplicates and empty ids"""
+    results = []
+    for template_id in dict.fromkeys(str(t) for t in template_ids if t):
+        results.append(propagate_template(db, template_id, batch_size=batch_size))
+    return results
+
+
+def run_template_propagation(
+    *template_ids,
+    after_assignment_id: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """
+    Background-task entry point. Uses its own session because the request
+    session is closed by the time background tasks run. `after_assignment_id`
+    resumes the run of a single template.
+    """
+    db = SessionLocal()
+    try:
+        if after_assignment_id:
+            results = [propagate_template(db, template_ids[0], after_assignment_id, batch_size)]
+        else:
+            results = propagate_templates(db, template_ids, batch_size)
+        for result in results:
+            logger.info("Template propagation finished: %s", result.to_dict())
+    except Exception:
+        db.rollback()
+        logger.exception("Template propagation failed for %s", template_ids)
+    finally:
+        db.close()
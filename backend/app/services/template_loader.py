@@ -0,0 +1,125 @@
+"""
+Read-only Template Loader
+Loads a checklist template with its groups and tasks for display.
+
+Three queries regardless of template size: the template (with its creator's
+name), its groups, and its tasks joined to their library source tasks. Only
+columns are selected, so nothing enters the session's identity map and the
+source-task merge cannot be flushed back by accident. The result is plain
+data in the attribute names the template schemas validate from.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from app.models.models import ChecklistTemplate, TaskGroup, Task, User
+
+
+def load_template_tree(db: Session, template_id) -> Optional[dict]:
+    """
+    Template dict with `task_groups` (ordered) each holding `tasks` (ordered).
+    Tasks that reference a library task show the library task's name,
+    description and configuration. Returns None if the template is missing.
+    """
+    template = db.query(
+        ChecklistTemplate.id,
+        ChecklistTemplate.name,
+        ChecklistTemplate.description,
+        ChecklistTemplate.client_id,
+        ChecklistTemplate.version,
+        ChecklistTemplate.is_active,
+        ChecklistTemplate.eligibility_criteria_id,
+        ChecklistTemplate.created_at,
+        ChecklistTemplate.updated_at,
+        ChecklistTemplate.created_by,
+        func.trim(func.concat(User.first_name, " ", User.last_name)).label("created_by_name")
+    ).outerjoin(User, User.id == ChecklistTemplate.created_by)\
+     .filter(ChecklistTemplate.id == template_id)\
+     .first()
+
+    if not template:
+        return None
+
+    tree = dict(template._mapping)
+    if not template.created_by:
+        tree["created_by_name"] = None
+
+    groups = db.query(
+        TaskGroup.id,
+        TaskGroup.name,
+        TaskGroup.description,
+        TaskGroup.category,
+        TaskGroup.display_order,
+        TaskGroup.eligibility_criteria_id
+    ).filter(TaskGroup.template_id == template.id)\
+     .order_by(TaskGroup.display_order)\
+     .all()
+
+    tree["task_groups"] = []
+    groups_by_id = {}
+    for group in groups:
+        group_data = dict(group._mapping)
+        group_data["tasks"] = []
+        groups_by_id[group.id] = group_data
+        tree["task_groups"].append(group_data)
+
+    if not groups_by_id:
+        return tree
+
+    for task in _load_tasks(db, Task.task_group_id.in_(list(groups_by_id))):
+        groups_by_id[task["task_group_id"]]["tasks"].append(task)
+
+    return tree
+
+
+def load_tasks(db: Session, task_ids) -> Dict[str, dict]:
+    """Tasks by id (as strings), with library source fields merged like above"""
+    ids = list({str(task_id) for task_id in task_ids if task_id})
+    if not ids:
+        return {}
+    return {str(task["id"]): task for task in _load_tasks(db, Task.id.in_(ids))}
+
+
+def _load_tasks(db: Session, criterion) -> List[dict]:
+    source = aliased(Task)
+    rows = db.query(
+        Task.id,
+        Task.task_group_id,
+        Task.source_task_id,
+        source.id.isnot(None).label("has_source"),
+        Task.name,
+        source.name.label("source_name"),
+        Task.description,
+        source.description.label("source_description"),
+        Task.configuration,
+        source.configuration.label("source_configuration"),
+        Task.type,
+        Task.category,
+        Task.is_required,
+        Task.display_order,
+        Task.created_at,
+        Task.updated_at
+    ).outerjoin(source, source.id == Task.source_task_id)\
+     .filter(criterion)\
+     .order_by(Task.task_group_id, Task.display_order)\
+     .all()
+
+    # A linked library task supplies the editable fields, even empty ones
+    return [
+        {
+            "id": task.id,
+            "task_group_id": task.task_group_id,
+            "source_task_id": task.source_task_id,
+            "name": task.source_name if task.has_source else task.name,
+            "description": task.source_description if task.has_source else task.description,
+            "configuration": task.source_configuration if task.has_source else task.configuration,
+            "type": task.type,
+            "category": task.category,
+            "is_required": task.is_required,
+            "display_order": task.display_order,
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+        }
+        for task in rows
+    ]
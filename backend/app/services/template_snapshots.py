@@ -0,0 +1,177 @@
+"""
+Compiled Template Snapshots
+Caches the fully resolved form of each checklist template.
+
+A snapshot holds the template's groups, its tasks with library source
+configuration merged in, and its eligibility bindings, compiled once by the
+read-only template loader. Snapshots are keyed by `ChecklistTemplate.version`,
+which every write to a template, its groups or tasks, or a library task it
+references increments via `bump_template_version` /
+`bump_templates_using_task`. A read costs one primary-key lookup of the
+version; the snapshot is rebuilt only when that version has moved on, so
+every worker converges without cross-process invalidation.
+
+Snapshots are shared between requests: treat them as read-only.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.models.models import ChecklistTemplate
+from app.services.template_loader import load_template_tree, load_tasks
+
+MAX_SNAPSHOTS = 256
+
+_snapshots = LRUCache(maxsize=MAX_SNAPSHOTS)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    id: str
+    version: int
+    name: str
+    # load_template_tree() output: template fields plus ordered task_groups/tasks
+    tree: dict
+    # Every template task by id (as string), including its task_group_id
+    tasks_by_id: Dict[str, dict] = field(default_factory=dict)
+    # Group id -> eligibility criteria id, plus the template-wide criteria
+    eligibility: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str:
+        return f'"tpl-{self.id}-v{self.version}"'
+
+    @property
+    def groups(self):
+        return self.tree["task_groups"]
+
+
+def compile_template(tree: dict) -> CompiledTemplate:
+    tasks_by_id = {}
+    eligibility = {"template": str(tree["eligibility_criteria_id"]) if tree["eligibility_criteria_id"] else None}
+    for group in tree["task_groups"]:
+        eligibility[str(group["id"])] = (
+            str(group["eligibility_criteria_id"]) if group["eligibility_criteria_id"] else None
+        )
+        for task in group["tasks"]:
+            tasks_by_id[str(task["id"])] = task
+
+    return CompiledTemplate(
+        id=str(tree["id"]),
+        version=tree["version"] or 0,
+        name=tree["name"],
+        tree=tree,
+        tasks_by_id=tasks_by_id,
+        eligibility=eligibility,
+    )
+
+
+def get_compiled_template(db: Session, template_id) -> Optional[CompiledTemplate]:
+    """Current snapshot of a template, or None if the template does not exist"""
+    if not template_id:
+        return None
+
+    # Read the version first: a snapshot may then be newer than its label
+    # (and is rebuilt once more), never older
+    version = db.query(func.coalesce(ChecklistTemplate.version, 0))\
+        .filter(ChecklistTemplate.id == template_id)\
+        .scalar()
+    if version is None:
+        return None
+
+    key = str(template_id)
+    cached = _snapshots.get(key)
+    if cached is not None and cached.version == version:
+        return cached
+
+    tree = load_template_tree(db, template_id)
+    if tree is None:
+        return None
+    tree["version"] = version
+    compiled = compile_template(tree)
+    _snapshots.set(key, compiled)
+    return compiled
+
+
+def resolve_tasks(db: Session, compiled: Optional[CompiledTemplate], task_ids: Iterable) -> Dict[str, dict]:
+    """
+    Effective task data for the given ids. Tasks still on the template come
+    from the snapshot; any others (e.g. history kept after a task left the
+    template) are loaded in one query.
+    """
+    known = compiled.tasks_by_id if compiled else {}
+    resolved = {}
+    missing = []
+    for task_id in task_ids:
+        if not task_id:
+            continue
+        key = str(task_id)
+        if key in known:
+            resolved[key] = known[key]
+        else:
+            missing.append(key)
+    if missing:
+        resolved.update(load_tasks(db, missing))
+    return resolved
+
+
+# =============================================
+# VERSION BUMPS (call inside the writing transaction)
+# =============================================
+
+def bump_template_version(db: Session, *template_ids) -> None:
+    """Mark templates as changed so their snapshots are rebuilt on next read"""
+    ids = list({str(t) for t in template_ids if t})
+    if not ids:
+        return
+    db.execute(
+        text("""
+            UPDATE or_checklist_templates
+            SET version = COALESCE(version, 0) + 1, updated_at = :now
+            WHERE id = ANY(CAST(:ids AS uuid[]))
+        """),
+        {"ids": ids, "now": datetime.utcnow()}
+    )
+    for template_id in ids:
+        _snapshots.pop(template_id)
+
+
+def bump_template_version_if_current(db: Session, template_id, expected_version: Optional[int]) -> Optional[int]:
+    """
+    Optimistic-concurrency bump for edits made against a known version. The
+    version is incremented only if it still equals `expected_version` (any
+    version when None) and the new version is returned; None means the
+    template is missing or has been changed since. The row stays locked until
+    the caller commits, so concurrent edits to one template serialize here.
+    """
+    new_version = db.execute(
+        text("""
+            UPDATE or_checklist_templates
+            SET version = COALESCE(version, 0) + 1, updated_at = :now
+            WHERE id = CAST(:id AS uuid)
+              AND (CAST(:expected AS integer) IS NULL OR COALESCE(version, 0) = CAST(:expected AS integer))
+            RETURNING version
+        """),
+        {"id": str(template_id), "expected": expected_version, "now": datetime.utcnow()}
+    ).scalar()
+    _snapshots.pop(str(template_id))
+    return new_version
+
+
+def bump_templates_using_task(db: Session, task_id) -> None:
+    """Bump every template that contains the task or a task linked to it"""
+    rows = db.execute(
+        text("""
+            SELECT DISTINCT tg.template_id::text
+            FROM or_tasks t
+            JOIN or_task_groups tg ON tg.id = t.task_group_id
+            WHERE (t.id = CAST(:task_id AS uuid) OR t.source_task_id = CAST(:task_id AS uuid))
+              AND tg.template_id IS NOT NULL
+        """),
+        {"task_id": str(task_id)}
+    ).fetchall()
+    bump_template_version(db, *(row[0] for row in rows))
@@ -0,0 +1,128 @@
+"""
+Unread Notification Counters
+Serves /notifications/count from memory instead of a COUNT per request.
+
+Counts are loaded from the database on first use and then kept current by
+write-through from the routes that create or read notifications. Writes made
+by other workers arrive over the notification NOTIFY channel. A background
+reconciliation pass re-counts every cached member in one grouped query to
+correct any drift (e.g. rows changed outside the API).
+"""
+import logging
+import threading
+import uuid as uuid_lib
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.database import SessionLocal
+from app.models.models import Notification
+from app.services.notification_stream import PROCESS_ORIGIN, hub
+
+logger = logging.getLogger(__name__)
+
+MAX_MEMBERS = 50_000
+RECONCILE_INTERVAL_SECONDS = 300
+RECONCILE_CHUNK = 1000
+
+
+def member_key(team_member_id) -> str:
+    try:
+        return str(uuid_lib.UUID(str(team_member_id)))
+    except ValueError:
+        return str(team_member_id)
+
+
+class UnreadCounterCache:
+    def __init__(self, maxsize: int = MAX_MEMBERS):
+        self._counts = LRUCache(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = None
+        self._listening = False
+
+    def get(self, db: Session, team_member_id) -> int:
+        key = member_key(team_member_id)
+        return self._counts.get_or_load(key, lambda: self._count_from_db(db, key))
+
+    def increment(self, team_member_id, amount: int = 1) -> None:
+        self._counts.update(member_key(team_member_id), lambda count: count + amount)
+
+    def decrement(self, team_member_id, amount: int = 1) -> None:
+        self._counts.update(member_key(team_member_id), lambda count: max(0, count - amount))
+
+    def reset(self, team_member_id) -> None:
+        self._counts.update(member_key(team_member_id), lambda count: 0)
+
+    def apply_event(self, message: dict) -> None:
+        """Mirror a notification event published by another worker"""
+        if message.get("origin") == PROCESS_ORIGIN:
+            return
+        member_id = message.get("teamMemberId")
+        if message.get("event") == "notification":
+            self.increment(member_id)
+        elif message.get("event") == "read":
+            if (message.get("data") or {}).get("all"):
+                self.reset(member_id)
+            else:
+                self.decrement(member_id)
+
+    @staticmethod
+    def _count_from_db(db: Session, key: str) -> int:
+        return db.query(Notification).filter(
+            Notification.team_member_id == key,
+            Notification.is_read == False
+        ).count()
+
+    # -- reconciliation -------------------------------------------------
+
+    def reconcile(self, db: Session) -> int:
+        """Re-count all cached members; returns how many entries were corrected"""
+        keys: List[str] = self._counts.keys()
+        corrected = 0
+        for start in range(0, len(keys), RECONCILE_CHUNK):
+            chunk = keys[start:start + RECONCILE_CHUNK]
+            rows = db.query(Notification.team_member_id, func.count(Notification.id))\
+                .filter(Notification.team_member_id.in_(chunk), Notification.is_read == False)\
+                .group_by(Notification.team_member_id)\
+                .all()
+            actual: Dict[str, int] = {str(member_id): count for member_id, count in rows}
+            for key in chunk:
+                fresh = actual.get(key, 0)
+                if self._counts.get(key) != fresh:
+                    corrected += 1
+                self._counts.set(key, fresh)
+        return corrected
+
+    def start(self, interval: float = RECONCILE_INTERVAL_SECONDS) -> None:
+        """Follow other workers' writes and start the reconciliation loop"""
+        if not self._listening:
+            hub.add_listener(self.apply_event)
+            self._listening = True
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._reconcile_loop, args=(interval,), name="unread-reconciler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _reconcile_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            db = SessionLocal()
+            try:
+                corrected = self.reconcile(db)
+                if corrected:
+                    logger.info("Unread counter reconciliation corrected %d members", corrected)
+            except Exception:
+                logger.exception("Unread counter reconciliation failed")
+            finally:
+                db.close()
+
+
+unread_counts = UnreadCounterCache()
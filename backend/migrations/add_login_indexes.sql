@@ -0,0 +1,7 @@
+-- Migration: Case-insensitive email index for candidate login
+-- Date: 2026-10-18
+-- Description: Candidate login and first-time password setup look members up by
+--              lower(email); a functional index keeps that an index scan
+
+CREATE INDEX IF NOT EXISTS idx_team_members_email_lower
+    ON or_team_members(lower(email));
@@ -0,0 +1,15 @@
+-- Migration: Composite indexes for notification listing and unread counts
+-- Date: 2026-10-18
+-- Description: Lets the notification list (keyset on created_at, id) and the
+--              unread badge count be answered from indexes alone
+
+-- Unread count and unread-only listing: equality on member + is_read, ordered by recency
+CREATE INDEX IF NOT EXISTS idx_notifications_member_read_created
+    ON or_notifications(team_member_id, is_read, created_at DESC, id DESC);
+
+-- Full listing for a member, newest first (replaces the single-column member index)
+CREATE INDEX IF NOT EXISTS idx_notifications_member_created
+    ON or_notifications(team_member_id, created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_notifications_team_member;
+DROP INDEX IF EXISTS idx_notifications_is_read;
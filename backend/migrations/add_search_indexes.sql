@@ -0,0 +1,58 @@
+-- Migration: Full-text and trigram search for admin list endpoints
+-- Date: 2026-10-18
+-- Description: Adds a generated, weighted tsvector column (name = A, other
+--              text = B) with a GIN index to each searchable table, and
+--              pg_trgm GIN indexes on the names and emails matched fuzzily.
+--              Generated columns keep themselves current without triggers.
+--              The trigram indexes also serve ILIKE '%term%' substring matches.
+--              Requires PostgreSQL 12+. Without pg_trgm (contrib) the trigram
+--              statements fail and search falls back to full-text plus ILIKE.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Task library
+ALTER TABLE or_tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_tasks_search ON or_tasks USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_tasks_name_trgm ON or_tasks USING GIN (name gin_trgm_ops);
+
+-- Checklist templates
+ALTER TABLE or_checklist_templates ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_templates_search ON or_checklist_templates USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_templates_name_trgm ON or_checklist_templates USING GIN (name gin_trgm_ops);
+
+-- Projects
+ALTER TABLE or_projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(client_name, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_projects_search ON or_projects USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_projects_name_trgm ON or_projects USING GIN (name gin_trgm_ops);
+
+-- Eligibility criteria
+ALTER TABLE or_eligibility_criteria ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_eligibility_search ON or_eligibility_criteria USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_eligibility_name_trgm ON or_eligibility_criteria USING GIN (name gin_trgm_ops);
+
+-- Team members
+ALTER TABLE or_team_members ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(employee_id, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_team_members_search ON or_team_members USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_team_members_full_name_trgm
+    ON or_team_members USING GIN ((first_name || ' ' || last_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_team_members_email_trgm ON or_team_members USING GIN (email gin_trgm_ops);
@@ -0,0 +1,30 @@
+-- Migration: Untouched task instances keep updated_at = created_at
+-- Date: 2026-10-18
+-- Description: The dashboard's last activity treats updated_at > created_at as
+--              a task being worked on. Instances inserted without updated_at
+--              (sample data, older backfill and requisition runs) took the
+--              column default instead, so they looked active from day one.
+--              Resets updated_at on instances nobody has touched.
+
+BEGIN;
+
+-- Neither trigger should fire for this backfill: one would stamp the current
+-- time back into updated_at, the other recompute every assignment's progress
+ALTER TABLE or_task_instances DISABLE TRIGGER update_task_instances_updated_at;
+ALTER TABLE or_task_instances DISABLE TRIGGER update_assignment_on_task_change;
+
+UPDATE or_task_instances
+SET updated_at = created_at
+WHERE created_at IS NOT NULL
+  AND updated_at IS DISTINCT FROM created_at
+  AND status IN ('PENDING', 'NOT_STARTED')
+  AND started_at IS NULL
+  AND completed_at IS NULL
+  AND result IS NULL
+  AND review_status IS NULL
+  AND NOT COALESCE(is_waived, false);
+
+ALTER TABLE or_task_instances ENABLE TRIGGER update_task_instances_updated_at;
+ALTER TABLE or_task_instances ENABLE TRIGGER update_assignment_on_task_change;
+
+COMMIT;
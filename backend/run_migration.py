@@ -2,6 +2,9 @@
 Run database migration for Admin Review Workflow
 This script adds review_status, admin_remarks columns to task_instances
 and creates the notifications table.
+
+Pass a file to run one of the SQL migrations in migrations/ instead:
+    python run_migration.py migrations/add_notification_indexes.sql
 """
 import os
 import sys
@@ -11,7 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.core.database import engine
 
-def run_migration():
+def run_migration(migration_file=None):
     migration_sql = """
     -- Add review columns to task_instances
     ALTER TABLE or_task_instances 
@@ -37,19 +40,27 @@ def run_migration():
     CREATE INDEX IF NOT EXISTS idx_notifications_is_read ON or_notifications(is_read);
     """
     
+    if migration_file:
+        with open(migration_file, "r", encoding="utf-8") as f:
+            migration_sql = f.read()
+    
     with engine.connect() as conn:
         from sqlalchemy import text
         
         # Split by semicolons and execute each statement
         statements = [s.strip() for s in migration_sql.split(';') if s.strip()]
         for statement in statements:
+            # Savepoint per statement so one failure doesn't abort the rest
+            savepoint = conn.begin_nested()
             try:
                 conn.execute(text(statement))
+                savepoint.commit()
                 print(f"✓ Executed: {statement[:50]}...")
             except Exception as e:
+                savepoint.rollback()
                 print(f"! Warning: {e}")
         conn.commit()
         print("\n✅ Migration completed successfully!")
 
 if __name__ == "__main__":
-    run_migration()
+    run_migration(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,91 +1,221 @@
 """
 Backfill script to create TaskInstances for existing ProjectAssignments
 that were created before the auto-creation logic was added.
+
+Works through assignments in keyset order (by id), inserting every missing
+assignment x template-task instance for a chunk with a single INSERT ... SELECT.
+Each chunk commits on its own and records its position in a checkpoint table,
+so an interrupted run picks up where it stopped.
+
+Usage (from backend/):
+    python scripts/backfill_task_instances.py              # run / resume
+    python scripts/backfill_task_instances.py --dry-run    # count only
+    python scripts/backfill_task_instances.py --restart    # ignore checkpoint
 """
 
-from sqlalchemy import text
+import argparse
+import os
+import sys
+import time
 from datetime import datetime
-import uuid
+
+# Add the backend directory to path (parent of scripts/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
 
 from app.core.database import SessionLocal
 
-def backfill_task_instances():
+JOB_NAME = "backfill_task_instances"
+START_CURSOR = "00000000-0000-0000-0000-000000000000"
+DEFAULT_CHUNK_SIZE = 1000
+
+CREATE_CHECKPOINT_TABLE = text("""
+    CREATE TABLE IF NOT EXISTS or_backfill_checkpoints (
+        job_name VARCHAR(100) PRIMARY KEY,
+        last_assignment_id UUID,
+        rows_inserted BIGINT DEFAULT 0,
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP
+    )
+""")
+
+# Rows the backfill would insert: assignment x template task pairs with no instance yet
+DRY_RUN_COUNT = text("""
+    SELECT COUNT(DISTINCT pa.id) AS assignments, COUNT(*) AS missing
+    FROM or_project_assignments pa
+    JOIN or_projects p ON p.id = pa.project_id
+    JOIN or_task_groups tg ON tg.template_id = p.template_id
+    JOIN or_tasks t ON t.task_group_id = tg.id
+    WHERE pa.id > CAST(:after AS uuid)
+      AND NOT EXISTS (
+          SELECT 1 FROM or_task_instances ti
+          WHERE ti.assignment_id = pa.id AND ti.task_id = t.id
+      )
+""")
+
+BACKFILL_CHUNK = text("""
+    WITH chunk AS (
+        SELECT pa.id, p.template_id
+        FROM or_project_assignments pa
+        JOIN or_projects p ON p.id = pa.project_id
+        WHERE p.template_id IS NOT NULL
+          AND pa.id > CAST(:after AS uuid)
+        ORDER BY pa.id
+        LIMIT :chunk_size
+    ),
+    inserted AS (
+        INSERT INTO or_task_instances (id, task_id, assignment_id, status, is_waived, created_at, updated_at)
+        SELECT gen_random_uuid(), t.id, c.id, 'PENDING', false, :now, :now
+        FROM chunk c
+        JOIN or_task_groups tg ON tg.template_id = c.template_id
+        JOIN or_tasks t ON t.task_group_id = tg.id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM or_task_instances ti
+            WHERE ti.assignment_id = c.id AND ti.task_id = t.id
+        )
+        ON CONFLICT DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM chunk) AS assignments,
+        (SELECT id::text FROM chunk ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT COUNT(*) FROM inserted) AS inserted
+""")
+
+SAVE_CHECKPOINT = text("""
+    INSERT INTO or_backfill_checkpoints (job_name, last_assignment_id, rows_inserted, updated_at, completed_at)
+    VALUES (:job, CAST(:last_id AS uuid), :rows, :now, :completed_at)
+    ON CONFLICT (job_name) DO UPDATE SET
+        last_assignment_id = COALESCE(EXCLUDED.last_assignment_id, or_backfill_checkpoints.last_assignment_id),
+        rows_inserted = or_backfill_checkpoints.rows_inserted + EXCLUDED.rows_inserted,
+        updated_at = EXCLUDED.updated_at,
+        completed_at = EXCLUDED.completed_at
+""")
+
+
+def load_checkpoint(db):
+    """Return (cursor, rows_inserted_so_far) for an unfinished previous run"""
+    row = db.execute(
+        text("""
+            SELECT last_assignment_id::text, rows_inserted, completed_at
+            FROM or_backfill_checkpoints WHERE job_name = :job
+        """),
+        {"job": JOB_NAME}
+    ).first()
+
+    if not row or row[2] is not None or not row[0]:
+        return START_CURSOR, 0
+    return row[0], row[1] or 0
+
+
+def checkpoint_table_exists(db) -> bool:
+    return db.execute(text("SELECT to_regclass('or_backfill_checkpoints') IS NOT NULL")).scalar()
+
+
+def reset_checkpoint(db):
+    db.execute(text("DELETE FROM or_backfill_checkpoints WHERE job_name = :job"), {"job": JOB_NAME})
+    db.commit()
+
+
+def backfill_task_instances(chunk_size: int = DEFAULT_CHUNK_SIZE, dry_run: bool = False, restart: bool = False):
     db = SessionLocal()
-    
+
     try:
-        # Get all project assignments with their template_id from project
-        assignments_query = text("""
-            SELECT pa.id as assignment_id, pa.project_id, p.template_id
-            FROM or_project_assignments pa
-            JOIN or_projects p ON pa.project_id = p.id
-            WHERE p.template_id IS NOT NULL
-        """)
-        
-        assignments = db.execute(assignments_query).fetchall()
-        print(f"Found {len(assignments)} project assignments with templates")
-        
+        if not dry_run:
+            db.execute(CREATE_CHECKPOINT_TABLE)
+            db.commit()
+            if restart:
+                reset_checkpoint(db)
+
+        # A dry run only reads: with --restart it counts from the start and
+        # leaves an in-progress checkpoint alone
+        if restart or not checkpoint_table_exists(db):
+            cursor, previously_inserted = START_CURSOR, 0
+        else:
+            cursor, previously_inserted = load_checkpoint(db)
+        if cursor != START_CURSOR:
+            print(f"Resuming after assignment {cursor[:8]}... ({previously_inserted} instances already created)")
+        elif not dry_run:
+            # Fresh run - drop the totals of any earlier completed run
+            reset_checkpoint(db)
+
+        if dry_run:
+            counts = db.execute(DRY_RUN_COUNT, {"after": cursor}).one()
+            print(f"Dry run: {counts.missing} task instances missing across {counts.assignments} assignments")
+            return counts.missing
+
         total_created = 0
-        
-        for assignment in assignments:
-            assignment_id = assignment[0]
-            template_id = assignment[2]
-            
-            # Check if this assignment already has task instances
-            existing_count = db.execute(
-                text("SELECT COUNT(*) FROM or_task_instances WHERE assignment_id = :aid"),
-                {"aid": assignment_id}
-            ).scalar()
-            
-            if existing_count > 0:
-                print(f"  Assignment {str(assignment_id)[:8]}... already has {existing_count} instances, skipping")
-                continue
-            
-            # Get all tasks from the template via task_groups
-            # Templates -> Task Groups -> Tasks
-            tasks_query = text("""
-                SELECT t.id as task_id
-                FROM or_tasks t
-                JOIN or_task_groups tg ON t.task_group_id = tg.id
-                WHERE tg.template_id = :tid
-            """)
-            template_tasks = db.execute(tasks_query, {"tid": template_id}).fetchall()
-            
-            if not template_tasks:
-                print(f"  Assignment {str(assignment_id)[:8]}... - template has no tasks, skipping")
-                continue
-            
-            # Create task instances for each task
-            instances_created = 0
-            for task in template_tasks:
-                task_id = task[0]
-                new_id = uuid.uuid4()
-                
-                db.execute(
-                    text("""
-                        INSERT INTO or_task_instances (id, task_id, assignment_id, status, is_waived, created_at)
-                        VALUES (:id, :task_id, :assignment_id, 'PENDING', false, :created_at)
-                    """),
-                    {
-                        "id": new_id,
-                        "task_id": task_id,
-                        "assignment_id": assignment_id,
-                        "created_at": datetime.utcnow()
-                    }
-                )
-                instances_created += 1
-            
-            print(f"  Assignment {str(assignment_id)[:8]}... - created {instances_created} task instances")
-            total_created += instances_created
-        
+        total_assignments = 0
+        started = time.monotonic()
+
+        while True:
+            chunk_started = time.monotonic()
+            row = db.execute(BACKFILL_CHUNK, {
+                "after": cursor,
+                "chunk_size": chunk_size,
+                "now": datetime.utcnow()
+            }).one()
+
+            if not row.assignments:
+                break
+
+            db.execute(SAVE_CHECKPOINT, {
+                "job": JOB_NAME,
+                "last_id": row.last_id,
+                "rows": row.inserted,
+                "now": datetime.utcnow(),
+                "completed_at": None
+            })
+            db.commit()
+
+            cursor = row.last_id
+            total_created += row.inserted
+            total_assignments += row.assignments
+
+            chunk_elapsed = time.monotonic() - chunk_started
+            elapsed = time.monotonic() - started
+            print(
+                f"  {total_assignments} assignments scanned, {total_created} instances created "
+                f"(chunk: {row.inserted} in {chunk_elapsed:.2f}s, "
+                f"overall {total_created / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+
+            if row.assignments < chunk_size:
+                break
+
+        db.execute(SAVE_CHECKPOINT, {
+            "job": JOB_NAME,
+            "last_id": None,
+            "rows": 0,
+            "now": datetime.utcnow(),
+            "completed_at": datetime.utcnow()
+        })
         db.commit()
-        print(f"\n✅ Total task instances created: {total_created}")
-        
+
+        elapsed = time.monotonic() - started
+        print(f"\n✅ Total task instances created: {total_created} "
+              f"({total_assignments} assignments in {elapsed:.1f}s)")
+        return total_created
+
     except Exception as e:
         print(f"Error: {e}")
+        print("Completed chunks are committed; re-run to resume from the last checkpoint.")
         db.rollback()
         raise
     finally:
         db.close()
 
+
 if __name__ == "__main__":
-    backfill_task_instances()
+    parser = argparse.ArgumentParser(description="Backfill missing task instances for project assignments")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Assignments per committed chunk")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only count the task instances that would be created")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore any saved checkpoint and start from the beginning")
+    args = parser.parse_args()
+
+    backfill_task_instances(chunk_size=args.chunk_size, dry_run=args.dry_run, restart=args.restart)
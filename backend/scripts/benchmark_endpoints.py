@@ -0,0 +1,322 @@
+"""
+Load test for the hot API endpoints.
+
+Drives a running backend (`--base-url`) with `--concurrency` clients in a
+closed loop, each picking the next request from a weighted mix of
+scenarios: candidate dashboard and task list, project list and detail,
+template detail, document upload and download, and dashboard stats. Ids
+for the requests (assignments, projects, templates, documents) are sampled
+from the database the backend uses, normally one filled by
+scripts/seed_benchmark_data.py.
+
+For every scenario it reports p50/p95/p99 latency, throughput, errors and
+the mean queries and DB time per request, read from the Server-Timing
+header the API sends (app/core/instrumentation.py). `--json` saves the run
+(with the git commit) and `--baseline` compares against a saved run, exits
+non-zero on a regression, so the numbers can be tracked per commit.
+
+Uploads add documents to the database; reseed for a clean baseline.
+
+Usage (from backend/, with the API running against the seeded database):
+    python scripts/seed_benchmark_data.py --reset
+    uvicorn app.main:app --workers 4 --port 8000
+    python scripts/benchmark_endpoints.py --duration 60 --concurrency 32 --json bench.json
+    python scripts/benchmark_endpoints.py --baseline bench.json --scenarios project_detail template_detail
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Add the backend directory to path (parent of scripts/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+
+API = "/api/v1"
+SAMPLE_SIZE = 500
+
+# Scenario -> share of the request mix
+SCENARIO_WEIGHTS = {
+    "candidate_dashboard": 20,
+    "candidate_tasks": 20,
+    "project_list": 10,
+    "project_detail": 10,
+    "template_detail": 10,
+    "document_upload": 5,
+    "document_download": 10,
+    "dashboard_stats": 15,
+}
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class Fixtures:
+    assignment_ids: List[str]
+    project_ids: List[str]
+    template_ids: List[str]
+    document_ids: List[str]
+    upload_task_instance_ids: List[str]
+
+
+@dataclass
+class ScenarioStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    db_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict:
+        count = len(self.latencies_ms)
+        if not count:
+            return {"requests": 0, "errors": self.errors}
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "p50": statistics.median(self.latencies_ms),
+            "p95": percentile(self.latencies_ms, 95),
+            "p99": percentile(self.latencies_ms, 99),
+            "throughput": count / elapsed,
+            "queries": statistics.mean(self.queries) if self.queries else None,
+            "db_ms": statistics.mean(self.db_ms) if self.db_ms else None,
+        }
+
+
+def load_fixtures() -> Fixtures:
+    """Random samples of the ids the scenarios request"""
+    db = SessionLocal()
+    try:
+        def sample(sql):
+            return [str(v) for v in db.execute(text(sql), {"n": SAMPLE_SIZE}).scalars()]
+
+        return Fixtures(
+            assignment_ids=sample("SELECT id FROM or_project_assignments ORDER BY random() LIMIT :n"),
+            project_ids=sample("SELECT id FROM or_projects ORDER BY random() LIMIT :n"),
+            template_ids=sample("SELECT id FROM or_checklist_templates ORDER BY random() LIMIT :n"),
+            document_ids=sample("SELECT id FROM or_documents ORDER BY random() LIMIT :n"),
+            upload_task_instance_ids=sample("""
+                SELECT ti.id FROM or_task_instances ti
+                JOIN or_tasks t ON t.id = ti.task_id
+                WHERE t.type = 'DOCUMENT_UPLOAD'
+                ORDER BY random() LIMIT :n
+            """),
+        )
+    finally:
+        db.close()
+
+
+def build_request(scenario: str, fixtures: Fixtures, upload_body: bytes):
+    """(method, path, request kwargs) for one request of a scenario"""
+    if scenario == "candidate_dashboard":
+        return "GET", f"{API}/candidate/dashboard/{random.choice(fixtures.assignment_ids)}", {}
+    if scenario == "candidate_tasks":
+        return "GET", f"{API}/candidate/tasks/{random.choice(fixtures.assignment_ids)}", {}
+    if scenario == "project_list":
+        return "GET", f"{API}/projects/", {"params": {"limit": 20}}
+    if scenario == "project_detail":
+        return "GET", f"{API}/projects/{random.choice(fixtures.project_ids)}", {}
+    if scenario == "template_detail":
+        return "GET", f"{API}/templates/{random.choice(fixtures.template_ids)}", {}
+    if scenario == "document_upload":
+        return "POST", f"{API}/documents/upload", {
+            "files": {"file": ("benchmark.pdf", upload_body, "application/pdf")},
+            "data": {"task_instance_id": random.choice(fixtures.upload_task_instance_ids)},
+        }
+    if scenario == "document_download":
+        return "GET", f"{API}/documents/{random.choice(fixtures.document_ids)}/download", {}
+    if scenario == "dashboard_stats":
+        return "GET", f"{API}/dashboard/stats/global", {}
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def runnable_scenarios(requested: List[str], fixtures: Fixtures) -> Dict[str, int]:
+    needs = {
+        "candidate_dashboard": fixtures.assignment_ids,
+        "candidate_tasks": fixtures.assignment_ids,
+        "project_detail": fixtures.project_ids,
+        "template_detail": fixtures.template_ids,
+        "document_upload": fixtures.upload_task_instance_ids,
+        "document_download": fixtures.document_ids,
+    }
+    weights = {}
+    for scenario in requested:
+        if scenario in needs and not needs[scenario]:
+            print(f"Skipping {scenario}: no rows to request (seed the database first)")
+            continue
+        weights[scenario] = SCENARIO_WEIGHTS[scenario]
+    return weights
+
+
+async def run(base_url: str, weights: Dict[str, int], fixtures: Fixtures, concurrency: int,
+              duration: float, warmup: float, upload_kb: int, timeout: float):
+    stats = {scenario: ScenarioStats() for scenario in weights}
+    scenarios, shares = list(weights), list(weights.values())
+    upload_body = os.urandom(upload_kb * 1024)
+    measure_from = time.perf_counter() + warmup
+    stop_at = measure_from + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def worker():
+            while True:
+                scenario = random.choices(scenarios, shares)[0]
+                method, path, kwargs = build_request(scenario, fixtures, upload_body)
+                started = time.perf_counter()
+                if started >= stop_at:
+                    return
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    await response.aread()
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    response, failed = None, True
+                finished = time.perf_counter()
+                if started < measure_from:
+                    continue
+
+                s = stats[scenario]
+                if failed:
+                    s.errors += 1
+                    continue
+                s.latencies_ms.append((finished - started) * 1000)
+                timing = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+                if timing:
+                    s.db_ms.append(float(timing.group(1)))
+                    s.queries.append(int(timing.group(2)))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return {scenario: s.summary(duration) for scenario, s in stats.items()}
+
+
+# =============================================
+# REPORTING
+# =============================================
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fmt(value, spec, suffix=""):
+    return "-" if value is None else f"{value:{spec}}{suffix}"
+
+
+def print_report(results: dict) -> None:
+    print(f"{'scenario':<20} {'reqs':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9} "
+          f"{'req/s':>8} {'queries':>8} {'db':>9}")
+    for scenario, r in results.items():
+        print(f"{scenario:<20} {r['requests']:>7} {r['errors']:>5} "
+              f"{fmt(r.get('p50'), '7.1f', 'ms'):>9} {fmt(r.get('p95'), '7.1f', 'ms'):>9} "
+              f"{fmt(r.get('p99'), '7.1f', 'ms'):>9} {fmt(r.get('throughput'), '8.1f'):>8} "
+              f"{fmt(r.get('queries'), '8.1f'):>8} {fmt(r.get('db_ms'), '7.1f', 'ms'):>9}")
+    total = sum(r.get("throughput") or 0 for r in results.values())
+    print(f"\nTotal throughput: {total:.1f} req/s")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Scenarios whose p95 or queries per request grew beyond the tolerance"""
+    regressions = []
+    for scenario, r in results.items():
+        base = baseline.get("results", {}).get(scenario)
+        if not base or not r.get("requests") or not base.get("requests"):
+            continue
+        if r["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p95 {base['p95']:.1f}ms -> {r['p95']:.1f}ms")
+        if r.get("queries") is not None and base.get("queries") is not None \
+                and r["queries"] >= base["queries"] + 1 and r["queries"] > base["queries"] * (1 + tolerance):
+            regressions.append(f"{scenario}: queries/request {base['queries']:.1f} -> {r['queries']:.1f}")
+        if r["errors"] > base["errors"]:
+            regressions.append(f"{scenario}: errors {base['errors']} -> {r['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the hot API endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIO_WEIGHTS), default=list(SCENARIO_WEIGHTS),
+                        help="Scenarios in the mix (default: all, weighted)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--upload-kb", type=int, default=256, help="Size of each uploaded document")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, help="Random seed for a repeatable request sequence")
+    parser.add_argument("--json", dest="json_path", help="Save the results (with the git commit) to this file")
+    parser.add_argument("--baseline", help="Results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed p95 / queries-per-request growth over the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    fixtures = load_fixtures()
+    weights = runnable_scenarios(args.scenarios, fixtures)
+    if not weights:
+        print("Nothing to run.")
+        sys.exit(1)
+
+    commit = git_commit()
+    print(f"{args.base_url}, commit {commit or 'unknown'}: {args.concurrency} clients, "
+          f"{args.warmup:.0f}s warm-up + {args.duration:.0f}s measured\n")
+
+    results = asyncio.run(run(
+        args.base_url, weights, fixtures, args.concurrency,
+        args.duration, args.warmup, args.upload_kb, args.timeout
+    ))
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": commit,
+                "recordedAt": datetime.utcnow().isoformat(),
+                "baseUrl": args.base_url,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved to {args.json_path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\nCompared with {args.baseline} (commit {baseline.get('commit') or 'unknown'}):")
+        if regressions:
+            for line in regressions:
+                print(f"  REGRESSION {line}")
+            sys.exit(1)
+        print("  no regressions")
+
+
+if __name__ == "__main__":
+    main()
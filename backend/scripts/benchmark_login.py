@@ -0,0 +1,116 @@
+"""
+Login throughput benchmark for choosing the password hashing cost.
+
+Simulates the shift-start peak: `--concurrency` logins are in flight at all
+times (closed loop), each verifying a password on a hashing pool of
+`--workers` threads, the same way app.core.passwords does in the API. For
+every cost factor it reports per-login latency percentiles (queueing
+included) and throughput, then recommends the highest cost whose p99 stays
+within `--budget-ms`.
+
+Usage (from backend/):
+    python scripts/benchmark_login.py
+    python scripts/benchmark_login.py --costs 10 11 12 13 --concurrency 100 --budget-ms 800
+    python scripts/benchmark_login.py --scheme argon2 --costs 1 2 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to path (parent of scripts/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.passwords import build_context
+
+PASSWORD = "correct-horse-battery"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def context_for(scheme: str, cost: int):
+    if scheme == "bcrypt":
+        return build_context(scheme, bcrypt_rounds=cost)
+    return build_context(scheme, argon2_time_cost=cost)
+
+
+def run(scheme: str, cost: int, logins: int, concurrency: int, workers: int) -> dict:
+    context = context_for(scheme, cost)
+    stored_hash = context.hash(PASSWORD)
+    hash_pool = ThreadPoolExecutor(max_workers=workers)
+
+    def login(_):
+        started = time.perf_counter()
+        assert hash_pool.submit(context.verify, PASSWORD, stored_hash).result()
+        return (time.perf_counter() - started) * 1000
+
+    # Warm up the backend outside the measurement
+    login(None)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        latencies = list(clients.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    hash_pool.shutdown()
+
+    return {
+        "cost": cost,
+        "min_ms": min(latencies),
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "throughput": logins / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login verification cost under peak load")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--costs", type=int, nargs="+",
+                        help="bcrypt rounds or argon2 time_cost values (default: around the configured one)")
+    parser.add_argument("--logins", type=int, default=200, help="Logins measured per cost")
+    parser.add_argument("--concurrency", type=int, default=50, help="Logins in flight at peak")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 2,
+                        help="Hashing pool size (PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="p99 login latency budget")
+    args = parser.parse_args()
+
+    if not args.costs:
+        current = settings.PASSWORD_BCRYPT_ROUNDS if args.scheme == "bcrypt" else settings.PASSWORD_ARGON2_TIME_COST
+        args.costs = [c for c in (current - 2, current - 1, current, current + 1) if c > 0]
+        if args.scheme == "bcrypt":
+            args.costs = [c for c in args.costs if 4 <= c <= 31]
+
+    print(f"Scheme: {args.scheme}, {args.logins} logins per cost, "
+          f"{args.concurrency} in flight, {args.workers} hashing threads, p99 budget {args.budget_ms:.0f}ms\n")
+    print(f"{'cost':>5} {'min':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'logins/s':>9}")
+
+    within_budget = []
+    for cost in args.costs:
+        r = run(args.scheme, cost, args.logins, args.concurrency, args.workers)
+        within = r["p99"] <= args.budget_ms
+        if within:
+            within_budget.append(cost)
+        print(f"{cost:>5} {r['min_ms']:>7.1f}ms {r['p50']:>7.1f}ms {r['p95']:>7.1f}ms "
+              f"{r['p99']:>7.1f}ms {r['throughput']:>9.1f}{'' if within else '  over budget'}")
+
+    # The strongest cost that still meets the budget, whatever order they ran in
+    recommended = max(within_budget, default=None)
+    print("")
+    if recommended is None:
+        print("No cost factor kept p99 within budget - add hashing workers or lower the cost.")
+    else:
+        setting = "PASSWORD_BCRYPT_ROUNDS" if args.scheme == "bcrypt" else "PASSWORD_ARGON2_TIME_COST"
+        print(f"Recommended: {setting}={recommended}")
+
+
+if __name__ == "__main__":
+    main()
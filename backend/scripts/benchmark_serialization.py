@@ -0,0 +1,218 @@
+"""
+Micro-benchmark of response serialization cost by payload size.
+
+Builds synthetic payloads shaped like the two heaviest responses and times
+each way the API can turn them into JSON bytes:
+
+    members   GET /projects/{id}/members: every member with all their task
+              instances, returned as plain dicts
+    tasks     GET /candidate/tasks/{assignment_id}: task items with their
+              form `configuration` blobs
+
+    encoder   FastAPI's default for dict returns: jsonable_encoder + json.dumps
+    model     the response_model path: build the pydantic items, validate
+              and dump through pydantic-core (tasks only)
+    fast      FastJSONResponse (app/core/responses.py) on the plain dicts
+    stdlib    FastJSONResponse's fallback when orjson isn't installed
+
+Times are the median per payload over `--repeat` rounds; nothing touches
+the database.
+
+Usage (from backend/):
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --shape tasks --sizes 20 100 500 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Add the backend directory to path (parent of scripts/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+
+from app.core import responses
+from app.routers.candidate import CandidateTaskItem, CandidateTaskListResponse
+
+DEFAULT_SIZES = {"members": [10, 100, 1000], "tasks": [20, 100, 500]}
+TASKS_PER_MEMBER = 16
+STATUSES = ["NOT_STARTED", "IN_PROGRESS", "COMPLETED"]
+NOW = datetime(2026, 1, 15, 9, 30)
+
+
+# =============================================
+# PAYLOADS
+# =============================================
+
+def member_payload(count: int) -> list:
+    members = []
+    for i in range(count):
+        task_instances = [
+            {
+                "taskId": str(uuid.uuid4()),
+                "taskName": f"Onboarding task {j}",
+                "taskCategory": ["COMPLIANCE", "DOCUMENTS", "TRAINING"][j % 3],
+                "status": STATUSES[(i + j) % 3],
+                "startedAt": (NOW - timedelta(days=j)).isoformat() if (i + j) % 3 else None,
+                "completedAt": NOW.isoformat() if (i + j) % 3 == 2 else None,
+            }
+            for j in range(TASKS_PER_MEMBER)
+        ]
+        members.append({
+            "id": str(uuid.uuid4()),
+            "firstName": f"First{i}",
+            "lastName": f"Last{i}",
+            "email": f"member{i}@example.com",
+            "phone": "555-0100",
+            "trade": "Electrician",
+            "category": "NEW_HIRE",
+            "status": "IN_PROGRESS",
+            "progressPercentage": 37.5,
+            "totalTasks": TASKS_PER_MEMBER,
+            "completedTasks": 6,
+            "assignedAt": NOW.isoformat(),
+            "taskInstances": task_instances,
+        })
+    return members
+
+
+def form_configuration(index: int) -> dict:
+    return {
+        "formFields": [
+            {
+                "id": f"field_{index}_{k}",
+                "label": f"Question {k}",
+                "type": ["text", "select", "date", "checkbox"][k % 4],
+                "required": k % 2 == 0,
+                "options": [{"label": f"Option {o}", "value": f"opt{o}"} for o in range(4)] if k % 4 == 1 else None,
+                "validation": {"maxLength": 200},
+            }
+            for k in range(12)
+        ],
+        "instructions": "Complete every required field before submitting. " * 4,
+    }
+
+
+def task_payload(count: int) -> dict:
+    tasks = [
+        {
+            "id": str(uuid.uuid4()),
+            "taskId": str(uuid.uuid4()),
+            "name": f"Task {i}",
+            "description": "Provide the requested information.",
+            "type": "CUSTOM_FORM",
+            "category": "COMPLIANCE",
+            "status": STATUSES[i % 3],
+            "dueDate": "2026-02-01",
+            "isRequired": True,
+            "configuration": form_configuration(i),
+            "result": {"formData": {f"field_{i}_0": "answer"}} if i % 3 == 2 else None,
+            "startedAt": NOW if i % 3 else None,
+            "completedAt": NOW if i % 3 == 2 else None,
+        }
+        for i in range(count)
+    ]
+    completed = sum(1 for t in tasks if t["status"] == "COMPLETED")
+    return {
+        "assignmentId": str(uuid.uuid4()),
+        "tasks": tasks,
+        "totalCount": len(tasks),
+        "completedCount": completed,
+        "pendingCount": len(tasks) - completed,
+    }
+
+
+# =============================================
+# SERIALIZATION PATHS
+# =============================================
+
+_task_list_field = create_model_field(name="Response", type_=CandidateTaskListResponse, mode="serialization")
+
+
+def encoder_path(payload) -> bytes:
+    return JSONResponse(content=None).render(jsonable_encoder(payload))
+
+
+def model_path(payload) -> bytes:
+    # What get_candidate_tasks did before: items as models, then FastAPI's
+    # response_model validation and pydantic-core dump
+    response = CandidateTaskListResponse(
+        **{**payload, "tasks": [CandidateTaskItem(**task) for task in payload["tasks"]]}
+    )
+    value, errors = _task_list_field.validate(response, {}, loc=("response",))
+    assert not errors, errors
+    return _task_list_field.serialize_json(value, by_alias=True)
+
+
+def fast_path(payload) -> bytes:
+    return responses.dumps(payload)
+
+
+def stdlib_path(payload) -> bytes:
+    fast_json = responses.orjson
+    responses.orjson = None
+    try:
+        return responses.dumps(payload)
+    finally:
+        responses.orjson = fast_json
+
+
+PATHS = {"encoder": encoder_path, "model": model_path, "fast": fast_path, "stdlib": stdlib_path}
+SHAPES = {"members": (member_payload, ["encoder", "fast", "stdlib"]),
+          "tasks": (task_payload, ["encoder", "model", "fast", "stdlib"])}
+
+
+def time_path(fn, payload, repeat: int, min_round: float) -> float:
+    """Median seconds per call"""
+    fn(payload)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn(payload)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round:
+            break
+        number *= 2
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn(payload)
+        rounds.append((time.perf_counter() - started) / number)
+    return statistics.median(rounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization by payload size")
+    parser.add_argument("--shape", choices=list(SHAPES), nargs="+", default=list(SHAPES))
+    parser.add_argument("--sizes", type=int, nargs="+", help="Members or tasks per payload (default per shape)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per measurement")
+    parser.add_argument("--min-round", type=float, default=0.2, help="Minimum seconds per round")
+    args = parser.parse_args()
+
+    print(f"orjson: {'installed' if responses.orjson is not None else 'not installed (fast = stdlib)'}")
+    for shape in args.shape:
+        build, paths = SHAPES[shape]
+        print(f"\n{shape}")
+        print(f"  {'size':>6} {'bytes':>10}  " + "  ".join(f"{name:>20}" for name in paths))
+        for size in args.sizes or DEFAULT_SIZES[shape]:
+            payload = build(size)
+            expected = fast_path(payload)
+            cells = []
+            for name in paths:
+                seconds = time_path(PATHS[name], payload, args.repeat, args.min_round)
+                mb_per_s = len(expected) / seconds / 1_000_000
+                cells.append(f"{seconds * 1000:9.2f}ms {mb_per_s:6.0f}MB/s")
+            print(f"  {size:>6} {len(expected):>10}  " + "  ".join(f"{cell:>20}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
-"""Fix admin user with correct SHA256 hash"""
+"""Recreate the admin user with a freshly hashed default password"""
 from app.core.database import SessionLocal
+from app.core.passwords import hash_password
 from app.models.models import User
 from sqlalchemy import text
 from datetime import datetime
-import hashlib
 import uuid
 
 db = SessionLocal()
@@ -12,8 +12,7 @@ db = SessionLocal()
 db.execute(text("DELETE FROM or_users WHERE email = 'admin@rite.com'"))
 db.commit()
 
-# Create admin with SHA256 hash (matching auth.py's hash_password)
-password_hash = hashlib.sha256('admin123'.encode()).hexdigest()
+password_hash = hash_password('admin123')
 
 admin = User(
     id=uuid.uuid4(),
@@ -29,7 +28,7 @@ admin = User(
 db.add(admin)
 db.commit()
 
-print('Admin recreated with SHA256 hash!')
+print('Admin recreated!')
 print('  Email: admin@rite.com')
 print('  Password: admin123')
 db.close()
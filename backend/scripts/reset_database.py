@@ -2,11 +2,11 @@
 Script to clear all database tables and recreate admin user
 """
 from app.core.database import SessionLocal
+from app.core.passwords import hash_password
 from app.models.models import User
 from sqlalchemy import text
 from datetime import datetime
 import uuid
-import hashlib
 
 db = SessionLocal()
 
@@ -46,7 +46,7 @@ print('All tables cleared!')
 # Create admin user
 print('Creating admin user...')
 password = 'admin123'
-password_hash = hashlib.sha256(password.encode()).hexdigest()
+password_hash = hash_password(password)
 admin = User(
     id=uuid.uuid4(),
     email='admin@rite.com',
@@ -2,7 +2,6 @@
 Seed script to create a test admin user
 Run this after setting up the database
 """
-import hashlib
 import sys
 import os
 
@@ -10,11 +9,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import SessionLocal, engine
+from app.core.passwords import hash_password
 from app.models.models import User, Base
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
-
 def seed_admin():
     db = SessionLocal()
     
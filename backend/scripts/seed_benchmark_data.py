@@ -0,0 +1,434 @@
+"""
+Load the bundled mock data into PostgreSQL for benchmarking, scaled up.
+
+Reads OnBoarding_MockData/JSON (the .xlsx workbooks next to it are flat
+exports of the same records) and inserts:
+
+- the task library and the checklist templates built from it
+- every mock project `--project-scale` times, with its contacts
+- every mock team member `--member-scale` times, each copy assigned to a
+  copy of its project, with one task instance per template task (statuses
+  taken from the mock member's instances) and, for `--document-ratio` of
+  them, an uploaded document on their first DOCUMENT_UPLOAD task
+- the PPM projects, requisitions and line items `--project-scale` times
+
+Ids are derived from the mock ids and copy number, so the same scales
+always produce the same rows. Rows go in with multi-row INSERTs in chunks;
+x100 members / x20 projects (1,200 members, ~20k task instances) loads in
+seconds. Run it against a scratch database (POSTGRES_DB=...): it refuses a
+database that already has projects unless `--reset` is given, which
+TRUNCATEs the data tables (users are kept).
+
+Usage (from backend/):
+    python scripts/seed_benchmark_data.py --reset
+    python scripts/seed_benchmark_data.py --reset --member-scale 100 --project-scale 20
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+
+# Add the backend directory to path (parent of scripts/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text
+
+from app.core.database import SessionLocal
+from app.models.models import (
+    ChecklistTemplate, Document, Project, ProjectAssignment, ProjectContact,
+    Requisition, RequisitionLineItem, Task, TaskGroup, TaskInstance, TeamMember
+)
+
+MOCK_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "OnBoarding_MockData", "JSON"
+)
+
+# Namespace for the deterministic ids of seeded rows
+BENCHMARK_NAMESPACE = uuid.UUID("6f1d7a52-3c1b-4f0e-9a57-2b8f4c1e0d93")
+INSERT_CHUNK_SIZE = 5000
+
+# Data tables emptied by --reset (or_users is kept so admin logins still work)
+DATA_TABLES = [
+    "or_notifications",
+    "or_documents",
+    "or_task_instances",
+    "or_project_assignments",
+    "or_project_contacts",
+    "or_projects",
+    "or_tasks",
+    "or_task_groups",
+    "or_checklist_templates",
+    "or_team_members",
+    "or_requisition_line_items",
+    "or_requisitions",
+    "or_ppm_projects",
+]
+
+CONTACT_TYPES = {
+    "projectManager": "PM",
+    "siteContact": "SITE_CONTACT",
+    "safetyLead": "SAFETY_LEAD",
+}
+
+INSERT_PPM_PROJECT = text("""
+    INSERT INTO or_ppm_projects (id, external_id, name, description, start_date, end_date,
+                                 sync_status, last_synced_at, created_at, updated_at)
+    VALUES (:id, :external_id, :name, :description, :start_date, :end_date,
+            'SYNCED', :synced_at, :synced_at, :synced_at)
+""")
+
+
+def seeded_id(*parts) -> uuid.UUID:
+    return uuid.uuid5(BENCHMARK_NAMESPACE, "/".join(str(p) for p in parts))
+
+
+def load(name: str) -> dict:
+    with open(os.path.join(MOCK_DATA_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parse_date(value):
+    return date.fromisoformat(value) if value else None
+
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None) if value else None
+
+
+def copy_suffix(copy: int, scale: int) -> str:
+    return f" {copy + 1:02d}" if scale > 1 else ""
+
+
+def insert_rows(db, model, rows) -> int:
+    # Core insert on the table: multi-row VALUES without ORM bookkeeping
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(model.__table__), rows[start:start + INSERT_CHUNK_SIZE])
+    return len(rows)
+
+
+# =============================================
+# BUILDERS
+# =============================================
+
+def build_library(tasks: list, now: datetime) -> dict:
+    """Library tasks (no group) keyed by mock task id"""
+    library = {}
+    for t in tasks:
+        library[t["id"]] = {
+            "id": seeded_id("task", t["id"]),
+            "task_group_id": None,
+            "source_task_id": None,
+            "name": t["name"],
+            "description": t.get("description"),
+            "type": t["type"],
+            "category": t.get("category"),
+            "is_required": t.get("required", True),
+            "display_order": 0,
+            "configuration": t.get("configuration") or {},
+            "created_at": parse_timestamp(t.get("createdAt")) or now,
+            "updated_at": parse_timestamp(t.get("updatedAt")) or now,
+        }
+    return library
+
+
+def build_templates(templates: list, library: dict, now: datetime):
+    """Template, group and template-task rows, plus each template's tasks in order"""
+    template_rows, group_rows, task_rows = [], [], []
+    template_tasks = {}
+    for tpl in templates:
+        template_id = seeded_id("template", tpl["id"])
+        template_rows.append({
+            "id": template_id,
+            "name": tpl["name"],
+            "description": tpl.get("description"),
+            "version": tpl.get("version", 1),
+            "is_active": tpl.get("isActive", True),
+            "created_at": parse_timestamp(tpl.get("createdAt")) or now,
+            "updated_at": parse_timestamp(tpl.get("updatedAt")) or now,
+        })
+        ordered = []
+        for group in tpl.get("taskGroups", []):
+            group_id = seeded_id("group", tpl["id"], group["id"])
+            group_rows.append({
+                "id": group_id,
+                "template_id": template_id,
+                "name": group["name"],
+                "description": group.get("description"),
+                "category": group.get("category"),
+                "display_order": group.get("order", 0),
+                "created_at": now,
+            })
+            for position, mock_task_id in enumerate(group.get("tasks", [])):
+                source = library.get(mock_task_id)
+                if source is None:
+                    continue
+                row = dict(
+                    source,
+                    id=seeded_id("template-task", tpl["id"], group["id"], mock_task_id),
+                    task_group_id=group_id,
+                    source_task_id=source["id"],
+                    display_order=position,
+                )
+                task_rows.append(row)
+                ordered.append((mock_task_id, row))
+        template_tasks[tpl["id"]] = ordered
+    return template_rows, group_rows, task_rows, template_tasks
+
+
+def build_projects(projects: list, scale: int, now: datetime):
+    project_rows, contact_rows = [], []
+    copies = {}
+    for p in projects:
+        copies[p["id"]] = []
+        for copy in range(scale):
+            project_id = seeded_id("project", p["id"], copy)
+            copies[p["id"]].append((project_id, p.get("templateId")))
+            flags = p.get("flags") or {}
+            project_rows.append({
+                "id": project_id,
+                "name": p["name"] + copy_suffix(copy, scale),
+                "description": p.get("description"),
+                "client_name": p.get("clientName"),
+                "status": p.get("status", "ACTIVE"),
+                "location": p.get("location"),
+                "start_date": parse_date(p.get("startDate")),
+                "end_date": parse_date(p.get("endDate")),
+                "template_id": seeded_id("template", p["templateId"]) if p.get("templateId") else None,
+                "is_dod": bool(flags.get("isDOD")),
+                "is_odrisa": bool(flags.get("isODRISA")),
+                "created_at": parse_timestamp(p.get("createdAt")) or now,
+                "updated_at": parse_timestamp(p.get("updatedAt")) or now,
+            })
+            for key, contact_type in CONTACT_TYPES.items():
+                contact = p.get(key)
+                if contact:
+                    contact_rows.append({
+                        "id": seeded_id("contact", p["id"], copy, contact_type),
+                        "project_id": project_id,
+                        "contact_type": contact_type,
+                        "name": contact["name"],
+                        "email": contact.get("email"),
+                        "phone": contact.get("phone"),
+                        "created_at": now,
+                    })
+    return project_rows, contact_rows, copies
+
+
+def build_members(members: list, scale: int, project_copies: dict, template_tasks: dict,
+                  document_ratio: float, document_bytes: int, now: datetime):
+    member_rows, assignment_rows, instance_rows, document_rows = [], [], [], []
+    document_every = round(1 / document_ratio) if document_ratio > 0 else 0
+    document_data = base64.b64encode(os.urandom(document_bytes)).decode() if document_every else None
+    seq = 0
+
+    for m in members:
+        copies = project_copies.get(m.get("projectId"))
+        if not copies:
+            continue
+        mock_statuses = {ti["taskId"]: ti["status"] for ti in m.get("taskInstances", [])}
+        local, _, domain = m["email"].partition("@")
+
+        for copy in range(scale):
+            seq += 1
+            member_id = seeded_id("member", m["id"], copy)
+            project_id, mock_template_id = copies[copy % len(copies)]
+            assignment_id = seeded_id("assignment", m["id"], copy)
+            created_at = parse_timestamp(m.get("createdAt")) or now
+
+            member_rows.append({
+                "id": member_id,
+                "employee_id": f"BENCH-{m['id']}-{copy}",
+                "first_name": m["firstName"],
+                "last_name": m["lastName"],
+                "email": f"{local}+{copy}@{domain}" if scale > 1 else m["email"],
+                "phone": m.get("phone"),
+                "is_active": True,
+                "is_first_login": True,
+                "created_at": created_at,
+                "updated_at": parse_timestamp(m.get("updatedAt")) or now,
+            })
+
+            tasks = template_tasks.get(mock_template_id, [])
+            completed = 0
+            first_upload = None
+            for mock_task_id, task in tasks:
+                status = mock_statuses.get(mock_task_id, "NOT_STARTED")
+                instance_id = seeded_id("instance", m["id"], copy, task["id"])
+                if status == "COMPLETED":
+                    completed += 1
+                if first_upload is None and task["type"] == "DOCUMENT_UPLOAD":
+                    first_upload = instance_id
+                instance_rows.append({
+                    "id": instance_id,
+                    "task_id": task["id"],
+                    "assignment_id": assignment_id,
+                    "status": status,
+                    "started_at": created_at if status != "NOT_STARTED" else None,
+                    "completed_at": now if status == "COMPLETED" else None,
+                    "is_waived": False,
+                    "created_at": created_at,
+                    "updated_at": now,
+                })
+
+            total = len(tasks)
+            assignment_rows.append({
+                "id": assignment_id,
+                "project_id": project_id,
+                "team_member_id": member_id,
+                "status": m.get("status", "PENDING"),
+                "category": m.get("category"),
+                "trade": m.get("trade"),
+                "total_tasks": total,
+                "completed_tasks": completed,
+                "progress_percentage": round(completed * 100 / total, 2) if total else 0,
+                "assigned_at": created_at,
+                "updated_at": now,
+            })
+
+            if document_every and first_upload is not None and seq % document_every == 0:
+                document_rows.append({
+                    "id": seeded_id("document", m["id"], copy),
+                    "task_instance_id": first_upload,
+                    "filename": f"{seeded_id('file', m['id'], copy)}.pdf",
+                    "original_filename": "id-card.pdf",
+                    "mime_type": "application/pdf",
+                    "file_size": document_bytes,
+                    "file_data": document_data,
+                    "document_side": "FRONT",
+                    "uploaded_by": member_id,
+                    "uploaded_at": now,
+                    "created_at": now,
+                })
+
+    return member_rows, assignment_rows, instance_rows, document_rows
+
+
+def build_requisitions(ppm: dict, scale: int, now: datetime):
+    ppm_rows, requisition_rows, line_item_rows = [], [], []
+    for copy in range(scale):
+        suffix = copy_suffix(copy, scale)
+        for p in ppm.get("mockPPMProjects", []):
+            ppm_rows.append({
+                "id": seeded_id("ppm", p["id"], copy),
+                "external_id": f"{p.get('externalId') or p['id']}-{copy}",
+                "name": p["name"] + suffix,
+                "description": p.get("description"),
+                "start_date": parse_date(p.get("startDate")),
+                "end_date": parse_date(p.get("endDate")),
+                "synced_at": parse_timestamp(p.get("syncedAt")) or now,
+            })
+        for r in ppm.get("mockRequisitions", []):
+            requisition_id = seeded_id("requisition", r["id"], copy)
+            requisition_rows.append({
+                "id": requisition_id,
+                "ppm_project_id": seeded_id("ppm", r["ppmProjectId"], copy),
+                "external_id": f"{r.get('requisitionNumber') or r['id']}-{copy}",
+                "title": r.get("title", "") + suffix,
+                "description": r.get("department"),
+                "status": r.get("status"),
+                "created_at": parse_timestamp(r.get("createdAt")) or now,
+                "updated_at": parse_timestamp(r.get("updatedAt")) or now,
+            })
+            for item in r.get("lineItems", []):
+                line_item_rows.append({
+                    "id": seeded_id("line-item", item["id"], copy),
+                    "requisition_id": requisition_id,
+                    "trade": item.get("trade"),
+                    "quantity": item.get("quantity"),
+                    "filled_quantity": item.get("filledCount", 0),
+                    "created_at": now,
+                })
+    return ppm_rows, requisition_rows, line_item_rows
+
+
+# =============================================
+# MAIN
+# =============================================
+
+def seed(member_scale: int, project_scale: int, document_ratio: float, document_kb: int, reset: bool):
+    now = datetime.utcnow()
+    library = build_library(load("tasks.mock.json")["mockTasks"], now)
+    template_rows, group_rows, template_task_rows, template_tasks = build_templates(
+        load("templates.mock.json")["mockTemplates"], library, now
+    )
+    project_rows, contact_rows, project_copies = build_projects(
+        load("projects.mock.json")["mockProjects"], project_scale, now
+    )
+    member_rows, assignment_rows, instance_rows, document_rows = build_members(
+        load("team_members.mock.json")["mockTeamMembers"], member_scale, project_copies,
+        template_tasks, document_ratio, document_kb * 1024, now
+    )
+    ppm_rows, requisition_rows, line_item_rows = build_requisitions(
+        load("ppm_requisition_workers_merged.json"), project_scale, now
+    )
+
+    db = SessionLocal()
+    try:
+        if reset:
+            db.execute(text(f"TRUNCATE TABLE {', '.join(DATA_TABLES)} CASCADE"))
+            print("Cleared data tables")
+        elif db.execute(text("SELECT EXISTS (SELECT 1 FROM or_projects)")).scalar():
+            print("The database already has projects. Point POSTGRES_DB at a scratch database "
+                  "or pass --reset to clear the data tables first.")
+            sys.exit(1)
+
+        started = time.perf_counter()
+        counts = [
+            ("library tasks", insert_rows(db, Task, list(library.values()))),
+            ("templates", insert_rows(db, ChecklistTemplate, template_rows)),
+            ("task groups", insert_rows(db, TaskGroup, group_rows)),
+            ("template tasks", insert_rows(db, Task, template_task_rows)),
+            ("projects", insert_rows(db, Project, project_rows)),
+            ("project contacts", insert_rows(db, ProjectContact, contact_rows)),
+            ("team members", insert_rows(db, TeamMember, member_rows)),
+            ("assignments", insert_rows(db, ProjectAssignment, assignment_rows)),
+            ("task instances", insert_rows(db, TaskInstance, instance_rows)),
+            ("documents", insert_rows(db, Document, document_rows)),
+        ]
+        for start in range(0, len(ppm_rows), INSERT_CHUNK_SIZE):
+            db.execute(INSERT_PPM_PROJECT, ppm_rows[start:start + INSERT_CHUNK_SIZE])
+        counts += [
+            ("PPM projects", len(ppm_rows)),
+            ("requisitions", insert_rows(db, Requisition, requisition_rows)),
+            ("requisition line items", insert_rows(db, RequisitionLineItem, line_item_rows)),
+        ]
+        db.commit()
+
+        # Fresh statistics so the planner (and X-Total-Estimate) see the new rows
+        db.execute(text("ANALYZE"))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for label, count in counts:
+        print(f"  {count:>8,} {label}")
+    print(f"Loaded in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a benchmark database from the bundled mock data")
+    parser.add_argument("--member-scale", type=int, default=100, help="Copies of each mock team member")
+    parser.add_argument("--project-scale", type=int, default=20, help="Copies of each mock project and requisition")
+    parser.add_argument("--document-ratio", type=float, default=0.1,
+                        help="Share of members given an uploaded document (0 for none)")
+    parser.add_argument("--document-kb", type=int, default=64, help="Size of each seeded document")
+    parser.add_argument("--reset", action="store_true", help="TRUNCATE the data tables before loading")
+    args = parser.parse_args()
+
+    if args.member_scale < 1 or args.project_scale < 1:
+        parser.error("scales must be at least 1")
+
+    seed(args.member_scale, args.project_scale, args.document_ratio, args.document_kb, args.reset)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,22 +23,20 @@ export function MobileLayout({ children }: MobileLayoutProps) {
     const [unreadCount, setUnreadCount] = useState(0);
 
     useEffect(() => {
-        const fetchUnreadCount = async () => {
-            try {
-                if (user?.id) {
-                    const response = await notificationsApi.getUnreadCount(user.id);
-                    setUnreadCount(response.unreadCount);
-                }
-            } catch (err) {
-                console.error('Failed to fetch unread count:', err);
-            }
-        };
+        if (!user?.id) return;
 
-        fetchUnreadCount();
-        // Poll every 30 seconds
-        const interval = setInterval(fetchUnreadCount, 30000);
-        return () => clearInterval(interval);
-    }, [user?.id, location.pathname]); // Update when changing pages too
+        // One long-lived stream instead of polling; the server sends the
+        // current count on connect and pushes changes as they happen.
+        // EventSource reconnects on its own and gets a fresh count each time.
+        const source = notificationsApi.subscribe(user.id, {
+            onUnread: (count) => setUnreadCount(count),
+            onNotification: () => setUnreadCount((count) => count + 1),
+            onRead: (data) => setUnreadCount((count) => (data.all ? 0 : Math.max(0, count - 1))),
+        });
+        source.onerror = () => console.error('Notification stream disconnected, retrying...');
+
+        return () => source.close();
+    }, [user?.id]);
 
     const userName = user
         ? `${user.firstName || ''} ${user.lastName || ''}`.trim() || 'User'
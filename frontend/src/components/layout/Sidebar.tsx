@@ -44,20 +44,10 @@ export function Sidebar() {
     useEffect(() => {
         const fetchProjectCount = async () => {
             try {
-                // Fetch all projects count (removed status: 'ACTIVE' filter)
-                const result = await projectsApi.list();
-                // If API returns array directly
-                if (Array.isArray(result)) {
-                    setProjectCount(result.length);
-                }
-                // If API returns paginated response { items: [], total: ... }
-                else if (result && typeof result === 'object' && 'total' in result) {
-                    setProjectCount((result as any).total);
-                }
-                // Fallback for active filter
-                else if (result && (result as any).items) {
-                    setProjectCount((result as any).items.length);
-                }
+                // Fetch all projects count (removed status: 'ACTIVE' filter);
+                // one row is enough, the exact total comes with it
+                const result = await projectsApi.list({ limit: 1, exactTotal: true });
+                setProjectCount(result.total ?? null);
             } catch (error) {
                 console.error('Failed to fetch project count:', error);
                 setProjectCount(null);
@@ -56,7 +56,9 @@ export function AuthProvider({ children }: { children: ReactNode }) {
             if (token && savedUser) {
                 try {
                     // Verify token with backend
-                    const response = await fetch(`${API_BASE_URL}/auth/me?token=${token}`);
+                    const response = await fetch(`${API_BASE_URL}/auth/me`, {
+                        headers: { Authorization: `Bearer ${token}` }
+                    });
                     if (response.ok) {
                         const data = await response.json();
                         setState({
@@ -159,9 +159,9 @@ export function CandidateProfilePage() {
         setChangingPassword(true);
 
         try {
-            const response = await fetch(`${API_BASE_URL}/auth/candidate/change-password?token=${token}`, {
+            const response = await fetch(`${API_BASE_URL}/auth/candidate/change-password`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${token}` },
                 body: JSON.stringify(passwordForm)
             });
 
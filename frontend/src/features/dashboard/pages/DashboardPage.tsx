@@ -20,6 +20,9 @@ import type { TeamMember } from '../../../types';
 import { SubmittedTaskViewer } from '../../candidate/components/SubmittedTaskViewer';
 import { useAuth } from '../../../contexts/AuthContext';
 
+// Per-category task counts from the members API summary view
+type CategorySummary = { category: string | null; total: number; completed: number };
+
 interface StatCardProps {
     title: string;
     value: string | number;
@@ -117,7 +120,7 @@ export function DashboardPage() {
                 return;
             }
             try {
-                const members = await projectsApi.getMembers(selectedProject);
+                const members = await projectsApi.getMembers(selectedProject, 'summary');
                 setApiMembers(members);
             } catch (error) {
                 console.error('Failed to fetch team members:', error);
@@ -189,7 +192,21 @@ export function DashboardPage() {
     };
 
     // Calculate task category completions using taskCategory field from API
-    const getTaskCategoryStats = (member: TeamMember) => {
+    const getTaskCategoryStats = (member: TeamMember & { categorySummary?: CategorySummary[] }) => {
+        // Members come from the summary view: counts per category
+        if (member.categorySummary) {
+            const counts = (category: string) => {
+                const entry = member.categorySummary!.find(c => c.category === category);
+                return { completed: entry?.completed ?? 0, total: entry?.total ?? 0 };
+            };
+            return {
+                forms: counts('FORMS'),
+                docs: counts('DOCUMENTS'),
+                compliance: counts('COMPLIANCE'),
+                training: counts('TRAININGS')
+            };
+        }
+
         const tasks = member.taskInstances || [];
 
         // Filter by task category (from API)
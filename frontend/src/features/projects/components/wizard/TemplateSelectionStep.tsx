@@ -3,7 +3,7 @@ import { Search, CheckCircle2, Layers, FileText, Copy, Folder, ChevronDown, Chev
 import { Badge, Card, CardBody } from '../../../../components/ui';
 import { templatesApi, projectsApi } from '../../../../services/api';
 import type { ProjectFormData } from '../ProjectSetupWizard';
-import type { ChecklistTemplate, Project } from '../../../../types';
+import type { ChecklistTemplateSummary, Project, TaskGroup } from '../../../../types';
 
 type SourceOption = 'blank' | 'template' | 'project';
 
@@ -18,7 +18,8 @@ export function TemplateSelectionStep({ data, onUpdate }: TemplateSelectionStepP
     );
     const [searchQuery, setSearchQuery] = useState('');
     const [expandedGroups, setExpandedGroups] = useState<Set<string>>(new Set());
-    const [templates, setTemplates] = useState<ChecklistTemplate[]>([]);
+    const [templates, setTemplates] = useState<ChecklistTemplateSummary[]>([]);
+    const [templateGroups, setTemplateGroups] = useState<TaskGroup[]>([]);
     const [projects, setProjects] = useState<Project[]>([]);
     const [, setIsLoading] = useState(true);
 
@@ -44,6 +45,25 @@ export function TemplateSelectionStep({ data, onUpdate }: TemplateSelectionStepP
         loadData();
     }, []);
 
+    // The template list has no groups; load them for the selected template
+    useEffect(() => {
+        if (!data.templateId) {
+            setTemplateGroups([]);
+            return;
+        }
+        let cancelled = false;
+        templatesApi.get(data.templateId)
+            .then((template) => {
+                if (cancelled) return;
+                setTemplateGroups(template.taskGroups || []);
+                onUpdate({ taskGroups: template.taskGroups as any });
+            })
+            .catch((error) => console.error('Failed to load template:', error));
+        return () => {
+            cancelled = true;
+        };
+    }, [data.templateId]);
+
     const filteredTemplates = templates.filter((template: any) =>
         template.name.toLowerCase().includes(searchQuery.toLowerCase())
     );
@@ -64,12 +84,11 @@ export function TemplateSelectionStep({ data, onUpdate }: TemplateSelectionStepP
         }
     };
 
-    const handleSelectTemplate = (template: ChecklistTemplate) => {
+    const handleSelectTemplate = (template: ChecklistTemplateSummary) => {
         onUpdate({
             templateId: template.id,
             templateName: template.name,
-            sourceProjectId: undefined,
-            taskGroups: template.taskGroups as any
+            sourceProjectId: undefined
         });
     };
 
@@ -94,7 +113,7 @@ export function TemplateSelectionStep({ data, onUpdate }: TemplateSelectionStepP
 
     const getPreviewData = () => {
         if (selectedTemplate) {
-            return { name: selectedTemplate.name, taskGroups: selectedTemplate.taskGroups, type: 'template' };
+            return { name: selectedTemplate.name, taskGroups: templateGroups, type: 'template' };
         }
         if (selectedProject) {
             return { name: selectedProject.name, taskGroups: selectedProject.taskGroups, type: 'project' };
@@ -192,7 +211,6 @@ export function TemplateSelectionStep({ data, onUpdate }: TemplateSelectionStepP
 
                     <div className="source-selection-list">
                         {filteredTemplates.map((template) => {
-                            const totalTasks = template.taskGroups.reduce((acc, g) => acc + g.tasks.length, 0);
                             const isSelected = data.templateId === template.id;
 
                             return (
@@ -204,7 +222,7 @@ export function TemplateSelectionStep({ data, onUpdate }: TemplateSelectionStepP
                                     <div className="source-selection-item-content">
                                         <span className="source-selection-item-name">{template.name}</span>
                                         <span className="source-selection-item-meta">
-                                            {template.taskGroups.length} groups • {totalTasks} tasks
+                                            {template.groupCount} groups • {template.taskCount} tasks
                                         </span>
                                     </div>
                                     {isSelected && <CheckCircle2 size={18} className="source-selection-check" />}
@@ -116,7 +116,7 @@ export function ProjectDetailPage() {
             setIsLoading(true);
             const [projectData, membersData] = await Promise.all([
                 projectsApi.get(projectId!),
-                projectsApi.getMembers(projectId!).catch(() => [])
+                projectsApi.getMembers(projectId!, 'summary').catch(() => [])
             ]);
 
             // Map project data
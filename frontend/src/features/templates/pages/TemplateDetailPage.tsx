@@ -251,7 +251,7 @@ export function TemplateDetailPage() {
                 newGroups.splice(destination.index, 0, removed);
 
                 const groupOrder = newGroups.map(g => g.id);
-                await templatesApi.reorderGroups(template.id, groupOrder);
+                await templatesApi.reorderGroups(template.id, groupOrder, template.version);
                 loadTemplate(template.id);
             } else if (type === 'TASK') {
                 const sourceGroupId = source.droppableId.replace('tasks-', '');
@@ -270,13 +270,13 @@ export function TemplateDetailPage() {
                 newTasks.splice(destination.index, 0, removed);
 
                 const taskOrder = newTasks.map(t => t.id);
-                await templatesApi.reorderTasks(template.id, sourceGroupId, taskOrder);
+                await templatesApi.reorderTasks(template.id, sourceGroupId, taskOrder, template.version);
 
                 loadTemplate(template.id);
             }
         } catch (err) {
             console.error('Drag and drop failed:', err);
-            showToast({ type: 'error', message: 'Failed to reorder' });
+            showToast({ type: 'error', message: err instanceof Error ? err.message : 'Failed to reorder' });
             loadTemplate(template.id); // Revert
         }
     };
@@ -14,12 +14,12 @@ import {
 } from 'lucide-react';
 import { Card, CardBody, Button, Badge, EmptyState, Modal } from '../../../components/ui';
 import { templatesApi } from '../../../services/api';
-import type { ChecklistTemplate } from '../../../types';
+import type { ChecklistTemplateSummary } from '../../../types';
 
 export function TemplatesPage() {
     const navigate = useNavigate();
     const [searchQuery, setSearchQuery] = useState('');
-    const [templates, setTemplates] = useState<ChecklistTemplate[]>([]);
+    const [templates, setTemplates] = useState<ChecklistTemplateSummary[]>([]);
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState('');
     const [showCreateModal, setShowCreateModal] = useState(false);
@@ -99,10 +99,6 @@ export function TemplatesPage() {
         template.clientName?.toLowerCase().includes(searchQuery.toLowerCase())
     );
 
-    const totalTasks = (template: ChecklistTemplate) => {
-        return (template.taskGroups || []).reduce((acc, group) => acc + (group.tasks?.length || 0), 0);
-    };
-
     if (isLoading) {
         return (
             <div className="flex items-center justify-center min-h-[400px]">
@@ -237,23 +233,23 @@ export function TemplatesPage() {
                                 <div className="flex items-center gap-4 text-xs text-muted mb-4">
                                     <span className="flex items-center gap-1">
                                         <FolderOpen size={12} />
-                                        {template.taskGroups?.length || 0} groups
+                                        {template.groupCount} groups
                                     </span>
                                     <span className="flex items-center gap-1">
                                         <CheckCircle2 size={12} />
-                                        {totalTasks(template)} tasks
+                                        {template.taskCount} tasks
                                     </span>
                                 </div>
 
                                 <div className="flex flex-wrap gap-1">
-                                    {(template.taskGroups || []).slice(0, 4).map((group) => (
-                                        <Badge key={group.id} variant="secondary" className="text-xs">
-                                            {group.category || 'General'}
+                                    {template.groupCategories.slice(0, 4).map((category, index) => (
+                                        <Badge key={index} variant="secondary" className="text-xs">
+                                            {category || 'General'}
                                         </Badge>
                                     ))}
-                                    {(template.taskGroups || []).length > 4 && (
+                                    {template.groupCategories.length > 4 && (
                                         <Badge variant="secondary" className="text-xs">
-                                            +{(template.taskGroups || []).length - 4} more
+                                            +{template.groupCategories.length - 4} more
                                         </Badge>
                                     )}
                                 </div>
@@ -1,14 +1,15 @@
 // API Service Layer - Connects frontend to backend
+import type { ChecklistTemplateSummary } from '../types';
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:9000/api/v1';
 
-// Generic fetch helper
-async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T> {
+// Fetch that throws on error responses
+async function request(endpoint: string, options?: RequestInit): Promise<Response> {
     const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+        ...options,
         headers: {
             'Content-Type': 'application/json',
             ...options?.headers,
         },
-        ...options,
     });
 
     if (!response.ok) {
@@ -26,6 +27,13 @@ async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T>
         }
     }
 
+    return response;
+}
+
+// Generic fetch helper
+async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T> {
+    const response = await request(endpoint, options);
+
     // Handle empty responses (e.g., from DELETE requests)
     const text = await response.text();
     if (!text) {
@@ -35,6 +43,20 @@ async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T>
     return JSON.parse(text);
 }
 
+// Fetches every page of a cursor-paginated list (follows X-Next-Cursor)
+async function fetchAllPages<T>(endpoint: string, options?: RequestInit): Promise<T[]> {
+    const items: T[] = [];
+    const separator = endpoint.includes('?') ? '&' : '?';
+    let cursor: string | null = null;
+    do {
+        const url: string = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+        const response = await request(url, options);
+        items.push(...(await response.json()));
+        cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+}
+
 // Dashboard API
 export const dashboardApi = {
     getGlobalStats: () => fetchApi<{
@@ -65,17 +87,19 @@ export const dashboardApi = {
 
 // Projects API
 export const projectsApi = {
-    list: (params?: { status?: string; search?: string; page?: number; limit?: number }) => {
+    // exactTotal: count every matching project into `total`
+    list: (params?: { status?: string; search?: string; cursor?: string; limit?: number; exactTotal?: boolean }) => {
         const query = new URLSearchParams();
         if (params?.status) query.append('status', params.status);
         if (params?.search) query.append('search', params.search);
-        if (params?.page) query.append('page', String(params.page));
+        if (params?.cursor) query.append('cursor', params.cursor);
         if (params?.limit) query.append('limit', String(params.limit));
+        if (params?.exactTotal) query.append('exact_total', 'true');
         return fetchApi<{
             items: Array<any>;
-            total: number;
-            page: number;
+            total?: number;
             limit: number;
+            nextCursor?: string;
         }>(`/projects/?${query.toString()}`);
     },
 
@@ -90,7 +114,8 @@ export const projectsApi = {
 
     getRequisitions: (projectId: string) => fetchApi<any[]>(`/projects/${projectId}/requisitions`),
 
-    getMembers: (projectId: string) => fetchApi<Array<{
+    // 'summary' sends per-category task counts instead of every task instance
+    getMembers: (projectId: string, view: 'full' | 'summary' = 'full') => fetchApi<Array<{
         id: string;
         firstName: string;
         lastName: string;
@@ -103,13 +128,20 @@ export const projectsApi = {
         totalTasks: number;
         completedTasks: number;
         assignedAt: string;
-        taskInstances: Array<{
+        taskInstances?: Array<{
             taskId: string;
+            taskName: string | null;
+            taskCategory: string | null;
             status: string;
             startedAt: string | null;
             completedAt: string | null;
         }>;
-    }>>(`/projects/${projectId}/members`),
+        categorySummary?: Array<{
+            category: string | null;
+            total: number;
+            completed: number;
+        }>;
+    }>>(`/projects/${projectId}/members?view=${view}`),
 
     update: (id: string, data: any) => fetchApi<any>(`/projects/${id}`, {
         method: 'PUT',
@@ -147,7 +179,7 @@ export const projectsApi = {
 export const eligibilityApi = {
     list: (search?: string) => {
         const query = search ? `?search=${encodeURIComponent(search)}` : '';
-        return fetchApi<Array<{
+        return fetchAllPages<{
             id: string;
             name: string;
             description: string;
@@ -155,7 +187,7 @@ export const eligibilityApi = {
             ruleCount: number;
             createdAt: string;
             updatedAt: string;
-        }>>(`/eligibility-rules/${query}`);
+        }>(`/eligibility-rules/${query}`);
     },
 
     get: (id: string) => fetchApi<any>(`/eligibility-rules/${id}`),
@@ -179,7 +211,7 @@ export const eligibilityApi = {
 export const templatesApi = {
     list: (search?: string) => {
         const query = search ? `?search=${encodeURIComponent(search)}` : '';
-        return fetchApi<any[]>(`/templates/${query}`);
+        return fetchAllPages<ChecklistTemplateSummary>(`/templates/${query}`);
     },
 
     get: (id: string) => fetchApi<any>(`/templates/${id}`),
@@ -212,9 +244,9 @@ export const templatesApi = {
         method: 'DELETE',
     }),
 
-    reorderGroups: (templateId: string, groupOrder: string[]) => fetchApi<any>(`/templates/${templateId}/groups/reorder`, {
+    reorderGroups: (templateId: string, groupOrder: string[], expectedVersion?: number) => fetchApi<any>(`/templates/${templateId}/groups/reorder`, {
         method: 'POST',
-        body: JSON.stringify({ groupOrder }),
+        body: JSON.stringify({ groupOrder, expectedVersion }),
     }),
 
     // Tasks within Groups
@@ -227,9 +259,9 @@ export const templatesApi = {
         method: 'DELETE',
     }),
 
-    reorderTasks: (templateId: string, groupId: string, taskOrder: string[]) => fetchApi<any>(`/templates/${templateId}/groups/${groupId}/tasks/reorder`, {
+    reorderTasks: (templateId: string, groupId: string, taskOrder: string[], expectedVersion?: number) => fetchApi<any>(`/templates/${templateId}/groups/${groupId}/tasks/reorder`, {
         method: 'POST',
-        body: JSON.stringify({ taskOrder }),
+        body: JSON.stringify({ taskOrder, expectedVersion }),
     }),
 };
 
@@ -240,7 +272,7 @@ export const tasksApi = {
         if (params?.search) query.append('search', params.search);
         if (params?.type) query.append('type', params.type);
         if (params?.category) query.append('category', params.category);
-        return fetchApi<any[]>(`/tasks/?${query.toString()}`);
+        return fetchAllPages<any>(`/tasks/?${query.toString()}`);
     },
 
     get: (id: string) => fetchApi<any>(`/tasks/${id}`),
@@ -267,7 +299,7 @@ export const teamMembersApi = {
         if (params?.search) queryParts.push(`search=${encodeURIComponent(params.search)}`);
         if (params?.status) queryParts.push(`status=${params.status}`);
         const query = queryParts.length > 0 ? `?${queryParts.join('&')}` : '';
-        return fetchApi<Array<{
+        return fetchAllPages<{
             id: string;
             employeeId: string;
             firstName: string;
@@ -278,7 +310,7 @@ export const teamMembersApi = {
             state: string;
             createdAt: string;
             isActive?: boolean;
-        }>>(`/team-members/${query}`);
+        }>(`/team-members/${query}`);
     },
 
     get: (id: string) => fetchApi<any>(`/team-members/${id}`),
@@ -516,6 +548,8 @@ export const documentsApi = {
     ),
 };
 
+const bearer = (token: string) => ({ Authorization: `Bearer ${token}` });
+
 // Admin Management API
 export const adminApi = {
     // Get current admin profile
@@ -526,20 +560,20 @@ export const adminApi = {
         lastName: string;
         role: string;
         isActive: boolean;
-    }>(`/admin/profile?token=${token}`),
+    }>('/admin/profile', { headers: bearer(token) }),
 
     // Update profile
     updateProfile: (token: string, data: { firstName: string; lastName: string }) =>
         fetchApi<{ success: boolean; message: string; user: any }>(
-            `/admin/profile?token=${token}`,
-            { method: 'PUT', body: JSON.stringify(data) }
+            '/admin/profile',
+            { method: 'PUT', headers: bearer(token), body: JSON.stringify(data) }
         ),
 
     // Change password
     changePassword: (token: string, data: { currentPassword: string; newPassword: string; confirmPassword: string }) =>
         fetchApi<{ success: boolean; message: string }>(
-            `/admin/password?token=${token}`,
-            { method: 'PUT', body: JSON.stringify(data) }
+            '/admin/password',
+            { method: 'PUT', headers: bearer(token), body: JSON.stringify(data) }
         ),
 
     // List all admin users
@@ -551,20 +585,20 @@ export const adminApi = {
         role: string;
         isActive: boolean;
         createdAt: string | null;
-    }>>(`/admin/users?token=${token}`),
+    }>>('/admin/users', { headers: bearer(token) }),
 
     // Create new admin user
     createUser: (token: string, data: { email: string; firstName: string; lastName: string; password: string }) =>
         fetchApi<{ success: boolean; message: string; user: any }>(
-            `/admin/users?token=${token}`,
-            { method: 'POST', body: JSON.stringify(data) }
+            '/admin/users',
+            { method: 'POST', headers: bearer(token), body: JSON.stringify(data) }
         ),
 
     // Delete admin user
     deleteUser: (token: string, userId: string) =>
         fetchApi<{ success: boolean; message: string }>(
-            `/admin/users/${userId}?token=${token}`,
-            { method: 'DELETE' }
+            `/admin/users/${userId}`,
+            { method: 'DELETE', headers: bearer(token) }
         ),
 };
 
@@ -614,6 +648,23 @@ export const notificationsApi = {
     // Mark all notifications as read
     markAllAsRead: (teamMemberId: string) =>
         fetchApi<{ success: boolean }>(`/notifications/mark-all-read?team_member_id=${teamMemberId}`, { method: 'PATCH' }),
+
+    // Live stream (Server-Sent Events) - replaces polling the unread count.
+    // Returns the EventSource; call .close() to disconnect.
+    subscribe: (
+        teamMemberId: string,
+        handlers: {
+            onUnread?: (unreadCount: number) => void;
+            onNotification?: (notification: { id: string; title: string; isRead: boolean }) => void;
+            onRead?: (data: { notificationId?: string; all?: boolean }) => void;
+        }
+    ) => {
+        const source = new EventSource(`${API_BASE_URL}/notifications/stream?team_member_id=${teamMemberId}`);
+        source.addEventListener('unread', (e) => handlers.onUnread?.(JSON.parse((e as MessageEvent).data).unreadCount));
+        source.addEventListener('notification', (e) => handlers.onNotification?.(JSON.parse((e as MessageEvent).data)));
+        source.addEventListener('read', (e) => handlers.onRead?.(JSON.parse((e as MessageEvent).data)));
+        return source;
+    },
 };
 
 export { API_BASE_URL };
@@ -17,6 +17,13 @@ export interface ChecklistTemplate {
     createdByName?: string; // User's full name
 }
 
+// Template list item: counts instead of nested groups (fetch the template for those)
+export interface ChecklistTemplateSummary extends Omit<ChecklistTemplate, 'taskGroups'> {
+    groupCount: number;
+    taskCount: number;
+    groupCategories: (string | null)[];
+}
+
 export interface CreateTemplateDTO {
     name: string;
     description: string;
@@ -6,6 +6,9 @@
 -- Enable UUID extension
 -- CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 
+-- Trigram matching for list search (PostgreSQL contrib)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- =============================================
 -- 1. or_clients TABLE
 -- =============================================
@@ -54,10 +57,16 @@ CREATE TABLE or_eligibility_criteria (
     is_active BOOLEAN DEFAULT TRUE,
     root_group_logic VARCHAR(10) DEFAULT 'AND', -- AND, OR
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED -- Weighted document for list search
 );
 
 CREATE INDEX IF NOT EXISTS idx_eligibility_active ON or_eligibility_criteria(is_active);
+CREATE INDEX IF NOT EXISTS idx_eligibility_search ON or_eligibility_criteria USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_eligibility_name_trgm ON or_eligibility_criteria USING GIN (name gin_trgm_ops);
 
 -- =============================================
 -- 4. ELIGIBILITY RULES TABLE
@@ -100,12 +109,18 @@ CREATE TABLE or_checklist_templates (
     eligibility_criteria_id UUID REFERENCES or_eligibility_criteria(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    created_by UUID REFERENCES or_users(id)
+    created_by UUID REFERENCES or_users(id),
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED -- Weighted document for list search
 );
 
 CREATE INDEX IF NOT EXISTS idx_templates_client ON or_checklist_templates(client_id);
 CREATE INDEX IF NOT EXISTS idx_templates_active ON or_checklist_templates(is_active);
 CREATE INDEX IF NOT EXISTS idx_templates_eligibility ON or_checklist_templates(eligibility_criteria_id);
+CREATE INDEX IF NOT EXISTS idx_templates_search ON or_checklist_templates USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_templates_name_trgm ON or_checklist_templates USING GIN (name gin_trgm_ops);
 
 -- =============================================
 -- 6. TASK GROUPS TABLE
@@ -140,7 +155,11 @@ CREATE TABLE or_tasks (
     display_order INT NOT NULL,
     configuration JSONB, -- Flexible config for different task types
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED -- Weighted document for list search
 );
 
 CREATE INDEX IF NOT EXISTS idx_tasks_group ON or_tasks(task_group_id);
@@ -149,6 +168,8 @@ CREATE INDEX IF NOT EXISTS idx_tasks_type ON or_tasks(type);
 CREATE INDEX IF NOT EXISTS idx_tasks_category ON or_tasks(category);
 CREATE INDEX IF NOT EXISTS idx_tasks_order ON or_tasks(task_group_id, display_order);
 CREATE INDEX IF NOT EXISTS idx_tasks_config ON or_tasks USING GIN (configuration);
+CREATE INDEX IF NOT EXISTS idx_tasks_search ON or_tasks USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_tasks_name_trgm ON or_tasks USING GIN (name gin_trgm_ops);
 
 -- =============================================
 -- 8. TEAM MEMBERS TABLE
@@ -180,14 +201,22 @@ CREATE TABLE or_team_members (
     last_login TIMESTAMP,
 
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(employee_id, '')), 'B')
+    ) STORED -- Weighted document for list search
 );
 
 
 CREATE INDEX IF NOT EXISTS idx_team_members_email ON or_team_members(email);
+CREATE INDEX IF NOT EXISTS idx_team_members_email_lower ON or_team_members(lower(email));
 CREATE INDEX IF NOT EXISTS idx_team_members_employee ON or_team_members(employee_id);
 CREATE INDEX IF NOT EXISTS idx_team_members_name ON or_team_members(last_name, first_name);
 CREATE INDEX IF NOT EXISTS idx_team_members_active ON or_team_members(is_active);
+CREATE INDEX IF NOT EXISTS idx_team_members_search ON or_team_members USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_team_members_full_name_trgm ON or_team_members USING GIN ((first_name || ' ' || last_name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_team_members_email_trgm ON or_team_members USING GIN (email gin_trgm_ops);
 
 -- =============================================
 -- 9. PPM or_projects TABLE
@@ -261,7 +290,11 @@ CREATE TABLE or_projects (
     ppm_project_id UUID REFERENCES or_ppm_projects(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    created_by UUID REFERENCES or_users(id)
+    created_by UUID REFERENCES or_users(id),
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(client_name, '')), 'B')
+    ) STORED -- Weighted document for list search
 );
 
 CREATE INDEX IF NOT EXISTS idx_projects_status ON or_projects(status);
@@ -270,6 +303,8 @@ CREATE INDEX IF NOT EXISTS idx_projects_dates ON or_projects(start_date, end_dat
 CREATE INDEX IF NOT EXISTS idx_projects_template ON or_projects(template_id);
 CREATE INDEX IF NOT EXISTS idx_projects_ppm ON or_projects(ppm_project_id);
 CREATE INDEX IF NOT EXISTS idx_projects_flags ON or_projects(is_dod, is_odrisa);
+CREATE INDEX IF NOT EXISTS idx_projects_search ON or_projects USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_projects_name_trgm ON or_projects USING GIN (name gin_trgm_ops);
 
 -- =============================================
 -- 13. PROJECT CONTACTS TABLE
@@ -656,7 +691,11 @@ CREATE TABLE or_notifications (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_notifications_team_member ON or_notifications(team_member_id);
-CREATE INDEX IF NOT EXISTS idx_notifications_is_read ON or_notifications(is_read);
+-- Unread count and unread-only listing: equality on member + is_read, ordered by recency
+CREATE INDEX IF NOT EXISTS idx_notifications_member_read_created
+    ON or_notifications(team_member_id, is_read, created_at DESC, id DESC);
+-- Full listing for a member, newest first (keyset on created_at, id)
+CREATE INDEX IF NOT EXISTS idx_notifications_member_created
+    ON or_notifications(team_member_id, created_at DESC, id DESC);
 
 COMMENT ON TABLE or_notifications IS 'In-app notifications for team members';